@@ -117,7 +117,10 @@ class YwCnvUi(YwCnv):
         else:
             self.newFile = target.filePath
             if target.scenesSplit:
-                self.ui.show_warning(_('New scenes created during conversion.'))
+                splitter = target.sceneSplitter
+                self.ui.show_warning(f'{_("New scenes created during conversion.")}\n'
+                                     f'{_("Scenes split")}: {splitter.splitScenes}, {_("New scenes")}: {splitter.newScenes}, '
+                                     f'{_("New chapters")}: {splitter.newChapters}, {_("New parts")}: {splitter.newParts}')
 
     def _confirm_overwrite(self, filePath):
         """Return boolean permission to overwrite the target file.
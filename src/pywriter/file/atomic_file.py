@@ -0,0 +1,126 @@
+"""Provide a class for replacing files atomically.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import shutil
+import tempfile
+
+# The umask can only be read by setting it, which affects all threads of the process.
+# So it is read once, when the module is imported.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class AtomicFile:
+    """Context manager writing a text file that replaces the target file only when complete.
+
+    Public methods:
+        discard() -- leave the target file unchanged when the context is left.
+
+    Public instance variables:
+        filePath -- str: path to the target file.
+        backup -- bool: if True, keep the previous target file as a ".bak" file.
+
+    The text is written to a temporary file with a unique name in the target's directory.
+    On leaving the context without an exception, the temporary file is
+    flushed to disk and renamed to the target file, so that the target file
+    is either the old or the new one, but never a truncated one.
+    The backup is a hard link to the previous target file, so the old content
+    is not copied. Where hard links are not supported, the file is copied.
+    If an exception occurs, or discard() was called, the temporary file is
+    removed, and the target and backup files are not touched.
+
+    Usage:
+        with AtomicFile(filePath) as f:
+            f.write(text)
+    """
+
+    def __init__(self, filePath, backup=True):
+        """Initialize instance variables.
+
+        Positional arguments:
+            filePath -- str: path to the target file.
+
+        Optional arguments:
+            backup -- bool: if True, keep the previous target file as a ".bak" file.
+        """
+        self.filePath = filePath
+        self.backup = backup
+        self._tempPath = None
+        self._file = None
+        self._discarded = False
+
+    def discard(self):
+        """Leave the target file unchanged when the context is left."""
+        self._discarded = True
+
+    def __enter__(self):
+        self._discarded = False
+        fileName = os.path.basename(self.filePath)
+        fd, self._tempPath = tempfile.mkstemp(suffix='.tmp', prefix=f'{fileName}.',
+                                              dir=os.path.dirname(os.path.abspath(self.filePath)))
+        try:
+            self._file = open(fd, 'w', encoding='utf-8')
+        except:
+            os.close(fd)
+            self._remove_temp()
+            raise
+
+        return self._file
+
+    def __exit__(self, excType, excValue, traceback):
+        try:
+            if excType is None and not self._discarded:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self._file.close()
+            if excType is None and not self._discarded:
+                self._replace()
+                return
+
+        except:
+            self._remove_temp()
+            raise
+
+        self._remove_temp()
+
+    def _replace(self):
+        """Rename the temporary file to the target file, keeping a backup of the previous one."""
+        if os.path.isfile(self.filePath):
+            try:
+                shutil.copymode(self.filePath, self._tempPath)
+            except OSError:
+                pass
+            if self.backup:
+                backupPath = f'{self.filePath}.bak'
+                if os.path.lexists(backupPath):
+                    os.remove(backupPath)
+                try:
+                    os.link(self.filePath, backupPath)
+                except OSError:
+                    shutil.copy2(self.filePath, backupPath)
+        else:
+            # The temporary file is accessible only by the owner; apply the default permissions instead.
+            try:
+                os.chmod(self._tempPath, 0o666 & ~_UMASK)
+            except OSError:
+                pass
+        os.replace(self._tempPath, self.filePath)
+        try:
+            # Make the rename persistent; not supported on all platforms.
+            directory = os.open(os.path.dirname(os.path.abspath(self.filePath)), os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+        except OSError:
+            pass
+
+    def _remove_temp(self):
+        try:
+            os.remove(self._tempPath)
+        except OSError:
+            pass
@@ -14,6 +14,7 @@ from pywriter.model.character import Character
 from pywriter.model.scene import Scene
 from pywriter.model.novel import Novel
 from pywriter.file.filter import Filter
+from pywriter.file.atomic_file import AtomicFile
 
 
 class FileExport(Novel):
@@ -59,6 +60,48 @@ class FileExport(Novel):
 
     _DIVIDER = ', '
 
+    _PROGRESS_STEPS = 100
+    # Maximum number of progress reports per export.
+
+    _SCENE_FIELD_GROUPS = (
+        (('ID',), '_get_sceneIdMapping', ()),
+        (('SceneNumber',), '_get_sceneNumberMapping', ('arg.sceneNumber',)),
+        (('Title',), '_get_sceneTitleMapping', ('scene.title',)),
+        (('Desc',), '_get_sceneDescMapping', ('scene.desc',)),
+        (('WordCount',), '_get_sceneWordCountMapping', ('scene.wordCount',)),
+        (('WordsTotal',), '_get_sceneWordsTotalMapping', ('arg.wordsTotal',)),
+        (('LetterCount',), '_get_sceneLetterCountMapping', ('scene.letterCount',)),
+        (('LettersTotal',), '_get_sceneLettersTotalMapping', ('arg.lettersTotal',)),
+        (('Status',), '_get_sceneStatusMapping', ('scene.status',)),
+        (('SceneContent',), '_get_sceneContentMapping', ('scene.sceneContent',)),
+        (('FieldTitle1', 'FieldTitle2', 'FieldTitle3', 'FieldTitle4'), '_get_sceneFieldTitlesMapping',
+         ('novel.fieldTitle1', 'novel.fieldTitle2', 'novel.fieldTitle3', 'novel.fieldTitle4')),
+        (('Field1', 'Field2', 'Field3', 'Field4'), '_get_sceneRatingsMapping',
+         ('scene.field1', 'scene.field2', 'scene.field3', 'scene.field4')),
+        (('Date', 'Day', 'ScDate'), '_get_sceneDateMapping', ('scene.date', 'scene.day')),
+        (('Time', 'Hour', 'Minute', 'ScTime'), '_get_sceneTimeMapping',
+         ('scene.date', 'scene.time', 'scene.hour', 'scene.minute')),
+        (('LastsDays', 'LastsHours', 'LastsMinutes', 'Duration'), '_get_sceneDurationMapping',
+         ('scene.lastsDays', 'scene.lastsHours', 'scene.lastsMinutes')),
+        (('ReactionScene',), '_get_sceneReactionMapping', ('scene.isReactionScene',)),
+        (('Goal', 'Conflict', 'Outcome'), '_get_sceneGoalMapping', ('scene.goal', 'scene.conflict', 'scene.outcome')),
+        (('Tags',), '_get_sceneTagsMapping', ('scene.tags',)),
+        (('Languages',), '_get_sceneLanguagesMapping', ('scene.languages',)),
+        (('Image',), '_get_sceneImageMapping', ('scene.image',)),
+        (('Characters', 'Viewpoint'), '_get_sceneCharactersMapping', ('scene.characters', 'characters.title')),
+        (('Locations',), '_get_sceneLocationsMapping', ('scene.locations', 'locations.title')),
+        (('Items',), '_get_sceneItemsMapping', ('scene.items', 'items.title')),
+        (('Notes',), '_get_sceneNotesMapping', ('scene.notes',)),
+        (('ProjectName', 'ProjectPath'), '_get_sceneProjectMapping', ('novel.projectName', 'novel.projectPath')),
+    )
+    # Placeholders of the scene templates: (field names, method computing their values, values they depend on).
+    # The methods take the arguments of _get_sceneMapping(), and return a mapping dictionary for their fields.
+    # Dependencies are the method's only inputs besides the scene ID:
+    # - 'scene.<name>': the scene's instance variable,
+    # - 'novel.<name>': the exporter's instance variable,
+    # - '<name>.title': the titles of the elements in novel.<name>, referred to by the scene's list of the same name,
+    # - 'arg.<name>': the argument of the same name.
+
     def __init__(self, filePath, **kwargs):
         """Initialize filter strategy class instances.
         
@@ -213,55 +256,64 @@ class FileExport(Novel):
             wordsTotal -- int: accumulated wordcount.
             lettersTotal -- int: accumulated lettercount.
         
+        The mapping is composed of the field groups listed in _SCENE_FIELD_GROUPS.
         This is a template method that can be extended or overridden by subclasses.
         """
+        sceneMapping = {}
+        for __, method, __ in self._SCENE_FIELD_GROUPS:
+            sceneMapping.update(getattr(self, method)(scId, sceneNumber, wordsTotal, lettersTotal))
+        return sceneMapping
 
-        #--- Create a comma separated tag list.
+    def _get_sceneIdMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(ID=scId)
+
+    def _get_sceneNumberMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
         if sceneNumber == 0:
             sceneNumber = ''
-        if self.scenes[scId].tags is not None:
-            tags = list_to_string(self.scenes[scId].tags, divider=self._DIVIDER)
-        else:
-            tags = ''
+        return dict(SceneNumber=sceneNumber)
 
-        #--- Create a comma separated character list.
-        try:
-            # Note: Due to a bug, yWriter scenes might hold invalid
-            # viepoint characters
-            sChList = []
-            for crId in self.scenes[scId].characters:
-                sChList.append(self.characters[crId].title)
-            sceneChars = list_to_string(sChList, divider=self._DIVIDER)
-            viewpointChar = sChList[0]
-        except:
-            sceneChars = ''
-            viewpointChar = ''
+    def _get_sceneTitleMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(Title=self._convert_from_yw(self.scenes[scId].title, True))
 
-        #--- Create a comma separated location list.
-        if self.scenes[scId].locations is not None:
-            sLcList = []
-            for lcId in self.scenes[scId].locations:
-                sLcList.append(self.locations[lcId].title)
-            sceneLocs = list_to_string(sLcList, divider=self._DIVIDER)
-        else:
-            sceneLocs = ''
+    def _get_sceneDescMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(Desc=self._convert_from_yw(self.scenes[scId].desc))
 
-        #--- Create a comma separated item list.
-        if self.scenes[scId].items is not None:
-            sItList = []
-            for itId in self.scenes[scId].items:
-                sItList.append(self.items[itId].title)
-            sceneItems = list_to_string(sItList, divider=self._DIVIDER)
-        else:
-            sceneItems = ''
+    def _get_sceneWordCountMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(WordCount=str(self.scenes[scId].wordCount))
 
-        #--- Create A/R marker string.
-        if self.scenes[scId].isReactionScene:
-            reactionScene = Scene.REACTION_MARKER
-        else:
-            reactionScene = Scene.ACTION_MARKER
+    def _get_sceneWordsTotalMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(WordsTotal=wordsTotal)
+
+    def _get_sceneLetterCountMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(LetterCount=str(self.scenes[scId].letterCount))
+
+    def _get_sceneLettersTotalMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(LettersTotal=lettersTotal)
 
-        #--- Create a combined scDate information.
+    def _get_sceneStatusMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(Status=Scene.STATUS[self.scenes[scId].status])
+
+    def _get_sceneContentMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(SceneContent=self._convert_from_yw(self.scenes[scId].sceneContent))
+
+    def _get_sceneFieldTitlesMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(
+            FieldTitle1=self._convert_from_yw(self.fieldTitle1, True),
+            FieldTitle2=self._convert_from_yw(self.fieldTitle2, True),
+            FieldTitle3=self._convert_from_yw(self.fieldTitle3, True),
+            FieldTitle4=self._convert_from_yw(self.fieldTitle4, True),
+        )
+
+    def _get_sceneRatingsMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(
+            Field1=self.scenes[scId].field1,
+            Field2=self.scenes[scId].field2,
+            Field3=self.scenes[scId].field3,
+            Field4=self.scenes[scId].field4,
+        )
+
+    def _get_sceneDateMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        """Create a combined scDate information."""
         if self.scenes[scId].date is not None and self.scenes[scId].date != Scene.NULL_DATE:
             scDay = ''
             scDate = self.scenes[scId].date
@@ -274,8 +326,10 @@ class FileExport(Novel):
             else:
                 scDay = ''
                 cmbDate = ''
+        return dict(Date=scDate, Day=scDay, ScDate=cmbDate)
 
-        #--- Create a combined time information.
+    def _get_sceneTimeMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        """Create a combined time information."""
         if self.scenes[scId].time is not None and self.scenes[scId].date != Scene.NULL_DATE:
             scHour = ''
             scMinute = ''
@@ -297,8 +351,10 @@ class FileExport(Novel):
                 scHour = ''
                 scMinute = ''
                 cmbTime = ''
+        return dict(Time=scTime, Hour=scHour, Minute=scMinute, ScTime=cmbTime)
 
-        #--- Create a combined duration information.
+    def _get_sceneDurationMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        """Create a combined duration information."""
         if self.scenes[scId].lastsDays is not None and self.scenes[scId].lastsDays != '0':
             lastsDays = self.scenes[scId].lastsDays
             days = f'{self.scenes[scId].lastsDays}d '
@@ -317,53 +373,80 @@ class FileExport(Novel):
         else:
             lastsMinutes = ''
             minutes = ''
-        duration = f'{days}{hours}{minutes}'
-
-        sceneMapping = dict(
-            ID=scId,
-            SceneNumber=sceneNumber,
-            Title=self._convert_from_yw(self.scenes[scId].title, True),
-            Desc=self._convert_from_yw(self.scenes[scId].desc),
-            WordCount=str(self.scenes[scId].wordCount),
-            WordsTotal=wordsTotal,
-            LetterCount=str(self.scenes[scId].letterCount),
-            LettersTotal=lettersTotal,
-            Status=Scene.STATUS[self.scenes[scId].status],
-            SceneContent=self._convert_from_yw(self.scenes[scId].sceneContent),
-            FieldTitle1=self._convert_from_yw(self.fieldTitle1, True),
-            FieldTitle2=self._convert_from_yw(self.fieldTitle2, True),
-            FieldTitle3=self._convert_from_yw(self.fieldTitle3, True),
-            FieldTitle4=self._convert_from_yw(self.fieldTitle4, True),
-            Field1=self.scenes[scId].field1,
-            Field2=self.scenes[scId].field2,
-            Field3=self.scenes[scId].field3,
-            Field4=self.scenes[scId].field4,
-            Date=scDate,
-            Time=scTime,
-            Day=scDay,
-            Hour=scHour,
-            Minute=scMinute,
-            ScDate=cmbDate,
-            ScTime=cmbTime,
-            LastsDays=lastsDays,
-            LastsHours=lastsHours,
-            LastsMinutes=lastsMinutes,
-            Duration=duration,
-            ReactionScene=reactionScene,
+        return dict(LastsDays=lastsDays, LastsHours=lastsHours, LastsMinutes=lastsMinutes,
+                    Duration=f'{days}{hours}{minutes}')
+
+    def _get_sceneReactionMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        """Create A/R marker string."""
+        if self.scenes[scId].isReactionScene:
+            return dict(ReactionScene=Scene.REACTION_MARKER)
+
+        return dict(ReactionScene=Scene.ACTION_MARKER)
+
+    def _get_sceneGoalMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(
             Goal=self._convert_from_yw(self.scenes[scId].goal),
             Conflict=self._convert_from_yw(self.scenes[scId].conflict),
             Outcome=self._convert_from_yw(self.scenes[scId].outcome),
-            Tags=self._convert_from_yw(tags, True),
-            Image=self.scenes[scId].image,
-            Characters=sceneChars,
-            Viewpoint=viewpointChar,
-            Locations=sceneLocs,
-            Items=sceneItems,
-            Notes=self._convert_from_yw(self.scenes[scId].notes),
+        )
+
+    def _get_sceneTagsMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        """Create a comma separated tag list."""
+        if self.scenes[scId].tags is not None:
+            tags = list_to_string(self.scenes[scId].tags, divider=self._DIVIDER)
+        else:
+            tags = ''
+        return dict(Tags=self._convert_from_yw(tags, True))
+
+    def _get_sceneLanguagesMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(Languages=list_to_string(self.scenes[scId].languages, divider=self._DIVIDER))
+
+    def _get_sceneImageMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(Image=self.scenes[scId].image)
+
+    def _get_sceneCharactersMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        """Create a comma separated character list."""
+        try:
+            # Note: Due to a bug, yWriter scenes might hold invalid
+            # viepoint characters
+            sChList = []
+            for crId in self.scenes[scId].characters:
+                sChList.append(self.characters[crId].title)
+            sceneChars = list_to_string(sChList, divider=self._DIVIDER)
+            viewpointChar = sChList[0]
+        except:
+            sceneChars = ''
+            viewpointChar = ''
+        return dict(Characters=sceneChars, Viewpoint=viewpointChar)
+
+    def _get_sceneLocationsMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        """Create a comma separated location list."""
+        if self.scenes[scId].locations is not None:
+            sLcList = []
+            for lcId in self.scenes[scId].locations:
+                sLcList.append(self.locations[lcId].title)
+            return dict(Locations=list_to_string(sLcList, divider=self._DIVIDER))
+
+        return dict(Locations='')
+
+    def _get_sceneItemsMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        """Create a comma separated item list."""
+        if self.scenes[scId].items is not None:
+            sItList = []
+            for itId in self.scenes[scId].items:
+                sItList.append(self.items[itId].title)
+            return dict(Items=list_to_string(sItList, divider=self._DIVIDER))
+
+        return dict(Items='')
+
+    def _get_sceneNotesMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(Notes=self._convert_from_yw(self.scenes[scId].notes))
+
+    def _get_sceneProjectMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        return dict(
             ProjectName=self._convert_from_yw(self.projectName, True),
             ProjectPath=self.projectPath,
         )
-        return sceneMapping
 
     def _get_characterMapping(self, crId):
         """Return a mapping dictionary for a character section.
@@ -466,6 +549,16 @@ class FileExport(Novel):
         )
         return itemMapping
 
+    def _get_template(self, text):
+        """Return a template object with a safe_substitute(mapping) method.
+        
+        Positional arguments:
+            text -- str: template string with placeholders.
+        
+        This is a template method that can be overridden by subclasses.
+        """
+        return Template(text)
+
     def _get_fileHeader(self):
         """Process the file header.
         
@@ -476,10 +569,36 @@ class FileExport(Novel):
         This is a template method that can be extended or overridden by subclasses.
         """
         lines = []
-        template = Template(self._fileHeader)
+        template = self._get_template(self._fileHeader)
         lines.append(template.safe_substitute(self._get_fileHeaderMapping()))
         return lines
 
+    def _render_chapter(self, template, chId, chapterNumber):
+        """Return a chapter section, substituting the template's placeholders.
+        
+        Positional arguments:
+            template -- template object returned by _get_template().
+            chId -- str: chapter ID.
+            chapterNumber -- int: chapter number to be displayed.
+        
+        This is a template method that can be extended or overridden by subclasses.
+        """
+        return template.safe_substitute(self._get_chapterMapping(chId, chapterNumber))
+
+    def _render_scene(self, template, scId, sceneNumber, wordsTotal, lettersTotal):
+        """Return a scene section, substituting the template's placeholders.
+        
+        Positional arguments:
+            template -- template object returned by _get_template().
+            scId -- str: scene ID.
+            sceneNumber -- int: scene number to be displayed.
+            wordsTotal -- int: accumulated wordcount.
+            lettersTotal -- int: accumulated lettercount.
+        
+        This is a template method that can be extended or overridden by subclasses.
+        """
+        return template.safe_substitute(self._get_sceneMapping(scId, sceneNumber, wordsTotal, lettersTotal))
+
     def _get_scenes(self, chId, sceneNumber, wordsTotal, lettersTotal, doNotExport):
         """Process the scenes.
         
@@ -517,26 +636,26 @@ class FileExport(Novel):
             # always unused.
             if self.scenes[scId].scType == 2:
                 if self._todoSceneTemplate:
-                    template = Template(self._todoSceneTemplate)
+                    template = self._get_template(self._todoSceneTemplate)
                 else:
                     continue
 
             elif self.scenes[scId].scType == 1:
                 # Scene is "Notes" type.
                 if self._notesSceneTemplate:
-                    template = Template(self._notesSceneTemplate)
+                    template = self._get_template(self._notesSceneTemplate)
                 else:
                     continue
 
             elif self.scenes[scId].scType == 3 or self.chapters[chId].chType == 3:
                 if self._unusedSceneTemplate:
-                    template = Template(self._unusedSceneTemplate)
+                    template = self._get_template(self._unusedSceneTemplate)
                 else:
                     continue
 
             elif self.scenes[scId].doNotExport or doNotExport:
                 if self._notExportedSceneTemplate:
-                    template = Template(self._notExportedSceneTemplate)
+                    template = self._get_template(self._notExportedSceneTemplate)
                 else:
                     continue
 
@@ -551,34 +670,50 @@ class FileExport(Novel):
                 dispNumber = sceneNumber
                 wordsTotal += self.scenes[scId].wordCount
                 lettersTotal += self.scenes[scId].letterCount
-                template = Template(self._sceneTemplate)
+                template = self._get_template(self._sceneTemplate)
                 if not firstSceneInChapter and self.scenes[scId].appendToPrev and self._appendedSceneTemplate:
-                    template = Template(self._appendedSceneTemplate)
+                    template = self._get_template(self._appendedSceneTemplate)
             if not (firstSceneInChapter or self.scenes[scId].appendToPrev):
                 lines.append(self._sceneDivider)
             if firstSceneInChapter and self._firstSceneTemplate:
-                template = Template(self._firstSceneTemplate)
-            lines.append(template.safe_substitute(self._get_sceneMapping(
-                        scId, dispNumber, wordsTotal, lettersTotal)))
+                template = self._get_template(self._firstSceneTemplate)
+            lines.append(self._render_scene(template, scId, dispNumber, wordsTotal, lettersTotal))
             firstSceneInChapter = False
         return lines, sceneNumber, wordsTotal, lettersTotal
 
     def _get_chapters(self):
         """Process the chapters and nested scenes.
         
+        Return a list of strings.
+        This is a template method that can be extended or overridden by subclasses.
+        """
+        return list(self._iter_chapters())
+
+    def _iter_chapters(self):
+        """Process the chapters and nested scenes one by one.
+        
         Iterate through the sorted chapter list and apply the templates, 
         substituting placeholders according to the chapter mapping dictionary.
         For each chapter call the processing of its included scenes.
         Skip chapters not accepted by the chapter filter.
-        Return a list of strings.
+        Generate strings, so that the lines can be written before all chapters are processed.
+        Report the progress to the ui in up to _PROGRESS_STEPS steps, and stop between two chapters if the ui asks to cancel.
         This is a template method that can be extended or overridden by subclasses.
         """
-        lines = []
         chapterNumber = 0
         sceneNumber = 0
         wordsTotal = 0
         lettersTotal = 0
+        chapterCount = 0
+        total = len(self.srtChapters)
+        step = max((total + self._PROGRESS_STEPS - 1) // self._PROGRESS_STEPS, 1)
         for chId in self.srtChapters:
+            if self.ui.is_canceled():
+                return
+
+            if chapterCount % step == 0:
+                self.ui.set_progress(_('Creating report'), chapterCount, total)
+            chapterCount += 1
             dispNumber = 0
             if not self._chapterFilter.accept(self, chId):
                 continue
@@ -601,57 +736,57 @@ class FileExport(Novel):
                 if self.chapters[chId].chLevel == 1:
                     # Chapter is "Todo Part" type.
                     if self._todoPartTemplate:
-                        template = Template(self._todoPartTemplate)
+                        template = self._get_template(self._todoPartTemplate)
                 elif self._todoChapterTemplate:
-                    template = Template(self._todoChapterTemplate)
+                    template = self._get_template(self._todoChapterTemplate)
             elif self.chapters[chId].chType == 1:
                 # Chapter is "Notes" type.
                 if self.chapters[chId].chLevel == 1:
                     # Chapter is "Notes Part" type.
                     if self._notesPartTemplate:
-                        template = Template(self._notesPartTemplate)
+                        template = self._get_template(self._notesPartTemplate)
                 elif self._notesChapterTemplate:
-                    template = Template(self._notesChapterTemplate)
+                    template = self._get_template(self._notesChapterTemplate)
             elif self.chapters[chId].chType == 3:
                 # Chapter is "unused" type.
                 if self._unusedChapterTemplate:
-                    template = Template(self._unusedChapterTemplate)
+                    template = self._get_template(self._unusedChapterTemplate)
             elif doNotExport:
                 if self._notExportedChapterTemplate:
-                    template = Template(self._notExportedChapterTemplate)
+                    template = self._get_template(self._notExportedChapterTemplate)
             elif self.chapters[chId].chLevel == 1 and self._partTemplate:
-                template = Template(self._partTemplate)
+                template = self._get_template(self._partTemplate)
             else:
-                template = Template(self._chapterTemplate)
+                template = self._get_template(self._chapterTemplate)
                 chapterNumber += 1
                 dispNumber = chapterNumber
             if template is not None:
-                lines.append(template.safe_substitute(self._get_chapterMapping(chId, dispNumber)))
+                yield self._render_chapter(template, chId, dispNumber)
 
             #--- Process scenes.
             sceneLines, sceneNumber, wordsTotal, lettersTotal = self._get_scenes(
                 chId, sceneNumber, wordsTotal, lettersTotal, doNotExport)
-            lines.extend(sceneLines)
+            yield from sceneLines
 
             #--- Process chapter ending.
             template = None
             if self.chapters[chId].chType == 2:
                 if self._todoChapterEndTemplate:
-                    template = Template(self._todoChapterEndTemplate)
+                    template = self._get_template(self._todoChapterEndTemplate)
             elif self.chapters[chId].chType == 1:
                 if self._notesChapterEndTemplate:
-                    template = Template(self._notesChapterEndTemplate)
+                    template = self._get_template(self._notesChapterEndTemplate)
             elif self.chapters[chId].chType == 3:
                 if self._unusedChapterEndTemplate:
-                    template = Template(self._unusedChapterEndTemplate)
+                    template = self._get_template(self._unusedChapterEndTemplate)
             elif doNotExport:
                 if self._notExportedChapterEndTemplate:
-                    template = Template(self._notExportedChapterEndTemplate)
+                    template = self._get_template(self._notExportedChapterEndTemplate)
             elif self._chapterEndTemplate:
-                template = Template(self._chapterEndTemplate)
+                template = self._get_template(self._chapterEndTemplate)
             if template is not None:
-                lines.append(template.safe_substitute(self._get_chapterMapping(chId, dispNumber)))
-        return lines
+                yield self._render_chapter(template, chId, dispNumber)
+        self.ui.set_progress(_('Creating report'), chapterCount, total)
 
     def _get_characters(self):
         """Process the characters.
@@ -666,7 +801,7 @@ class FileExport(Novel):
             lines = [self._characterSectionHeading]
         else:
             lines = []
-        template = Template(self._characterTemplate)
+        template = self._get_template(self._characterTemplate)
         for crId in self.srtCharacters:
             if self._characterFilter.accept(self, crId):
                 lines.append(template.safe_substitute(self._get_characterMapping(crId)))
@@ -685,7 +820,7 @@ class FileExport(Novel):
             lines = [self._locationSectionHeading]
         else:
             lines = []
-        template = Template(self._locationTemplate)
+        template = self._get_template(self._locationTemplate)
         for lcId in self.srtLocations:
             if self._locationFilter.accept(self, lcId):
                 lines.append(template.safe_substitute(self._get_locationMapping(lcId)))
@@ -704,7 +839,7 @@ class FileExport(Novel):
             lines = [self._itemSectionHeading]
         else:
             lines = []
-        template = Template(self._itemTemplate)
+        template = self._get_template(self._itemTemplate)
         for itId in self.srtItems:
             if self._itemFilter.accept(self, itId):
                 lines.append(template.safe_substitute(self._get_itemMapping(itId)))
@@ -720,7 +855,7 @@ class FileExport(Novel):
         This is a template method that can be extended or overridden by subclasses.
         """
         lines = []
-        template = Template(self._projectNoteTemplate)
+        template = self._get_template(self._projectNoteTemplate)
         for pnId in self.srtPrjNotes:
             map = self._get_prjNoteMapping(pnId)
             lines.append(template.safe_substitute(map))
@@ -745,23 +880,18 @@ class FileExport(Novel):
         """Write instance variables to the export file.
         
         Create a template-based output file. 
+        If the ui asks to cancel while the text is processed, do not write anything.
+        The file is replaced atomically; an existing file is kept as a backup.
         Return a message beginning with the ERROR constant in case of error.
         """
         text = self._get_text()
-        backedUp = False
-        if os.path.isfile(self.filePath):
-            try:
-                os.replace(self.filePath, f'{self.filePath}.bak')
-                backedUp = True
-            except:
-                return f'{ERROR}{_("Cannot overwrite file")}: "{os.path.normpath(self.filePath)}".'
+        if self.ui.is_canceled():
+            return f'{ERROR}{_("Action canceled by user")}.'
 
         try:
-            with open(self.filePath, 'w', encoding='utf-8') as f:
+            with AtomicFile(self.filePath) as f:
                 f.write(text)
         except:
-            if backedUp:
-                os.replace(f'{self.filePath}.bak', self.filePath)
             return f'{ERROR}{_("Cannot write file")}: "{os.path.normpath(self.filePath)}".'
 
         return f'{_("File written")}: "{os.path.normpath(self.filePath)}".'
@@ -14,6 +14,10 @@ class BasicElement:
         desc -- str: description.
         kwVar -- dict: custom keyword variables.
     """
+    # Elements are numerous, so they do without a per-instance dictionary.
+    # Subclasses declare their own __slots__; a subclass without them, like Novel, gets a dictionary.
+    __slots__ = ('title', 'desc', 'kwVar')
+
 
     def __init__(self):
         """Initialize instance variables."""
@@ -17,6 +17,7 @@ class Character(WorldElement):
         fullName -- str: full name (the title inherited may be a short name).
         isMajor -- bool: True, if it's a major character.
     """
+    __slots__ = ('notes', 'bio', 'goals', 'fullName', 'isMajor')
     MAJOR_MARKER = 'Major'
     MINOR_MARKER = 'Minor'
 
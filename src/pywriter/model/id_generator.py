@@ -17,3 +17,67 @@ def create_id(elements):
         i += 1
     return str(i)
 
+
+
+class IdAllocator:
+    """Allocator of unused IDs for new elements of a Novel instance.
+    
+    For each element type, keep a high-water mark, i.e. the number following the highest ID in use,
+    so that allocating an ID does not search all existing elements.
+    
+    Public methods:
+        new_id(elementType, fillGaps=False) -- Return an unused ID for a new element.
+        reset(elementType=None) -- Forget the high-water marks.
+    """
+
+    def __init__(self, novel):
+        """Initialize instance variables.
+        
+        Positional arguments:
+            novel -- Novel instance whose elements get the IDs.
+        """
+        self._novel = novel
+        self._nextIds = {}
+        # key: element type, i.e. the name of the novel's dictionary (e.g. 'scenes'), value: int: next ID.
+
+    def new_id(self, elementType, fillGaps=False):
+        """Return an unused ID for a new element.
+        
+        Positional arguments:
+            elementType -- str: name of the novel's dictionary containing the elements (e.g. 'chapters').
+            
+        Optional arguments:
+            fillGaps -- bool: if True, return the lowest unused ID instead of the next one above the highest.
+        
+        Without fillGaps, successive calls return different IDs, even if no element is added meanwhile.
+        """
+        elements = getattr(self._novel, elementType)
+        if fillGaps:
+            return create_id(elements)
+
+        try:
+            i = self._nextIds[elementType]
+        except KeyError:
+            i = 1
+            for elemId in elements:
+                try:
+                    if int(elemId) >= i:
+                        i = int(elemId) + 1
+                except ValueError:
+                    pass
+        while str(i) in elements:
+            # Elements may have been added meanwhile without using the allocator.
+            i += 1
+        self._nextIds[elementType] = i + 1
+        return str(i)
+
+    def reset(self, elementType=None):
+        """Forget the high-water marks, e.g. after reading the novel again.
+        
+        Optional arguments:
+            elementType -- str: name of the novel's dictionary to reset. If None, reset all types.
+        """
+        if elementType is None:
+            self._nextIds.clear()
+        else:
+            self._nextIds.pop(elementType, None)
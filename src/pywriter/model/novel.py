@@ -15,6 +15,8 @@ from pywriter.model.chapter import Chapter
 from pywriter.model.scene import Scene
 from pywriter.model.character import Character
 from pywriter.model.world_element import WorldElement
+from pywriter.model.id_generator import IdAllocator
+from pywriter.ui.ui import Ui
 
 
 class Novel(BasicElement):
@@ -52,6 +54,8 @@ class Novel(BasicElement):
         projectName -- str: URL-coded file name without suffix and extension. 
         projectPath -- str: URL-coded path to the project directory. 
         filePath -- str: path to the file (property with getter and setter). 
+        ui -- Ui instance receiving the progress reports, and telling whether to cancel.
+        idAllocator -- IdAllocator instance providing the IDs of new elements.
     """
     DESCRIPTION = _('Novel')
     EXTENSION = None
@@ -188,6 +192,14 @@ class Novel(BasicElement):
         self.languageCode = None
         self.countryCode = None
 
+        self.ui = Ui('')
+        # Ui instance
+        # Per default, progress is not shown, and processing is not canceled.
+
+        self.idAllocator = IdAllocator(self)
+        # IdAllocator instance
+        # Keeps track of the next free ID per element type.
+
         self.filePath = filePath
 
     @property
@@ -269,14 +281,14 @@ class Novel(BasicElement):
         Example:
         - language markup: 'Standard text [lang=en-AU]Australian text[/lang=en-AU].'
         - language code: 'en-AU'
+        
+        The codes are taken from the scenes' language lists, in order of appearance.
         """
-        self.languages = []
-        for scId in self.scenes:
-            text = self.scenes[scId].sceneContent
-            if text:
-                for language in get_languages(text):
-                    if not language in self.languages:
-                        self.languages.append(language)
+        languages = {}
+        # Dictionary used as an ordered set.
+        for scene in self.scenes.values():
+            languages.update(dict.fromkeys(scene.languages))
+        self.languages = list(languages)
 
     def check_locale(self):
         """Check the document's locale (language code and country code).
@@ -4,18 +4,22 @@ Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
-import re
 from pywriter.model.basic_element import BasicElement
+from pywriter.model.word_counter import get_counts
 from pywriter.pywriter_globals import *
 
 
 class Scene(BasicElement):
     """yWriter scene representation.
     
+    Public methods:
+        update_counts(text) -- update word count, letter count, and languages without storing the text.
+
     Public instance variables:
         sceneContent -- str: scene content (property with getter and setter).
         wordCount - int: word count (derived; updated by the sceneContent setter).
         letterCount - int: letter count (derived; updated by the sceneContent setter).
+        languages -- tuple of str: language codes in the scene content (derived; updated by the sceneContent setter).
         scType -- int: Scene type (Normal/Notes/Todo/Unused).
         doNotExport -- bool: True if the scene is not to be exported to RTF.
         status -- int: scene status (Outline/Draft/1st Edit/2nd Edit/Done).
@@ -44,6 +48,11 @@ class Scene(BasicElement):
         lastsDays -- str: scene duration: days. 
         image -- str:  path to an image related to the scene. 
     """
+    __slots__ = ('_sceneContent', 'wordCount', 'letterCount', 'languages', 'scType', 'doNotExport', 'status',
+                 'notes', 'tags', 'field1', 'field2', 'field3', 'field4', 'appendToPrev', 'isReactionScene',
+                 'isSubPlot', 'goal', 'conflict', 'outcome', 'characters', 'locations', 'items', 'date', 'time',
+                 'minute', 'hour', 'day', 'lastsMinutes', 'lastsHours', 'lastsDays', 'image')
+
     STATUS = (None, 'Outline', 'Draft', '1st Edit', '2nd Edit', 'Done')
     # Emulate an enumeration for the scene status
     # Since the items are used to replace text,
@@ -75,6 +84,11 @@ class Scene(BasicElement):
         # xml: <LetterCount>
         # To be updated by the sceneContent setter
 
+        self.languages = ()
+        # tuple of str
+        # Language codes of the scene content's [lang=...] markup, in order of first appearance.
+        # To be updated by the sceneContent setter
+
         self.scType = None
         # Scene type (Normal/Notes/Todo/Unused).
         #
@@ -219,11 +233,19 @@ class Scene(BasicElement):
 
     @sceneContent.setter
     def sceneContent(self, text):
-        """Set sceneContent updating word count and letter count."""
+        """Set sceneContent updating word count, letter count, and languages."""
         self._sceneContent = text
-        text = ADDITIONAL_WORD_LIMITS.sub(' ', text)
-        text = NO_WORD_LIMITS.sub('', text)
-        wordList = text.split()
-        self.wordCount = len(wordList)
-        text = NON_LETTERS.sub('', self._sceneContent)
-        self.letterCount = len(text)
+        self.update_counts(text)
+
+    def update_counts(self, text):
+        """Update word count, letter count, and languages without storing the text.
+        
+        Positional arguments:
+            text -- str: scene content with yW7 raw markup.
+        """
+        self.wordCount, self.letterCount = get_counts(text)
+        if text and '[lang=' in text:
+            self.languages = tuple(dict.fromkeys(get_languages(text)))
+        else:
+            # Most scenes have no language markup; skip the regular expression scan.
+            self.languages = ()
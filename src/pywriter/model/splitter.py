@@ -4,6 +4,7 @@ Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
+import re
 from pywriter.pywriter_globals import *
 
 
@@ -16,6 +17,12 @@ class Splitter:
     Public methods:
         split_scenes(novel) -- Split scenes by inserted chapter and scene dividers.
         
+    Public instance variables:
+        splitScenes -- int: number of scenes split by the last split_scenes() call.
+        newScenes -- int: number of scenes created by the last split_scenes() call.
+        newChapters -- int: number of chapters created by the last split_scenes() call.
+        newParts -- int: number of parts created by the last split_scenes() call.
+
     Public class constants:
         PART_SEPARATOR -- marker indicating the beginning of a new part, splitting a scene.
         CHAPTER_SEPARATOR -- marker indicating the beginning of a new chapter, splitting a scene.
@@ -27,6 +34,15 @@ class Splitter:
     DESC_SEPARATOR = '|'
     _CLIP_TITLE = 20
     # Maximum length of newly generated scene titles.
+    _DIVIDER_LINE = re.compile('^#.*$', re.MULTILINE)
+    # Any line beginning with a part, chapter, or scene separator.
+
+    def __init__(self):
+        """Initialize instance variables."""
+        self.splitScenes = 0
+        self.newScenes = 0
+        self.newChapters = 0
+        self.newParts = 0
 
     def split_scenes(self, novel):
         """Split scenes by inserted chapter and scene dividers.
@@ -37,6 +53,9 @@ class Splitter:
         Positional argument: 
             novel -- Novel instance to update.
         
+        The IDs of the new chapters and scenes are taken from the novel's ID allocator.
+        The scene content is searched for divider lines, and sliced between them,
+        so the lines of large scenes are not processed one by one.
         Return True if the sructure has changed, 
         otherwise return False.        
         """
@@ -107,17 +126,11 @@ class Splitter:
             newScene.lastsMinutes = parent.lastsMinutes
             novel.scenes[sceneId] = newScene
 
-        # Get the maximum chapter ID and scene ID.
-        chIdMax = 0
-        scIdMax = 0
-        for chId in novel.srtChapters:
-            if int(chId) > chIdMax:
-                chIdMax = int(chId)
-        for scId in novel.scenes:
-            if int(scId) > scIdMax:
-                scIdMax = int(scId)
-
         # Process chapters and scenes.
+        self.splitScenes = 0
+        self.newScenes = 0
+        self.newChapters = 0
+        self.newParts = 0
         scenesSplit = False
         srtChapters = []
         for chId in novel.srtChapters:
@@ -129,14 +142,32 @@ class Splitter:
                 if not novel.scenes[scId].sceneContent:
                     continue
 
+                sections = self._get_sections(novel.scenes[scId].sceneContent)
+                if len(sections) == 1 and sections[0][0] is None:
+                    # There are no dividers.
+                    continue
+
+                self.splitScenes += 1
                 sceneId = scId
-                lines = novel.scenes[scId].sceneContent.split('\n')
-                newLines = []
+                content = ''
                 inScene = True
                 sceneSplitCount = 0
 
-                # Search scene content for dividers.
-                for line in lines:
+                # Process the dividers and the text between them.
+                for line, text in sections:
+                    if line is None:
+                        content = text
+                        if not inScene:
+                            # Append a scene without heading to a new chapter or part.
+                            sceneSplitCount += 1
+                            sceneId = novel.idAllocator.new_id('scenes')
+                            create_scene(sceneId, novel.scenes[scId], sceneSplitCount, '', '')
+                            srtScenes.append(sceneId)
+                            self.newScenes += 1
+                            scenesSplit = True
+                            inScene = True
+                        continue
+
                     heading = line.strip('# ').split(self.DESC_SEPARATOR)
                     title = heading[0]
                     try:
@@ -145,59 +176,71 @@ class Splitter:
                         desc = ''
                     if line.startswith(self.SCENE_SEPARATOR):
                         # Split the scene.
-                        novel.scenes[sceneId].sceneContent = '\n'.join(newLines)
-                        newLines = []
+                        if inScene:
+                            novel.scenes[sceneId].sceneContent = content
+                            content = ''
                         sceneSplitCount += 1
-                        scIdMax += 1
-                        sceneId = str(scIdMax)
+                        sceneId = novel.idAllocator.new_id('scenes')
                         create_scene(sceneId, novel.scenes[scId], sceneSplitCount, title, desc)
                         srtScenes.append(sceneId)
+                        self.newScenes += 1
                         scenesSplit = True
                         inScene = True
                     elif line.startswith(self.CHAPTER_SEPARATOR):
                         # Start a new chapter.
                         if inScene:
-                            novel.scenes[sceneId].sceneContent = '\n'.join(newLines)
-                            newLines = []
+                            novel.scenes[sceneId].sceneContent = content
+                            content = ''
                             sceneSplitCount = 0
                             inScene = False
                         novel.chapters[chapterId].srtScenes = srtScenes
                         srtScenes = []
-                        chIdMax += 1
-                        chapterId = str(chIdMax)
+                        chapterId = novel.idAllocator.new_id('chapters')
                         if not title:
                             title = _('New Chapter')
                         create_chapter(chapterId, title, desc, 0)
                         srtChapters.append(chapterId)
+                        self.newChapters += 1
                         scenesSplit = True
-                    elif line.startswith(self.PART_SEPARATOR):
+                    else:
                         # start a new part.
                         if inScene:
-                            novel.scenes[sceneId].sceneContent = '\n'.join(newLines)
-                            newLines = []
+                            novel.scenes[sceneId].sceneContent = content
+                            content = ''
                             sceneSplitCount = 0
                             inScene = False
                         novel.chapters[chapterId].srtScenes = srtScenes
                         srtScenes = []
-                        chIdMax += 1
-                        chapterId = str(chIdMax)
+                        chapterId = novel.idAllocator.new_id('chapters')
                         if not title:
                             title = _('New Part')
                         create_chapter(chapterId, title, desc, 1)
                         srtChapters.append(chapterId)
-                    elif not inScene:
-                        # Append a scene without heading to a new chapter or part.
-                        newLines.append(line)
-                        sceneSplitCount += 1
-                        scIdMax += 1
-                        sceneId = str(scIdMax)
-                        create_scene(sceneId, novel.scenes[scId], sceneSplitCount, '', '')
-                        srtScenes.append(sceneId)
-                        scenesSplit = True
-                        inScene = True
-                    else:
-                        newLines.append(line)
-                novel.scenes[sceneId].sceneContent = '\n'.join(newLines)
+                        self.newParts += 1
+                if inScene:
+                    novel.scenes[sceneId].sceneContent = content
             novel.chapters[chapterId].srtScenes = srtScenes
         novel.srtChapters = srtChapters
         return scenesSplit
+
+    def _get_sections(self, text):
+        """Return a list of the text's divider lines and the text between them.
+        
+        Positional arguments:
+            text -- str: scene content with yW7 raw markup.
+        
+        Each list entry is a tuple (line, None) for a divider line, 
+        or (None, text) for the lines between two dividers, without the enclosing line breaks. 
+        Adjacent dividers have no entry between them; an empty line between them is an empty string.
+        """
+        sections = []
+        start = 0
+        # Position of the next line not yet processed.
+        for divider in self._DIVIDER_LINE.finditer(text):
+            if start < divider.start():
+                sections.append((None, text[start:divider.start() - 1]))
+            sections.append((divider.group(), None))
+            start = divider.end() + 1
+        if start <= len(text):
+            sections.append((None, text[start:]))
+        return sections
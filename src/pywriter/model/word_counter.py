@@ -0,0 +1,69 @@
+"""Provide functions for counting words and letters of scene texts.
+
+The counts are the same as with the ADDITIONAL_WORD_LIMITS, NO_WORD_LIMITS,
+and NON_LETTERS regular expressions, i.e. like in LibreOffice.
+See: https://help.libreoffice.org/latest/en-GB/text/swriter/guide/words_count.html
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import re
+from pywriter.pywriter_globals import *
+
+WORD_JOINS = re.compile(r'\[.+?\]|\/\*.+?\*\/|-')
+# NO_WORD_LIMITS without the quote marker at the line start,
+# which is the expensive part for the regex engine.
+
+
+def get_counts(text):
+    """Return a tuple: (word count, letter count) of a scene text.
+
+    Positional arguments:
+        text -- str: scene content with yW7 raw markup.
+
+    The text is scanned by the str methods, which are much faster than the regex engine.
+    The regular expressions are applied only if the text contains markup or comments,
+    or lines beginning with a quote marker.
+    Without markup, the letter count is calculated without copying the text.
+    """
+    hasMarkup = '[' in text or '/*' in text
+    if hasMarkup:
+        letterCount = len(NON_LETTERS.sub('', text))
+    else:
+        letterCount = len(text) - text.count('\n') - text.count('\r')
+
+    # Make dashes and dash replacements word limits.
+    # Replacing them one after another gives the same result as ADDITIONAL_WORD_LIMITS.
+    wordText = text.replace('--', ' ').replace('—', ' ').replace('–', ' ')
+
+    # Exclude markup and comments, and make hyphens join words.
+    if wordText.startswith('>') or '\n>' in wordText:
+        wordText = NO_WORD_LIMITS.sub('', wordText)
+    elif hasMarkup:
+        wordText = WORD_JOINS.sub('', wordText)
+    else:
+        wordText = wordText.replace('-', '')
+    return len(wordText.split()), letterCount
+
+
+def update_scene_counts(scenes):
+    """Update word count, letter count, and languages of many scenes in one call.
+
+    Positional arguments:
+        scenes -- iterable of Scene instances, e.g. the values of Novel.scenes.
+
+    Scenes without content are skipped.
+    Return the total word count and the total letter count as a tuple.
+    """
+    wordsTotal = 0
+    lettersTotal = 0
+    for scene in scenes:
+        text = scene.sceneContent
+        if text is None:
+            continue
+
+        scene.update_counts(text)
+        wordsTotal += scene.wordCount
+        lettersTotal += scene.letterCount
+    return wordsTotal, lettersTotal
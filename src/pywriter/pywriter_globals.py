@@ -112,11 +112,10 @@ def get_languages(text):
     Example:
     - language markup: 'Standard text [lang=en-AU]Australian text[/lang=en-AU].'
     - language code: 'en-AU'
+    
+    The text is scanned once; codes occurring more than once are returned each time.
     """
     if text:
-        m = LANGUAGE_TAG.search(text)
-        while m:
-            text = text[m.span()[1]:]
+        for m in LANGUAGE_TAG.finditer(text):
             yield m.group(1)
-            m = LANGUAGE_TAG.search(text)
 
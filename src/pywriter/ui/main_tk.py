@@ -172,7 +172,7 @@ class MainTk(Ui):
         if self.ywPrj is not None:
             self.close_project()
         self.kwargs['yw_last_open'] = fileName
-        self.ywPrj = self._YW_CLASS(fileName)
+        self.ywPrj = self._YW_CLASS(fileName, **self.kwargs)
         message = self.ywPrj.read()
         if message.startswith(ERROR):
             self.close_project()
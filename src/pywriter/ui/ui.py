@@ -17,12 +17,18 @@ class Ui:
         ask_yes_no(text) -- return True or False.
         set_info_what(message) -- show what the converter is going to do.
         set_info_how(message) -- show how the converter is doing.
+        set_progress(message, count, total) -- show how far the converter has got.
+        cancel() -- ask the converter to stop.
+        is_canceled() -- return True if the converter is asked to stop.
         start() -- launch the GUI, if any.
         show_warning(message) -- Stub for displaying a warning message.
         
     Public instance variables:
         infoWhatText -- buffer for general messages.
         infoHowText -- buffer for error/success messages.
+
+    The file classes report their progress to the UI, and check 
+    whether to cancel between the processing of two chapters.
     """
 
     def __init__(self, title):
@@ -33,6 +39,7 @@ class Ui:
         """
         self.infoWhatText = ''
         self.infoHowText = ''
+        self._canceled = False
 
     def ask_yes_no(self, text):
         """Return True or False.
@@ -66,6 +73,29 @@ class Ui:
             sys.stderr.write(message)
         self.infoHowText = message
 
+    def set_progress(self, message, count, total):
+        """Show how far the converter has got.
+        
+        Positional arguments:
+            message -- str: what the converter is doing.
+            count -- int: number of elements processed.
+            total -- int: number of elements to be processed.
+            
+        This is a stub used for "silent mode".
+        The application may use a subclass for displaying the progress.
+        """
+
+    def cancel(self):
+        """Ask the converter to stop.
+        
+        The converter stops at the next check, discarding unfinished output.
+        """
+        self._canceled = True
+
+    def is_canceled(self):
+        """Return True if the converter is asked to stop."""
+        return self._canceled
+
     def start(self):
         """Launch the GUI, if any.
         
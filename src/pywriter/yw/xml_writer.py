@@ -0,0 +1,78 @@
+"""Helper module for writing yWriter xml files with CDATA sections.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+
+
+def write_xml(root, f, cdataTags):
+    """Write an xml element tree in the yWriter format.
+
+    Positional arguments:
+        root -- xml element: the root of the tree to write.
+        f -- text file object open for writing.
+        cdataTags -- collection of str: names of the xml elements whose contents are put in CDATA sections.
+
+    Write an xml header on top, put the contents of the cdataTags elements
+    in CDATA sections, and write the text without xml entities.
+    The elements are serialized in one pass; the output is the same as
+    writing the tree with ElementTree and then inserting the CDATA tags.
+    """
+    f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+    _write_element(root, f.write, frozenset(cdataTags), True)
+
+
+def _write_element(elem, write, cdataTags, fix):
+    """Write an xml element and its tail.
+
+    Positional arguments:
+        elem -- xml element to write.
+        write -- function writing a string.
+        cdataTags -- frozenset of str: names of the xml elements whose contents are put in CDATA sections.
+        fix -- bool: if True, adjust the text; otherwise the enclosing CDATA section does.
+    """
+    tag = elem.tag
+    text = elem.text
+    attributes = ''.join(f' {key}="{value}"' for key, value in elem.items())
+    if text or len(elem):
+        if tag in cdataTags:
+            # Adjust the whole CDATA section at once, including the delimiters.
+            parts = ['[CDATA[']
+            if text:
+                parts.append(text)
+            for child in elem:
+                _write_element(child, parts.append, cdataTags, False)
+            parts.append(']]')
+            write(f'<{tag}{attributes}><!{_fix_text("".join(parts))}></{tag}>')
+        else:
+            write(f'<{tag}{attributes}>')
+            if text:
+                if fix:
+                    text = _fix_text(text)
+                write(text)
+            for child in elem:
+                _write_element(child, write, cdataTags, fix)
+            write(f'</{tag}>')
+    else:
+        write(f'<{tag}{attributes} />')
+    tail = elem.tail
+    if tail:
+        if fix:
+            tail = _fix_text(tail)
+        write(tail)
+
+
+def _fix_text(text):
+    """Return text with unified line breaks, and without leading or trailing line breaks in CDATA sections.
+
+    Positional arguments:
+        text -- str: text to adjust.
+    """
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    if '[CDATA[ \n' in text:
+        text = text.replace('[CDATA[ \n', '[CDATA[')
+    if '\n]]' in text:
+        text = text.replace('\n]]', ']]')
+    return text
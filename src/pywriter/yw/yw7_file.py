@@ -8,13 +8,135 @@ Published under the MIT License (https://opensource.org/licenses/mit-license.php
 """
 import os
 import re
-from html import unescape
 import xml.etree.ElementTree as ET
 from pywriter.pywriter_globals import *
 from pywriter.model.novel import Novel
+from pywriter.file.atomic_file import AtomicFile
 from pywriter.model.id_generator import create_id
 from pywriter.model.splitter import Splitter
 from pywriter.yw.xml_indent import indent
+from pywriter.yw.xml_writer import write_xml
+
+
+def merge_lists(srcLst, tgtLst):
+    """Insert srcLst items to tgtLst, if missing.
+
+    Positional arguments:
+        srcLst -- list: source IDs in the order to be kept.
+        tgtLst -- list: target IDs, updated in place.
+
+    A missing item is inserted after the item preceding it in srcLst,
+    or at the beginning, if there is none.
+    Instead of searching tgtLst for each item, note the insertions,
+    and then rebuild tgtLst in one pass.
+    """
+    known = set(tgtLst)
+    followers = {}
+    # key: item (None: the list's beginning), value: list of the items to be inserted after it.
+    # An item inserted later at the same place comes first.
+    previous = None
+    for item in srcLst:
+        if not item in known:
+            known.add(item)
+            followers.setdefault(previous, []).append(item)
+        previous = item
+    if not followers:
+        return
+
+    mergedLst = []
+    for item in [None] + tgtLst:
+        stack = [item]
+        while stack:
+            item = stack.pop()
+            if item is not None:
+                mergedLst.append(item)
+            stack.extend(followers.pop(item, ()))
+    tgtLst[:] = mergedLst
+
+
+#--- Decoders for the Yw7File dispatch tables.
+# Positional arguments: the Yw7File instance, the element to be updated, and the xml child element.
+
+
+def _decode_scene_content(ywProject, scene, xmlElement):
+    if xmlElement.text is not None:
+        scene.sceneContent = xmlElement.text
+
+
+def _decode_status(ywProject, scene, xmlElement):
+    scene.status = int(xmlElement.text)
+
+
+def _decode_tags(ywProject, element, xmlElement):
+    if xmlElement.text is not None:
+        element.tags = ywProject._strip_spaces(string_to_list(xmlElement.text))
+
+
+def _decode_scene_characters(ywProject, scene, xmlElement):
+    scene.characters = [xmlId.text for xmlId in xmlElement.iter('CharID')] or None
+
+
+def _decode_scene_locations(ywProject, scene, xmlElement):
+    scene.locations = [xmlId.text for xmlId in xmlElement.iter('LocID')] or None
+
+
+def _decode_scene_items(ywProject, scene, xmlElement):
+    scene.items = [xmlId.text for xmlId in xmlElement.iter('ItemID')] or None
+
+
+def _decode_scene_fields(ywProject, scene, xmlElement):
+    kwVarNames = ywProject._SCN_KWVAR
+    for xmlField in xmlElement:
+        tag = xmlField.tag
+        if tag == 'Field_SceneType':
+            if xmlField.text == '1':
+                scene.scType = 1
+            elif xmlField.text == '2':
+                scene.scType = 2
+        if tag in kwVarNames:
+            scene.kwVar[tag] = xmlField.text
+
+
+def _decode_chapter_scenes(ywProject, chapter, xmlElement):
+    chapter.srtScenes = [xmlId.text for xmlId in xmlElement.findall('ScID')]
+
+
+def _decode_chapter_fields(ywProject, chapter, xmlElement):
+    chapter.isTrash = False
+    chapter.suppressChapterBreak = False
+    kwVarNames = ywProject._CHP_KWVAR
+    for xmlField in xmlElement:
+        tag = xmlField.tag
+        if tag == 'Field_SuppressChapterTitle':
+            if xmlField.text == '1':
+                chapter.suppressChapterTitle = True
+        elif tag == 'Field_IsTrash':
+            if xmlField.text == '1':
+                chapter.isTrash = True
+        elif tag == 'Field_SuppressChapterBreak':
+            if xmlField.text == '1':
+                chapter.suppressChapterBreak = True
+        if tag in kwVarNames:
+            chapter.kwVar[tag] = xmlField.text
+
+
+def _decode_custom_fields(element, xmlElement, kwVarNames):
+    for xmlField in xmlElement:
+        if xmlField.tag in kwVarNames:
+            element.kwVar[xmlField.tag] = xmlField.text
+
+
+def _decode_location_fields(ywProject, location, xmlElement):
+    _decode_custom_fields(location, xmlElement, ywProject._LOC_KWVAR)
+
+
+def _decode_item_fields(ywProject, item, xmlElement):
+    _decode_custom_fields(item, xmlElement, ywProject._ITM_KWVAR)
+
+
+def _decode_character_fields(ywProject, character, xmlElement):
+    _decode_custom_fields(character, xmlElement, ywProject._CRT_KWVAR)
+
 
 
 class Yw7File(Novel):
@@ -30,6 +152,7 @@ class Yw7File(Novel):
     Public instance variables:
         tree -- xml element tree of the yWriter project
         scenesSplit -- bool: True, if a scene or chapter is split during merging.
+        sceneSplitter -- Splitter instance holding the split statistics of the last merging.
     """
     DESCRIPTION = _('yWriter 7 project')
     EXTENSION = '.yw7'
@@ -40,13 +163,86 @@ class Yw7File(Novel):
                    'Notes', 'RTFFile', 'SceneContent',
                    'Outcome', 'Goal', 'Conflict']
     # Names of xml elements containing CDATA.
-    # ElementTree.write omits CDATA tags, so they have to be inserted afterwards.
+    # ElementTree.write omits CDATA tags, so the tree is written by write_xml().
+
+    _PROGRESS_STEPS = 100
+    # Maximum number of progress reports per read().
 
     _PRJ_KWVAR = (
         'Field_LanguageCode',
         'Field_CountryCode',
         )
 
+    _SCN_DECODERS = dict(
+        ID=True,
+        Title='title',
+        Desc='desc',
+        SceneContent=_decode_scene_content,
+        Fields=_decode_scene_fields,
+        Unused=True,
+        ExportCondSpecific=True,
+        ExportWhenRTF=True,
+        Status=_decode_status,
+        Notes='notes',
+        Tags=_decode_tags,
+        Field1='field1',
+        Field2='field2',
+        Field3='field3',
+        Field4='field4',
+        AppendToPrev=True,
+        SpecificDateTime=True,
+        Day=True,
+        Hour=True,
+        Minute=True,
+        LastsDays='lastsDays',
+        LastsHours='lastsHours',
+        LastsMinutes='lastsMinutes',
+        ReactionScene=True,
+        SubPlot=True,
+        Goal='goal',
+        Conflict='conflict',
+        Outcome='outcome',
+        ImageFile='image',
+        Characters=_decode_scene_characters,
+        Locations=_decode_scene_locations,
+        Items=_decode_scene_items,
+        )
+    _CHP_DECODERS = dict(
+        ID=True,
+        Title='title',
+        Desc='desc',
+        SectionStart=True,
+        Unused=True,
+        ChapterType=True,
+        Type=True,
+        Fields=_decode_chapter_fields,
+        Scenes=_decode_chapter_scenes,
+        )
+    _LOC_DECODERS = dict(
+        ID=True,
+        Title='title',
+        ImageFile='image',
+        Desc='desc',
+        AKA='aka',
+        Tags=_decode_tags,
+        Fields=_decode_location_fields,
+        )
+    _ITM_DECODERS = dict(_LOC_DECODERS, Fields=_decode_item_fields)
+    _CRT_DECODERS = dict(
+        _LOC_DECODERS,
+        Notes='notes',
+        Bio='bio',
+        Goals='goals',
+        FullName='fullName',
+        Major=True,
+        Fields=_decode_character_fields,
+        )
+    # Dispatch tables for decoding the xml elements' children. Key: xml tag, value:
+    # - str: name of the instance variable taking the element's text.
+    # - function(ywProject, element, xmlElement): decoder setting the element's instance variables.
+    # - True: marker; the xml element is returned for the reader to evaluate.
+    # Children with other tags are ignored.
+
     def __init__(self, filePath, **kwargs):
         """Initialize instance variables.
         
@@ -61,6 +257,7 @@ class Yw7File(Novel):
         super().__init__(filePath)
         self.tree = None
         self.scenesSplit = False
+        self.sceneSplitter = Splitter()
 
         #--- Initialize custom keyword variables.
         for field in self._PRJ_KWVAR:
@@ -69,491 +266,10 @@ class Yw7File(Novel):
     def read(self):
         """Parse the yWriter xml file and get the instance variables.
         
+        Report the progress to the ui, and stop between two scenes or chapters if the ui asks to cancel.
         Return a message beginning with the ERROR constant in case of error.
         Overrides the superclass method.
         """
-
-        def read_project(root):
-            #--- Read attributes at project level from the xml element tree.
-            prj = root.find('PROJECT')
-
-            if prj.find('Title') is not None:
-                self.title = prj.find('Title').text
-
-            if prj.find('AuthorName') is not None:
-                self.authorName = prj.find('AuthorName').text
-
-            if prj.find('Bio') is not None:
-                self.authorBio = prj.find('Bio').text
-
-            if prj.find('Desc') is not None:
-                self.desc = prj.find('Desc').text
-
-            if prj.find('FieldTitle1') is not None:
-                self.fieldTitle1 = prj.find('FieldTitle1').text
-
-            if prj.find('FieldTitle2') is not None:
-                self.fieldTitle2 = prj.find('FieldTitle2').text
-
-            if prj.find('FieldTitle3') is not None:
-                self.fieldTitle3 = prj.find('FieldTitle3').text
-
-            if prj.find('FieldTitle4') is not None:
-                self.fieldTitle4 = prj.find('FieldTitle4').text
-
-            #--- Initialize custom keyword variables.
-            for fieldName in self._PRJ_KWVAR:
-                self.kwVar[fieldName] = None
-
-            #--- Read project custom fields.
-            for prjFields in prj.findall('Fields'):
-                for fieldName in self._PRJ_KWVAR:
-                    field = prjFields.find(fieldName)
-                    if field is not None:
-                        self.kwVar[fieldName] = field.text
-
-            # This is for projects written with v7.6 - v7.10:
-            if self.kwVar['Field_LanguageCode']:
-                self.languageCode = self.kwVar['Field_LanguageCode']
-            if self.kwVar['Field_CountryCode']:
-                self.countryCode = self.kwVar['Field_CountryCode']
-
-        def read_locations(root):
-            #--- Read locations from the xml element tree.
-            self.srtLocations = []
-            # This is necessary for re-reading.
-            for loc in root.iter('LOCATION'):
-                lcId = loc.find('ID').text
-                self.srtLocations.append(lcId)
-                self.locations[lcId] = self.WE_CLASS()
-
-                if loc.find('Title') is not None:
-                    self.locations[lcId].title = loc.find('Title').text
-
-                if loc.find('ImageFile') is not None:
-                    self.locations[lcId].image = loc.find('ImageFile').text
-
-                if loc.find('Desc') is not None:
-                    self.locations[lcId].desc = loc.find('Desc').text
-
-                if loc.find('AKA') is not None:
-                    self.locations[lcId].aka = loc.find('AKA').text
-
-                if loc.find('Tags') is not None:
-                    if loc.find('Tags').text is not None:
-                        tags = string_to_list(loc.find('Tags').text)
-                        self.locations[lcId].tags = self._strip_spaces(tags)
-
-                #--- Initialize custom keyword variables.
-                for fieldName in self._LOC_KWVAR:
-                    self.locations[lcId].kwVar[fieldName] = None
-
-                #--- Read location custom fields.
-                for lcFields in loc.findall('Fields'):
-                    for fieldName in self._LOC_KWVAR:
-                        field = lcFields.find(fieldName)
-                        if field is not None:
-                            self.locations[lcId].kwVar[fieldName] = field.text
-
-        def read_items(root):
-            #--- Read items from the xml element tree.
-            self.srtItems = []
-            # This is necessary for re-reading.
-            for itm in root.iter('ITEM'):
-                itId = itm.find('ID').text
-                self.srtItems.append(itId)
-                self.items[itId] = self.WE_CLASS()
-
-                if itm.find('Title') is not None:
-                    self.items[itId].title = itm.find('Title').text
-
-                if itm.find('ImageFile') is not None:
-                    self.items[itId].image = itm.find('ImageFile').text
-
-                if itm.find('Desc') is not None:
-                    self.items[itId].desc = itm.find('Desc').text
-
-                if itm.find('AKA') is not None:
-                    self.items[itId].aka = itm.find('AKA').text
-
-                if itm.find('Tags') is not None:
-                    if itm.find('Tags').text is not None:
-                        tags = string_to_list(itm.find('Tags').text)
-                        self.items[itId].tags = self._strip_spaces(tags)
-
-                #--- Initialize custom keyword variables.
-                for fieldName in self._ITM_KWVAR:
-                    self.items[itId].kwVar[fieldName] = None
-
-                #--- Read item custom fields.
-                for itFields in itm.findall('Fields'):
-                    for fieldName in self._ITM_KWVAR:
-                        field = itFields.find(fieldName)
-                        if field is not None:
-                            self.items[itId].kwVar[fieldName] = field.text
-
-        def read_characters(root):
-            #--- Read characters from the xml element tree.
-            self.srtCharacters = []
-            # This is necessary for re-reading.
-            for crt in root.iter('CHARACTER'):
-                crId = crt.find('ID').text
-                self.srtCharacters.append(crId)
-                self.characters[crId] = self.CHARACTER_CLASS()
-
-                if crt.find('Title') is not None:
-                    self.characters[crId].title = crt.find('Title').text
-
-                if crt.find('ImageFile') is not None:
-                    self.characters[crId].image = crt.find('ImageFile').text
-
-                if crt.find('Desc') is not None:
-                    self.characters[crId].desc = crt.find('Desc').text
-
-                if crt.find('AKA') is not None:
-                    self.characters[crId].aka = crt.find('AKA').text
-
-                if crt.find('Tags') is not None:
-                    if crt.find('Tags').text is not None:
-                        tags = string_to_list(crt.find('Tags').text)
-                        self.characters[crId].tags = self._strip_spaces(tags)
-
-                if crt.find('Notes') is not None:
-                    self.characters[crId].notes = crt.find('Notes').text
-
-                if crt.find('Bio') is not None:
-                    self.characters[crId].bio = crt.find('Bio').text
-
-                if crt.find('Goals') is not None:
-                    self.characters[crId].goals = crt.find('Goals').text
-
-                if crt.find('FullName') is not None:
-                    self.characters[crId].fullName = crt.find('FullName').text
-
-                if crt.find('Major') is not None:
-                    self.characters[crId].isMajor = True
-                else:
-                    self.characters[crId].isMajor = False
-
-                #--- Initialize custom keyword variables.
-                for fieldName in self._CRT_KWVAR:
-                    self.characters[crId].kwVar[fieldName] = None
-
-                #--- Read character custom fields.
-                for crFields in crt.findall('Fields'):
-                    for fieldName in self._CRT_KWVAR:
-                        field = crFields.find(fieldName)
-                        if field is not None:
-                            self.characters[crId].kwVar[fieldName] = field.text
-
-        def read_projectnotes(root):
-            #--- Read project notes from the xml element tree.
-            self.srtPrjNotes = []
-            # This is necessary for re-reading.
-
-            try:
-                for pnt in root.find('PROJECTNOTES'):
-                    if pnt.find('ID') is not None:
-                        pnId = pnt.find('ID').text
-                        self.srtPrjNotes.append(pnId)
-                        self.projectNotes[pnId] = self.PN_CLASS()
-                        if pnt.find('Title') is not None:
-                            self.projectNotes[pnId].title = pnt.find('Title').text
-                        if pnt.find('Desc') is not None:
-                            self.projectNotes[pnId].desc = pnt.find('Desc').text
-
-                    #--- Initialize project note custom fields.
-                    for fieldName in self._PNT_KWVAR:
-                        self.projectNotes[pnId].kwVar[fieldName] = None
-
-                    #--- Read project note custom fields.
-                    for pnFields in pnt.findall('Fields'):
-                        field = pnFields.find(fieldName)
-                        if field is not None:
-                            self.projectNotes[pnId].kwVar[fieldName] = field.text
-            except:
-                pass
-
-        def read_projectvars(root):
-            #--- Read relevant project variables from the xml element tree.
-            try:
-                for projectvar in root.find('PROJECTVARS'):
-                    if projectvar.find('Title') is not None:
-                        title = projectvar.find('Title').text
-                        if title == 'Language':
-                            if projectvar.find('Desc') is not None:
-                                self.languageCode = projectvar.find('Desc').text
-
-                        elif title == 'Country':
-                            if projectvar.find('Desc') is not None:
-                                self.countryCode = projectvar.find('Desc').text
-
-                        elif title.startswith('lang='):
-                            try:
-                                __, langCode = title.split('=')
-                                if self.languages is None:
-                                    self.languages = []
-                                self.languages.append(langCode)
-                            except:
-                                pass
-            except:
-                pass
-
-        def read_scenes(root):
-            #--- Read attributes at scene level from the xml element tree.
-            for scn in root.iter('SCENE'):
-                scId = scn.find('ID').text
-                self.scenes[scId] = self.SCENE_CLASS()
-
-                if scn.find('Title') is not None:
-                    self.scenes[scId].title = scn.find('Title').text
-
-                if scn.find('Desc') is not None:
-                    self.scenes[scId].desc = scn.find('Desc').text
-
-                if scn.find('SceneContent') is not None:
-                    sceneContent = scn.find('SceneContent').text
-                    if sceneContent is not None:
-                        self.scenes[scId].sceneContent = sceneContent
-
-                #--- Read scene type.
-
-                # This is how yWriter 7.1.3.0 reads the scene type:
-                #
-                # Type   |<Unused>|Field_SceneType>|scType
-                #--------+--------+----------------+------
-                # Notes  | x      | 1              | 1
-                # Todo   | x      | 2              | 2
-                # Unused | -1     | N/A            | 3
-                # Unused | -1     | 0              | 3
-                # Normal | N/A    | N/A            | 0
-                # Normal | N/A    | 0              | 0
-
-                self.scenes[scId].scType = 0
-
-                #--- Initialize custom keyword variables.
-                for fieldName in self._SCN_KWVAR:
-                    self.scenes[scId].kwVar[fieldName] = None
-
-                for scFields in scn.findall('Fields'):
-                    #--- Read scene custom fields.
-                    for fieldName in self._SCN_KWVAR:
-                        field = scFields.find(fieldName)
-                        if field is not None:
-                            self.scenes[scId].kwVar[fieldName] = field.text
-
-                    # Read scene type, if any.
-                    if scFields.find('Field_SceneType') is not None:
-                        if scFields.find('Field_SceneType').text == '1':
-                            self.scenes[scId].scType = 1
-                        elif scFields.find('Field_SceneType').text == '2':
-                            self.scenes[scId].scType = 2
-                if scn.find('Unused') is not None:
-                    if self.scenes[scId].scType == 0:
-                        self.scenes[scId].scType = 3
-
-                #--- Export when RTF.
-                if scn.find('ExportCondSpecific') is None:
-                    self.scenes[scId].doNotExport = False
-                elif scn.find('ExportWhenRTF') is not None:
-                    self.scenes[scId].doNotExport = False
-                else:
-                    self.scenes[scId].doNotExport = True
-
-                if scn.find('Status') is not None:
-                    self.scenes[scId].status = int(scn.find('Status').text)
-
-                if scn.find('Notes') is not None:
-                    self.scenes[scId].notes = scn.find('Notes').text
-
-                if scn.find('Tags') is not None:
-                    if scn.find('Tags').text is not None:
-                        tags = string_to_list(scn.find('Tags').text)
-                        self.scenes[scId].tags = self._strip_spaces(tags)
-
-                if scn.find('Field1') is not None:
-                    self.scenes[scId].field1 = scn.find('Field1').text
-
-                if scn.find('Field2') is not None:
-                    self.scenes[scId].field2 = scn.find('Field2').text
-
-                if scn.find('Field3') is not None:
-                    self.scenes[scId].field3 = scn.find('Field3').text
-
-                if scn.find('Field4') is not None:
-                    self.scenes[scId].field4 = scn.find('Field4').text
-
-                if scn.find('AppendToPrev') is not None:
-                    self.scenes[scId].appendToPrev = True
-                else:
-                    self.scenes[scId].appendToPrev = False
-
-                if scn.find('SpecificDateTime') is not None:
-                    dateTime = scn.find('SpecificDateTime').text.split(' ')
-                    for dt in dateTime:
-                        if '-' in dt:
-                            self.scenes[scId].date = dt
-                        elif ':' in dt:
-                            self.scenes[scId].time = dt
-                else:
-                    if scn.find('Day') is not None:
-                        self.scenes[scId].day = scn.find('Day').text
-
-                    if scn.find('Hour') is not None:
-                        self.scenes[scId].hour = scn.find('Hour').text
-
-                    if scn.find('Minute') is not None:
-                        self.scenes[scId].minute = scn.find('Minute').text
-
-                if scn.find('LastsDays') is not None:
-                    self.scenes[scId].lastsDays = scn.find('LastsDays').text
-
-                if scn.find('LastsHours') is not None:
-                    self.scenes[scId].lastsHours = scn.find('LastsHours').text
-
-                if scn.find('LastsMinutes') is not None:
-                    self.scenes[scId].lastsMinutes = scn.find('LastsMinutes').text
-
-                if scn.find('ReactionScene') is not None:
-                    self.scenes[scId].isReactionScene = True
-                else:
-                    self.scenes[scId].isReactionScene = False
-
-                if scn.find('SubPlot') is not None:
-                    self.scenes[scId].isSubPlot = True
-                else:
-                    self.scenes[scId].isSubPlot = False
-
-                if scn.find('Goal') is not None:
-                    self.scenes[scId].goal = scn.find('Goal').text
-
-                if scn.find('Conflict') is not None:
-                    self.scenes[scId].conflict = scn.find('Conflict').text
-
-                if scn.find('Outcome') is not None:
-                    self.scenes[scId].outcome = scn.find('Outcome').text
-
-                if scn.find('ImageFile') is not None:
-                    self.scenes[scId].image = scn.find('ImageFile').text
-
-                if scn.find('Characters') is not None:
-                    for characters in scn.find('Characters').iter('CharID'):
-                        crId = characters.text
-                        if crId in self.srtCharacters:
-                            if self.scenes[scId].characters is None:
-                                self.scenes[scId].characters = []
-                            self.scenes[scId].characters.append(crId)
-
-                if scn.find('Locations') is not None:
-                    for locations in scn.find('Locations').iter('LocID'):
-                        lcId = locations.text
-                        if lcId in self.srtLocations:
-                            if self.scenes[scId].locations is None:
-                                self.scenes[scId].locations = []
-                            self.scenes[scId].locations.append(lcId)
-
-                if scn.find('Items') is not None:
-                    for items in scn.find('Items').iter('ItemID'):
-                        itId = items.text
-                        if itId in self.srtItems:
-                            if self.scenes[scId].items is None:
-                                self.scenes[scId].items = []
-                            self.scenes[scId].items.append(itId)
-
-        def read_chapters(root):
-            #--- Read attributes at chapter level from the xml element tree.
-            self.srtChapters = []
-            # This is necessary for re-reading.
-            for chp in root.iter('CHAPTER'):
-                chId = chp.find('ID').text
-                self.chapters[chId] = self.CHAPTER_CLASS()
-                self.srtChapters.append(chId)
-
-                if chp.find('Title') is not None:
-                    self.chapters[chId].title = chp.find('Title').text
-
-                if chp.find('Desc') is not None:
-                    self.chapters[chId].desc = chp.find('Desc').text
-
-                if chp.find('SectionStart') is not None:
-                    self.chapters[chId].chLevel = 1
-                else:
-                    self.chapters[chId].chLevel = 0
-
-                # This is how yWriter 7.1.3.0 reads the chapter type:
-                #
-                # Type   |<Unused>|<Type>|<ChapterType>|chType
-                # -------+--------+------+--------------------
-                # Normal | N/A    | N/A  | N/A         | 0
-                # Normal | N/A    | 0    | N/A         | 0
-                # Notes  | x      | 1    | N/A         | 1
-                # Unused | -1     | 0    | N/A         | 3
-                # Normal | N/A    | x    | 0           | 0
-                # Notes  | x      | x    | 1           | 1
-                # Todo   | x      | x    | 2           | 2
-                # Unused | -1     | x    | x           | 3
-
-                self.chapters[chId].chType = 0
-                if chp.find('Unused') is not None:
-                    yUnused = True
-                else:
-                    yUnused = False
-                if chp.find('ChapterType') is not None:
-                    # The file may be created with yWriter version 7.0.7.2+
-                    yChapterType = chp.find('ChapterType').text
-                    if yChapterType == '2':
-                        self.chapters[chId].chType = 2
-                    elif yChapterType == '1':
-                        self.chapters[chId].chType = 1
-                    elif yUnused:
-                        self.chapters[chId].chType = 3
-                else:
-                    # The file may be created with a yWriter version prior to 7.0.7.2
-                    if chp.find('Type') is not None:
-                        yType = chp.find('Type').text
-                        if yType == '1':
-                            self.chapters[chId].chType = 1
-                        elif yUnused:
-                            self.chapters[chId].chType = 3
-
-                self.chapters[chId].suppressChapterTitle = False
-                if self.chapters[chId].title is not None:
-                    if self.chapters[chId].title.startswith('@'):
-                        self.chapters[chId].suppressChapterTitle = True
-
-                #--- Initialize custom keyword variables.
-                for fieldName in self._CHP_KWVAR:
-                    self.chapters[chId].kwVar[fieldName] = None
-
-                #--- Read chapter fields.
-                for chFields in chp.findall('Fields'):
-                    if chFields.find('Field_SuppressChapterTitle') is not None:
-                        if chFields.find('Field_SuppressChapterTitle').text == '1':
-                            self.chapters[chId].suppressChapterTitle = True
-                    self.chapters[chId].isTrash = False
-                    if chFields.find('Field_IsTrash') is not None:
-                        if chFields.find('Field_IsTrash').text == '1':
-                            self.chapters[chId].isTrash = True
-                    self.chapters[chId].suppressChapterBreak = False
-                    if chFields.find('Field_SuppressChapterBreak') is not None:
-                        if chFields.find('Field_SuppressChapterBreak').text == '1':
-                            self.chapters[chId].suppressChapterBreak = True
-
-                    #--- Read chapter custom fields.
-                    for fieldName in self._CHP_KWVAR:
-                        field = chFields.find(fieldName)
-                        if field is not None:
-                            self.chapters[chId].kwVar[fieldName] = field.text
-
-                #--- Read chapter's scene list.
-                self.chapters[chId].srtScenes = []
-                if chp.find('Scenes') is not None:
-                    for scn in chp.find('Scenes').findall('ScID'):
-                        scId = scn.text
-                        if scId in self.scenes:
-                            self.chapters[chId].srtScenes.append(scId)
-
-        #--- Begin reading.
         if self.is_locked():
             return f'{ERROR}{_("yWriter seems to be open. Please close first")}.'
         try:
@@ -575,15 +291,39 @@ class Yw7File(Novel):
         xmlText = None
         # saving memory
         self.tree = ET.ElementTree(root)
-
-        read_project(root)
-        read_locations(root)
-        read_items(root)
-        read_characters(root)
-        read_projectvars(root)
-        read_projectnotes(root)
-        read_scenes(root)
-        read_chapters(root)
+        self.idAllocator.reset()
+        # New IDs are to be allocated above the IDs read.
+
+        self._read_project(root.find('PROJECT'))
+        self._read_locations(root)
+        self._read_items(root)
+        self._read_characters(root)
+        self._read_projectvars(root.find('PROJECTVARS'))
+        self._read_projectnotes(root.find('PROJECTNOTES'))
+        xmlScenes = list(root.iter('SCENE'))
+        xmlChapters = list(root.iter('CHAPTER'))
+        total = len(xmlScenes) + len(xmlChapters)
+        step = max((total + self._PROGRESS_STEPS - 1) // self._PROGRESS_STEPS, 1)
+        count = 0
+        for scn in xmlScenes:
+            if self.ui.is_canceled():
+                return f'{ERROR}{_("Action canceled by user")}.'
+
+            self._read_scene(scn)
+            count += 1
+            if count % step == 0:
+                self.ui.set_progress(_('Reading project'), count, total)
+        self.srtChapters = []
+        # This is necessary for re-reading.
+        for chp in xmlChapters:
+            if self.ui.is_canceled():
+                return f'{ERROR}{_("Action canceled by user")}.'
+
+            self._read_chapter(chp)
+            count += 1
+            if count % step == 0 or count == total:
+                self.ui.set_progress(_('Reading project'), count, total)
+        self._remove_invalid_references()
         self.adjust_scene_types()
         return 'yWriter project data read in.'
 
@@ -593,22 +333,12 @@ class Yw7File(Novel):
         Positional arguments:
             source -- Novel subclass instance to merge.
         
+        If the yw7 file exists and is not read yet, read it first.
+        A project already read is merged as it is, without reading the file again.
         Return a message beginning with the ERROR constant in case of error.
         Overrides the superclass method.
         """
-
-        def merge_lists(srcLst, tgtLst):
-            """Insert srcLst items to tgtLst, if missing.
-            """
-            j = 0
-            for item in srcLst:
-                if not item in tgtLst:
-                    tgtLst.insert(j, item)
-                    j += 1
-                else:
-                    j = tgtLst.index(item) + 1
-
-        if os.path.isfile(self.filePath):
+        if self.tree is None and os.path.isfile(self.filePath):
             message = self.read()
             # initialize data
             if message.startswith(ERROR):
@@ -775,7 +505,7 @@ class Yw7File(Novel):
                 else:
                     self.projectNotes[pnId].desc = tempPrjn[pnId].desc
 
-                for fieldName in self._prn_KWVAR:
+                for fieldName in self._PNT_KWVAR:
                     try:
                         self.projectNotes[pnId].kwVar[fieldName] = source.projectNotes[pnId].kwVar[fieldName]
                     except:
@@ -929,9 +659,10 @@ class Yw7File(Novel):
             # The scene's sort order may not change.
 
             # Remove scenes that have been moved to another chapter from the scene list.
+            srcScenes = set(source.chapters[chId].srtScenes)
             srtScenes = []
             for scId in self.chapters[chId].srtScenes:
-                if scId in source.chapters[chId].srtScenes or not scId in source.scenes:
+                if scId in srcScenes or not scId in source.scenes:
                     # The scene has not moved to another chapter or isn't imported
                     srtScenes.append(scId)
             self.chapters[chId].srtScenes = srtScenes
@@ -988,9 +719,10 @@ class Yw7File(Novel):
         # Split scenes by inserted part/chapter/scene dividers.
         # This must be done after regular merging
         # in order to avoid creating duplicate IDs.
+        self.idAllocator.reset()
+        # The merged elements may have IDs above the allocator's high-water marks.
         if sourceHasSceneContent:
-            sceneSplitter = Splitter()
-            self.scenesSplit = sceneSplitter.split_scenes(self)
+            self.scenesSplit = self.sceneSplitter.split_scenes(self)
         self.adjust_scene_types()
         return 'yWriter project data updated or created.'
 
@@ -1008,11 +740,7 @@ class Yw7File(Novel):
         if self.languages is None:
             self.get_languages()
         self._build_element_tree()
-        message = self._write_element_tree(self)
-        if message.startswith(ERROR):
-            return message
-
-        return self._post_xml_file(self.filePath)
+        return self._write_element_tree(self)
 
     def is_locked(self):
         """Check whether the yw7 file is locked by yWriter.
@@ -1022,6 +750,359 @@ class Yw7File(Novel):
         """
         return os.path.isfile(f'{self.filePath}.lock')
 
+    def _read_project(self, prj):
+        """Read attributes at project level from the xml element tree.
+        
+        Positional arguments:
+            prj -- xml element: the <PROJECT> subtree.
+        """
+        if prj.find('Title') is not None:
+            self.title = prj.find('Title').text
+
+        if prj.find('AuthorName') is not None:
+            self.authorName = prj.find('AuthorName').text
+
+        if prj.find('Bio') is not None:
+            self.authorBio = prj.find('Bio').text
+
+        if prj.find('Desc') is not None:
+            self.desc = prj.find('Desc').text
+
+        if prj.find('FieldTitle1') is not None:
+            self.fieldTitle1 = prj.find('FieldTitle1').text
+
+        if prj.find('FieldTitle2') is not None:
+            self.fieldTitle2 = prj.find('FieldTitle2').text
+
+        if prj.find('FieldTitle3') is not None:
+            self.fieldTitle3 = prj.find('FieldTitle3').text
+
+        if prj.find('FieldTitle4') is not None:
+            self.fieldTitle4 = prj.find('FieldTitle4').text
+
+        #--- Initialize custom keyword variables.
+        for fieldName in self._PRJ_KWVAR:
+            self.kwVar[fieldName] = None
+
+        #--- Read project custom fields.
+        for prjFields in prj.findall('Fields'):
+            for fieldName in self._PRJ_KWVAR:
+                field = prjFields.find(fieldName)
+                if field is not None:
+                    self.kwVar[fieldName] = field.text
+
+        # This is for projects written with v7.6 - v7.10:
+        if self.kwVar['Field_LanguageCode']:
+            self.languageCode = self.kwVar['Field_LanguageCode']
+        if self.kwVar['Field_CountryCode']:
+            self.countryCode = self.kwVar['Field_CountryCode']
+
+    def _read_locations(self, root):
+        """Read locations from the xml element tree.
+        
+        Positional arguments:
+            root -- xml element containing the <LOCATION> subtrees.
+        """
+        self.srtLocations = []
+        # This is necessary for re-reading.
+        for loc in root.iter('LOCATION'):
+            location = self.WE_CLASS()
+
+            #--- Initialize custom keyword variables.
+            for fieldName in self._LOC_KWVAR:
+                location.kwVar[fieldName] = None
+
+            markers = self._decode_element(location, loc, self._LOC_DECODERS)
+            lcId = markers['ID'].text
+            self.srtLocations.append(lcId)
+            self.locations[lcId] = location
+
+    def _read_items(self, root):
+        """Read items from the xml element tree.
+        
+        Positional arguments:
+            root -- xml element containing the <ITEM> subtrees.
+        """
+        self.srtItems = []
+        # This is necessary for re-reading.
+        for itm in root.iter('ITEM'):
+            item = self.WE_CLASS()
+
+            #--- Initialize custom keyword variables.
+            for fieldName in self._ITM_KWVAR:
+                item.kwVar[fieldName] = None
+
+            markers = self._decode_element(item, itm, self._ITM_DECODERS)
+            itId = markers['ID'].text
+            self.srtItems.append(itId)
+            self.items[itId] = item
+
+    def _read_characters(self, root):
+        """Read characters from the xml element tree.
+        
+        Positional arguments:
+            root -- xml element containing the <CHARACTER> subtrees.
+        """
+        self.srtCharacters = []
+        # This is necessary for re-reading.
+        for crt in root.iter('CHARACTER'):
+            character = self.CHARACTER_CLASS()
+
+            #--- Initialize custom keyword variables.
+            for fieldName in self._CRT_KWVAR:
+                character.kwVar[fieldName] = None
+
+            markers = self._decode_element(character, crt, self._CRT_DECODERS)
+            character.isMajor = 'Major' in markers
+            crId = markers['ID'].text
+            self.srtCharacters.append(crId)
+            self.characters[crId] = character
+
+    def _read_projectnotes(self, prjNotes):
+        """Read project notes from the xml element tree.
+        
+        Positional arguments:
+            prjNotes -- xml element: the <PROJECTNOTES> subtree.
+        """
+        self.srtPrjNotes = []
+        # This is necessary for re-reading.
+
+        try:
+            for pnt in prjNotes:
+                if pnt.find('ID') is not None:
+                    pnId = pnt.find('ID').text
+                    self.srtPrjNotes.append(pnId)
+                    self.projectNotes[pnId] = self.PN_CLASS()
+                    if pnt.find('Title') is not None:
+                        self.projectNotes[pnId].title = pnt.find('Title').text
+                    if pnt.find('Desc') is not None:
+                        self.projectNotes[pnId].desc = pnt.find('Desc').text
+
+                #--- Initialize project note custom fields.
+                for fieldName in self._PNT_KWVAR:
+                    self.projectNotes[pnId].kwVar[fieldName] = None
+
+                #--- Read project note custom fields.
+                for pnFields in pnt.findall('Fields'):
+                    field = pnFields.find(fieldName)
+                    if field is not None:
+                        self.projectNotes[pnId].kwVar[fieldName] = field.text
+        except:
+            pass
+
+    def _read_projectvars(self, projectvars):
+        """Read relevant project variables from the xml element tree.
+        
+        Positional arguments:
+            projectvars -- xml element: the <PROJECTVARS> subtree.
+        """
+        try:
+            for projectvar in projectvars:
+                if projectvar.find('Title') is not None:
+                    title = projectvar.find('Title').text
+                    if title == 'Language':
+                        if projectvar.find('Desc') is not None:
+                            self.languageCode = projectvar.find('Desc').text
+
+                    elif title == 'Country':
+                        if projectvar.find('Desc') is not None:
+                            self.countryCode = projectvar.find('Desc').text
+
+                    elif title.startswith('lang='):
+                        try:
+                            __, langCode = title.split('=')
+                            if self.languages is None:
+                                self.languages = []
+                            self.languages.append(langCode)
+                        except:
+                            pass
+        except:
+            pass
+
+    def _decode_element(self, element, xmlElement, decoders):
+        """Set an element's instance variables from the children of an xml element.
+        
+        Positional arguments:
+            element -- BasicElement subclass instance to be updated.
+            xmlElement -- xml element: the subtree representing the element.
+            decoders -- dict: dispatch table (see _SCN_DECODERS).
+            
+        Each child is visited once. 
+        Return a dictionary with the marker children found, the first one per tag.
+        """
+        markers = {}
+        for xmlChild in xmlElement:
+            decoder = decoders.get(xmlChild.tag)
+            if decoder is None:
+                continue
+
+            if decoder is True:
+                markers.setdefault(xmlChild.tag, xmlChild)
+            elif decoder.__class__ is str:
+                setattr(element, decoder, xmlChild.text)
+            else:
+                decoder(self, element, xmlChild)
+        return markers
+
+    def _read_scene(self, scn):
+        """Read attributes at scene level from the xml element tree.
+        
+        Positional arguments:
+            scn -- xml element: a <SCENE> subtree.
+        """
+        scene = self.SCENE_CLASS()
+
+        #--- Read scene type.
+
+        # This is how yWriter 7.1.3.0 reads the scene type:
+        #
+        # Type   |<Unused>|Field_SceneType>|scType
+        #--------+--------+----------------+------
+        # Notes  | x      | 1              | 1
+        # Todo   | x      | 2              | 2
+        # Unused | -1     | N/A            | 3
+        # Unused | -1     | 0              | 3
+        # Normal | N/A    | N/A            | 0
+        # Normal | N/A    | 0              | 0
+
+        scene.scType = 0
+
+        #--- Initialize custom keyword variables.
+        for fieldName in self._SCN_KWVAR:
+            scene.kwVar[fieldName] = None
+
+        markers = self._decode_element(scene, scn, self._SCN_DECODERS)
+        if 'Unused' in markers:
+            if scene.scType == 0:
+                scene.scType = 3
+
+        #--- Export when RTF.
+        if not 'ExportCondSpecific' in markers:
+            scene.doNotExport = False
+        elif 'ExportWhenRTF' in markers:
+            scene.doNotExport = False
+        else:
+            scene.doNotExport = True
+
+        scene.appendToPrev = 'AppendToPrev' in markers
+        if 'SpecificDateTime' in markers:
+            dateTime = markers['SpecificDateTime'].text.split(' ')
+            for dt in dateTime:
+                if '-' in dt:
+                    scene.date = dt
+                elif ':' in dt:
+                    scene.time = dt
+        else:
+            if 'Day' in markers:
+                scene.day = markers['Day'].text
+
+            if 'Hour' in markers:
+                scene.hour = markers['Hour'].text
+
+            if 'Minute' in markers:
+                scene.minute = markers['Minute'].text
+
+        scene.isReactionScene = 'ReactionScene' in markers
+        scene.isSubPlot = 'SubPlot' in markers
+        self.scenes[markers['ID'].text] = scene
+
+    def _read_chapter(self, chp):
+        """Read attributes at chapter level from the xml element tree.
+        
+        Positional arguments:
+            chp -- xml element: a <CHAPTER> subtree.
+        """
+        chapter = self.CHAPTER_CLASS()
+        chapter.suppressChapterTitle = False
+        chapter.srtScenes = []
+
+        #--- Initialize custom keyword variables.
+        for fieldName in self._CHP_KWVAR:
+            chapter.kwVar[fieldName] = None
+
+        markers = self._decode_element(chapter, chp, self._CHP_DECODERS)
+        if 'SectionStart' in markers:
+            chapter.chLevel = 1
+        else:
+            chapter.chLevel = 0
+
+        # This is how yWriter 7.1.3.0 reads the chapter type:
+        #
+        # Type   |<Unused>|<Type>|<ChapterType>|chType
+        # -------+--------+------+--------------------
+        # Normal | N/A    | N/A  | N/A         | 0
+        # Normal | N/A    | 0    | N/A         | 0
+        # Notes  | x      | 1    | N/A         | 1
+        # Unused | -1     | 0    | N/A         | 3
+        # Normal | N/A    | x    | 0           | 0
+        # Notes  | x      | x    | 1           | 1
+        # Todo   | x      | x    | 2           | 2
+        # Unused | -1     | x    | x           | 3
+
+        chapter.chType = 0
+        yUnused = 'Unused' in markers
+        if 'ChapterType' in markers:
+            # The file may be created with yWriter version 7.0.7.2+
+            yChapterType = markers['ChapterType'].text
+            if yChapterType == '2':
+                chapter.chType = 2
+            elif yChapterType == '1':
+                chapter.chType = 1
+            elif yUnused:
+                chapter.chType = 3
+        else:
+            # The file may be created with a yWriter version prior to 7.0.7.2
+            if 'Type' in markers:
+                yType = markers['Type'].text
+                if yType == '1':
+                    chapter.chType = 1
+                elif yUnused:
+                    chapter.chType = 3
+
+        if chapter.title is not None:
+            if chapter.title.startswith('@'):
+                chapter.suppressChapterTitle = True
+
+        chId = markers['ID'].text
+        self.chapters[chId] = chapter
+        self.srtChapters.append(chId)
+
+    def _remove_invalid_references(self):
+        """Remove references to elements that are not defined in the project.
+        
+        Scenes may refer to characters, locations, and items, 
+        and chapters may refer to scenes that do not exist.
+        This is done after reading, so the order of the xml sections doesn't matter.
+        """
+
+        def get_valid_ids(ids, validIds):
+            """Return a list of the valid IDs, or None if there is none."""
+            validList = []
+            for eId in ids:
+                if eId in validIds:
+                    validList.append(eId)
+            if validList:
+                return validList
+
+            return None
+
+        crIds = set(self.srtCharacters)
+        lcIds = set(self.srtLocations)
+        itIds = set(self.srtItems)
+        for scId in self.scenes:
+            if self.scenes[scId].characters is not None:
+                self.scenes[scId].characters = get_valid_ids(self.scenes[scId].characters, crIds)
+            if self.scenes[scId].locations is not None:
+                self.scenes[scId].locations = get_valid_ids(self.scenes[scId].locations, lcIds)
+            if self.scenes[scId].items is not None:
+                self.scenes[scId].items = get_valid_ids(self.scenes[scId].items, itIds)
+        for chId in self.srtChapters:
+            srtScenes = []
+            for scId in self.chapters[chId].srtScenes:
+                if scId in self.scenes:
+                    srtScenes.append(scId)
+            self.chapters[chId].srtScenes = srtScenes
+
     def _build_element_tree(self):
         """Modify the yWriter project attributes of an existing xml element tree."""
 
@@ -1821,55 +1902,17 @@ class Yw7File(Novel):
     def _write_element_tree(self, ywProject):
         """Write back the xml element tree to a .yw7 xml file located at filePath.
         
+        Put the contents of the _CDATA_TAGS elements in CDATA sections while writing.
+        The file is replaced atomically; an existing file is kept as a backup.
         Return a message beginning with the ERROR constant in case of error.
         """
-        if os.path.isfile(ywProject.filePath):
-            os.replace(ywProject.filePath, f'{ywProject.filePath}.bak')
-            backedUp = True
-        else:
-            backedUp = False
         try:
-            ywProject.tree.write(ywProject.filePath, xml_declaration=False, encoding='utf-8')
+            with AtomicFile(ywProject.filePath) as f:
+                write_xml(ywProject.tree.getroot(), f, self._CDATA_TAGS)
         except:
-            if backedUp:
-                os.replace(f'{ywProject.filePath}.bak', ywProject.filePath)
             return f'{ERROR}{_("Cannot write file")}: "{os.path.normpath(ywProject.filePath)}".'
 
-        return 'yWriter XML tree written.'
-
-    def _post_xml_file(self, filePath):
-        '''Post an xml file created by ElementTree.
-        
-        Positional argument:
-            filePath -- str: path to xml file.
-        
-        Read the xml file, put a header on top, insert the missing CDATA tags,
-        and replace xml entities by plain text (unescape). Overwrite the .yw7 xml file.
-        Return a message beginning with the ERROR constant in case of error.
-        
-        Note: The path is given as an argument rather than using self.filePath. 
-        So this routine can be used for yWriter-generated xml files other than .yw7 as well. 
-        '''
-        with open(filePath, 'r', encoding='utf-8') as f:
-            text = f.read()
-        lines = text.split('\n')
-        newlines = ['<?xml version="1.0" encoding="utf-8"?>']
-        for line in lines:
-            for tag in self._CDATA_TAGS:
-                line = re.sub(fr'\<{tag}\>', f'<{tag}><![CDATA[', line)
-                line = re.sub(fr'\<\/{tag}\>', f']]></{tag}>', line)
-            newlines.append(line)
-        text = '\n'.join(newlines)
-        text = text.replace('[CDATA[ \n', '[CDATA[')
-        text = text.replace('\n]]', ']]')
-        text = unescape(text)
-        try:
-            with open(filePath, 'w', encoding='utf-8') as f:
-                f.write(text)
-        except:
-            return f'{ERROR}{_("Cannot write file")}: "{os.path.normpath(filePath)}".'
-
-        return f'{_("File written")}: "{os.path.normpath(filePath)}".'
+        return f'{_("File written")}: "{os.path.normpath(ywProject.filePath)}".'
 
     def _strip_spaces(self, lines):
         """Local helper method.
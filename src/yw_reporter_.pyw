@@ -9,12 +9,21 @@ Published under the MIT License (https://opensource.org/licenses/mit-license.php
 """
 import os
 import sys
+import signal
 import argparse
 from pathlib import Path
+from pywriter.pywriter_globals import *
 from pywriter.config.configuration import Configuration
 from pywriter.ui.ui import Ui
 from pywriter.file.filter import Filter
 from ywreporterlib.rp_converter import RpConverter
+from ywreporterlib.rp_batch import RpBatch
+from ywreporterlib.console_ui import ConsoleUi
+from ywreporterlib.profiler import Profiler
+from ywreporterlib.profiler import write_profile
+from ywreporterlib.project_cache import ProjectCache
+from ywreporterlib.sc_expr_filter import ScExprFilter
+from ywreporterlib.yw7_stream_file import Yw7StreamFile
 from ywreporterlib.yw_reporter_tk import YwReporterTk
 
 SUFFIX = '_report'
@@ -38,6 +47,7 @@ OPTIONS = dict(
     show_description=True,
     show_viewpoint=False,
     show_tags=False,
+    show_languages=False,
     show_notes=False,
     show_date=False,
     show_time=False,
@@ -54,22 +64,59 @@ OPTIONS = dict(
 )
 
 
-def run(sourcePath, silentMode=True, installDir='.'):
-
-    #--- Load configuration
-    iniFile = f'{installDir}/{APPNAME}.ini'
-    configuration = Configuration(SETTINGS, OPTIONS)
-    configuration.read(iniFile)
+def get_kwargs(configuration, cacheDir=None, sceneFilter=None, incremental=False):
+    if sceneFilter is None:
+        sceneFilter = Filter()
     kwargs = dict(
         suffix=SUFFIX,
-        scene_filter=Filter()
+        scene_filter=sceneFilter,
+        metadata_only=True,
     )
+    if cacheDir:
+        kwargs['project_cache'] = ProjectCache(cacheDir)
+        kwargs['incremental'] = incremental
     kwargs.update(configuration.settings)
     kwargs.update(configuration.options)
+    return kwargs
+
+
+def cancel_on_interrupt(cancel):
+    """Make the first Ctrl-C call cancel(); a second Ctrl-C interrupts the program."""
+
+    def on_interrupt(signum, frame):
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        cancel()
+
+    signal.signal(signal.SIGINT, on_interrupt)
+
+
+def report_profile(profilePath, projects):
+    """Write the profile; print a message to stderr in case of error."""
+    message = write_profile(profilePath, projects)
+    if message.startswith(ERROR):
+        sys.stderr.write(f'{message.split(ERROR, maxsplit=1)[1].strip()}\n')
+
+
+def run(sourcePath, silentMode=True, installDir='.', cacheDir=None, sceneFilter=None, showProgress=False,
+        profilePath=None, profileMemory=False, incremental=False):
+
+    #--- Load configuration
+    iniFile = f'{installDir}/{APPNAME}.ini'
+    configuration = Configuration(SETTINGS, OPTIONS)
+    configuration.read(iniFile)
+    kwargs = get_kwargs(configuration, cacheDir, sceneFilter, incremental)
     converter = RpConverter()
     if silentMode:
-        converter.ui = Ui('')
+        if showProgress:
+            converter.ui = ConsoleUi('')
+        else:
+            converter.ui = Ui('')
+        cancel_on_interrupt(converter.ui.cancel)
+        if profilePath:
+            kwargs['profiler'] = Profiler(traceMemory=profileMemory)
         converter.run(sourcePath, **kwargs)
+        if profilePath:
+            report_profile(profilePath, [dict(project=sourcePath, stages=kwargs['profiler'].get_records())])
     else:
         converter.ui = YwReporterTk('yWriter report generator @release', **kwargs)
         converter.ui.converter = converter
@@ -91,15 +138,59 @@ def run(sourcePath, silentMode=True, installDir='.'):
         configuration.write(iniFile)
 
 
+def run_batch(source, installDir='.', maxWorkers=None, cacheDir=None, sceneFilter=None, profilePath=None,
+              profileMemory=False, incremental=False):
+    """Generate the reports for all projects in a directory or matching a glob pattern.
+
+    Ctrl-C skips the projects not yet started and cancels the running conversions.
+    If a profile path is given, write the stage timings of each project.
+    Print a summary and return the number of failed conversions.
+    """
+    iniFile = f'{installDir}/{APPNAME}.ini'
+    configuration = Configuration(SETTINGS, OPTIONS)
+    configuration.read(iniFile)
+    batch = RpBatch(maxWorkers)
+    cancel_on_interrupt(batch.cancel)
+    kwargs = get_kwargs(configuration, cacheDir, sceneFilter, incremental)
+    if profilePath:
+        kwargs['profiler'] = Profiler(traceMemory=profileMemory)
+    errors = batch.run(source, **kwargs)
+    print(batch.get_summary())
+    if profilePath:
+        report_profile(profilePath, batch.profiles)
+    return errors
+
+
+def list_filter_values(sourcePath, cacheDir=None):
+    """Print the filter expression terms for the tags, viewpoints, characters, locations, and items of a project.
+
+    Return 0 on success, otherwise return 1.
+    """
+    kwargs = dict(metadata_only=True)
+    if cacheDir:
+        kwargs['project_cache'] = ProjectCache(cacheDir)
+    ywPrj = Yw7StreamFile(sourcePath, **kwargs)
+    message = ywPrj.read()
+    if message.startswith(ERROR):
+        print(message.split(ERROR, maxsplit=1)[1].strip())
+        return 1
+
+    for term in ywPrj.get_catalog().get_filter_terms():
+        print(term)
+    return 0
+
+
 if __name__ == '__main__':
     try:
         homeDir = str(Path.home()).replace('\\', '/')
         installDir = f'{homeDir}/.pywriter/{APPNAME}/config'
+        cacheDir = f'{homeDir}/.pywriter/{APPNAME}/cache'
     except:
         installDir = '.'
+        cacheDir = None
     os.makedirs(installDir, exist_ok=True)
     if len(sys.argv) == 1:
-        run('', False, installDir)
+        run('', False, installDir, cacheDir)
     else:
         parser = argparse.ArgumentParser(
             description='yWriter report generator',
@@ -110,5 +201,52 @@ if __name__ == '__main__':
         parser.add_argument('--silent',
                             action="store_true",
                             help='operation without grphical user interface; suppress error messages and the request to confirm overwriting')
+        parser.add_argument('--progress',
+                            action="store_true",
+                            help='with --silent: show the progress on stderr; Ctrl-C cancels the conversion without leaving an unfinished report')
+        parser.add_argument('--batch',
+                            action="store_true",
+                            help='Sourcefile is a directory or a glob pattern; generate reports for all yWriter projects found, using a process pool')
+        parser.add_argument('--workers',
+                            type=int,
+                            help='number of worker processes for batch operation; default: CPU count')
+        cacheOptions = parser.add_mutually_exclusive_group()
+        cacheOptions.add_argument('--no-cache',
+                                  action="store_true",
+                                  help='always parse the yWriter project; do not use the cache')
+        cacheOptions.add_argument('--incremental',
+                            action="store_true",
+                                  help='keep the report rows in the cache, and re-render only the rows that have changed since the last run')
+        parser.add_argument('--filter',
+                            metavar='EXPRESSION',
+                            help='include only the scenes matching a filter expression, e.g. "tag:battle AND (viewpoint:Alice OR location:Castle) AND NOT status:Done"')
+        parser.add_argument('--profile',
+                            metavar='FILE',
+                            default=os.environ.get('YW_REPORTER_PROFILE', None),
+                            help='with --silent or --batch: write wall time, CPU time, and peak memory per conversion stage to a JSON file; "-" prints a table to stderr; default: $YW_REPORTER_PROFILE')
+        parser.add_argument('--profile-memory',
+                            action="store_true",
+                            help='with --profile: trace the peak memory per stage; this slows down the conversion')
+        parser.add_argument('--list-filter-values',
+                            action="store_true",
+                            help='print the filter expression terms for the tags, viewpoints, characters, locations, and items of Sourcefile, and exit')
         args = parser.parse_args()
-        run(args.sourcePath, args.silent, installDir)
+        if args.no_cache:
+            cacheDir = None
+        if args.incremental and not cacheDir:
+            parser.error('argument --incremental: no cache directory available')
+        if args.list_filter_values:
+            sys.exit(list_filter_values(args.sourcePath, cacheDir))
+
+        sceneFilter = None
+        if args.filter:
+            try:
+                sceneFilter = ScExprFilter(args.filter)
+            except ValueError as ex:
+                parser.error(str(ex))
+        if args.batch:
+            sys.exit(min(run_batch(args.sourcePath, installDir, args.workers, cacheDir, sceneFilter, args.profile,
+                                   args.profile_memory, args.incremental), 1))
+        else:
+            run(args.sourcePath, args.silent, installDir, cacheDir, sceneFilter, args.progress, args.profile,
+                args.profile_memory, args.incremental)
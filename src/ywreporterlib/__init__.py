@@ -5,12 +5,24 @@ Modules:
 csv_report -- Provide a class for CSV report file representation.
 html_report -- Provide a class for HTML report file representation.
 rp_converter -- Provide a converter class for yWriter reports. 
+rp_batch -- Provide a class for generating yWriter reports for many projects on a process pool.
 yw_reporter_tk -- Provide a tkinter GUI class for the yWriter report generator.
 sc_lc_filter.py -- Provide a scene per location filter class for template-based file export.
 sc_cr_filter.py -- Provide a scene per character filter class for template-based file export.
 sc_tg_filter.py -- Provide a scene per tag filter class for template-based file export.
 sc_it_filter.py -- Provide a scene per item filter class for template-based file export.
 sc_vp_filter.py -- Provide a scene per viewpoint filter class for template-based file export.
+yw7_stream_file -- Provide a class for reading yWriter 7 projects in a single streaming pass.
+project_cache -- Provide a class for an on-disk cache of parsed yWriter projects.
+project_catalog -- Provide a class for the catalog of the values the scene filters can select.
+report_export -- Provide an abstract class for template-based report export.
+compiled_template -- Provide a precompiled template class for report rows.
+scene_index -- Provide a class for inverted indexes of the scene relationships.
+sc_index_filter -- Provide an abstract scene filter class using the scene index.
+sc_expr_filter -- Provide a scene filter class for boolean filter expressions.
+tk_worker -- Provide a class for running tasks in the background of a tkinter GUI.
+console_ui -- Provide a UI facade showing the progress on the console.
+profiler -- Provide a class for timing the conversion stages.
 
 Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/yw-reporter
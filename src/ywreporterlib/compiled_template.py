@@ -0,0 +1,72 @@
+"""Provide a precompiled template class for report rows.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from string import Template
+
+
+class CompiledTemplate:
+    """Template string, split into literal slots and field slots.
+
+    Public methods:
+        safe_substitute(mapping) -- return the template with the placeholders substituted.
+
+    Public instance variables:
+        template -- str: the template string.
+        fields -- frozenset of str: names of the fields referred to by the template.
+
+    The template string is parsed only once, using the placeholder syntax of string.Template.
+    Substitution fills the field slots and joins all slots, without using the regex engine.
+    """
+
+    def __init__(self, template):
+        """Split the template string into slots.
+
+        Positional arguments:
+            template -- str: template string with $-placeholders.
+        """
+        self.template = template
+        self._slots = []
+        # list of str: literal slots, and the placeholders in the field slots.
+        self._fields = []
+        # list of tuples: (slot index, field name).
+        literal = []
+        position = 0
+        for match in Template.pattern.finditer(template):
+            literal.append(template[position:match.start()])
+            position = match.end()
+            name = match.group('named') or match.group('braced')
+            if name is None:
+                # Escaped delimiter, or ill-formed placeholder to be kept as is.
+                if match.group('escaped') is not None:
+                    literal.append(Template.delimiter)
+                else:
+                    literal.append(match.group())
+                continue
+
+            self._slots.append(''.join(literal))
+            literal = []
+            self._fields.append((len(self._slots), name))
+            self._slots.append(match.group())
+        literal.append(template[position:])
+        self._slots.append(''.join(literal))
+        self.fields = frozenset(name for __, name in self._fields)
+
+    def safe_substitute(self, mapping):
+        """Return the template with the placeholders substituted.
+
+        Positional arguments:
+            mapping -- dict: field values by field name.
+
+        Placeholders with no matching key are left unchanged,
+        as with string.Template.safe_substitute().
+        """
+        slots = self._slots.copy()
+        for i, name in self._fields:
+            try:
+                slots[i] = str(mapping[name])
+            except KeyError:
+                pass
+        return ''.join(slots)
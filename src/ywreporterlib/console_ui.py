@@ -0,0 +1,67 @@
+"""Provide a UI facade showing the progress on the console.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import sys
+from pywriter.ui.ui import Ui
+
+
+class ConsoleUi(Ui):
+    """Silent UI facade that shows the progress on stderr.
+
+    Public methods:
+        set_progress(message, count, total) -- show how far the converter has got.
+        set_info_how(message) -- show how the converter is doing.
+
+    The progress is shown as a percentage, overwriting the same line per message.
+    The line is updated only when the percentage changes.
+    """
+
+    def __init__(self, title):
+        """Initialize the progress line.
+
+        Positional arguments:
+            title -- application title.
+
+        Extends the superclass constructor.
+        """
+        super().__init__(title)
+        self._progress = None
+        # Last progress shown: (message, percentage).
+
+    def set_progress(self, message, count, total):
+        """Show how far the converter has got.
+
+        Positional arguments:
+            message -- str: what the converter is doing.
+            count -- int: number of elements processed.
+            total -- int: number of elements to be processed.
+
+        Overrides the superclass method.
+        """
+        if total:
+            progress = (message, count * 100 // total)
+        else:
+            progress = (message, 100)
+        if progress != self._progress:
+            if self._progress is not None and self._progress[0] != message:
+                sys.stderr.write('\n')
+            self._progress = progress
+            sys.stderr.write(f'\r{message} ... {progress[1]:3}%')
+            sys.stderr.flush()
+
+    def set_info_how(self, message):
+        """Show how the converter is doing.
+
+        Positional arguments:
+            message -- message to be buffered.
+
+        Terminate the progress line, if any.
+        Extends the superclass method.
+        """
+        if self._progress is not None:
+            sys.stderr.write('\n')
+            self._progress = None
+        super().set_info_how(message)
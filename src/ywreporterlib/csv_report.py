@@ -4,10 +4,10 @@ Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/yw-reporter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
-from pywriter.file.file_export import FileExport
+from ywreporterlib.report_export import ReportExport
 
 
-class CsvReport(FileExport):
+class CsvReport(ReportExport):
     """Class for CSV report file representation."""
     DESCRIPTION = 'CSV report'
     EXTENSION = '.csv'
@@ -54,10 +54,13 @@ class CsvReport(FileExport):
             show_characters -- bool: if True, include "Charcter" column.
             show_locations -- bool: if True, include "Locations" column.
             show_items -- bool: if True, include "Items" column.
+
+        Optional keyword arguments:
+            show_languages -- bool: if True, include "Languages" column (default: False).
             
         Extends the superclass constructor.
         """
-        super().__init__(filePath)
+        super().__init__(filePath, **kwargs)
         self._sceneFilter = kwargs['scene_filter']
         hdColumns = []
         chColumns = []
@@ -86,6 +89,10 @@ class CsvReport(FileExport):
             hdColumns.append('"Tags"')
             chColumns.append(',')
             scColumns.append('"$Tags"')
+        if kwargs.get('show_languages', False):
+            hdColumns.append('"Languages"')
+            chColumns.append(',')
+            scColumns.append('"$Languages"')
         if kwargs['show_notes']:
             hdColumns.append('"Notes"')
             chColumns.append(',')
@@ -181,3 +188,4 @@ class CsvReport(FileExport):
                 self._todoSceneTemplate = scRow
             if kwargs['show_unexported']:
                 self._notExportedSceneTemplate = scRow
+        self._compile_templates()
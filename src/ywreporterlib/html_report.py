@@ -4,10 +4,10 @@ Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/yw-reporter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
-from pywriter.file.file_export import FileExport
+from ywreporterlib.report_export import ReportExport
 
 
-class HtmlReport(FileExport):
+class HtmlReport(ReportExport):
     """Class for HTML report file representation."""
     DESCRIPTION = 'HTML report'
     EXTENSION = '.html'
@@ -83,10 +83,13 @@ tr.notexp {font-style: italic}
             show_characters -- bool: if True, include "Charcter" column.
             show_locations -- bool: if True, include "Locations" column.
             show_items -- bool: if True, include "Items" column.
+
+        Optional keyword arguments:
+            show_languages -- bool: if True, include "Languages" column (default: False).
             
         Extends the superclass constructor.
         """
-        super().__init__(filePath)
+        super().__init__(filePath, **kwargs)
         self._sceneFilter = kwargs['scene_filter']
         hdColumns = []
         chColumns = []
@@ -115,6 +118,10 @@ tr.notexp {font-style: italic}
             hdColumns.append('<th>Tags</th>')
             chColumns.append('<td></td>')
             scColumns.append('<td>$Tags</td>')
+        if kwargs.get('show_languages', False):
+            hdColumns.append('<th>Languages</th>')
+            chColumns.append('<td></td>')
+            scColumns.append('<td>$Languages</td>')
         if kwargs['show_notes']:
             hdColumns.append('<th>Notes</th>')
             chColumns.append('<td></td>')
@@ -210,3 +217,4 @@ tr.notexp {font-style: italic}
                 self._todoSceneTemplate = f'<tr class="todo">{scRow}</tr>'
             if kwargs['show_unexported']:
                 self._notExportedSceneTemplate = f'<tr class="notexp">{scRow}</tr>'
+        self._compile_templates()
@@ -0,0 +1,203 @@
+"""Provide a class for timing the conversion stages.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+import json
+import time
+import threading
+import tracemalloc
+from pywriter.pywriter_globals import *
+
+
+class Profiler:
+    """Wall time, CPU time, and peak memory per conversion stage.
+
+    Public methods:
+        stage(name) -- return a context manager measuring a stage.
+        iterate(name, iterable) -- return the iterable, measured as a stage on each item.
+        get_records() -- return the measurements per stage.
+
+    Public instance variables:
+        enabled -- bool: if False, nothing is measured.
+        traceMemory -- bool: if True, measure the peak memory with tracemalloc.
+
+    Stages can be nested; a nested stage is recorded under the path "outer/inner".
+    Repeated stages with the same path are accumulated.
+    A disabled profiler returns a context manager that does nothing, and the iterables unchanged.
+    Memory tracing slows down the conversion, and thus inflates the times.
+    Before Python 3.9, the peak memory of a stage includes the peaks of the stages before.
+    """
+
+    def __init__(self, enabled=True, traceMemory=False):
+        """Initialize instance variables.
+
+        Optional arguments:
+            enabled -- bool: if False, nothing is measured.
+            traceMemory -- bool: if True, measure the peak memory with tracemalloc.
+        """
+        self.enabled = enabled
+        self.traceMemory = traceMemory
+        self._records = {}
+        # key: stage path, value: list [calls, wall time, CPU time, self time, peak memory].
+        self._local = threading.local()
+        # Holds the stack of the open stages per thread.
+
+    def stage(self, name):
+        """Return a context manager measuring a stage.
+
+        Positional arguments:
+            name -- str: stage name.
+        """
+        if not self.enabled:
+            return _NO_STAGE
+
+        return _Stage(self, name)
+
+    def iterate(self, name, iterable):
+        """Return the iterable, measured as a stage on each item.
+
+        Positional arguments:
+            name -- str: stage name.
+            iterable -- iterable to be measured, e.g. a generator producing report lines.
+
+        The whole iteration counts as one call.
+        """
+        if not self.enabled:
+            return iterable
+
+        return self._iterate(name, iterable)
+
+    def get_records(self):
+        """Return a list of dictionaries with the measurements per stage, in order of the first entry.
+
+        Keys:
+            stage -- str: stage path.
+            calls -- int: number of entries.
+            wall -- float: wall time in seconds.
+            cpu -- float: CPU time of the process in seconds.
+            self -- float: wall time in seconds, not counting the nested stages.
+            peak -- int: peak traced memory in bytes, or None if memory is not traced.
+        """
+        return [dict(stage=path, calls=calls, wall=wall, cpu=cpu, self=selfWall, peak=peak)
+                for path, (calls, wall, cpu, selfWall, peak) in self._records.items()]
+
+    def _iterate(self, name, iterable):
+        iterator = iter(iterable)
+        calls = 1
+        while True:
+            self._enter(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+
+            finally:
+                self._exit(calls)
+                calls = 0
+            yield item
+
+    def _enter(self, name):
+        try:
+            stack = self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+        if stack:
+            path = f'{stack[-1][0]}/{name}'
+        else:
+            path = name
+        self._records.setdefault(path, [0, 0.0, 0.0, 0.0, None])
+        peak = None
+        if self.traceMemory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            peak, parentPeak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1][4] = max(stack[-1][4], parentPeak)
+            if hasattr(tracemalloc, 'reset_peak'):
+                # Python 3.9+
+                tracemalloc.reset_peak()
+        stack.append([path, time.perf_counter(), time.process_time(), 0.0, peak])
+
+    def _exit(self, calls):
+        stack = self._local.stack
+        path, startWall, startCpu, childWall, peak = stack.pop()
+        wall = time.perf_counter() - startWall
+        cpu = time.process_time() - startCpu
+        if peak is not None:
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        if stack:
+            stack[-1][3] += wall
+            if peak is not None:
+                stack[-1][4] = max(stack[-1][4], peak)
+        record = self._records[path]
+        record[0] += calls
+        record[1] += wall
+        record[2] += cpu
+        record[3] += wall - childWall
+        if peak is not None:
+            record[4] = max(record[4] or 0, peak)
+
+
+class _Stage:
+    """Context manager measuring a stage."""
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._profiler._enter(self._name)
+
+    def __exit__(self, *args):
+        self._profiler._exit(1)
+
+
+class _NoStage:
+    """Context manager of a disabled profiler."""
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *args):
+        pass
+
+
+_NO_STAGE = _NoStage()
+
+
+def write_profile(filePath, projects):
+    """Write the measurements to a JSON file, or print them as a table.
+
+    Positional arguments:
+        filePath -- str: path to the JSON file; '-' means "print to stderr".
+        projects -- list of dict: {'project': project path, 'stages': Profiler.get_records()}.
+
+    Return a message beginning with the ERROR constant in case of error.
+    """
+    if filePath == '-':
+        lines = []
+        for project in projects:
+            lines.append(project['project'])
+            lines.append(f'{"Stage":40} {"Calls":>8} {"Wall s":>9} {"CPU s":>9} {"Self s":>9} {"Peak MiB":>9}')
+            for record in project['stages']:
+                if record['peak'] is None:
+                    peak = '-'
+                else:
+                    peak = f'{record["peak"] / 0x100000:.1f}'
+                lines.append(f'{record["stage"]:40} {record["calls"]:8} {record["wall"]:9.4f} {record["cpu"]:9.4f} '
+                             f'{record["self"]:9.4f} {peak:>9}')
+            lines.append('')
+        sys.stderr.write('\n'.join(lines))
+        return 'Profile printed.'
+
+    try:
+        with open(filePath, 'w', encoding='utf-8') as f:
+            json.dump(dict(projects=projects), f, indent=1)
+    except:
+        return f'{ERROR}{_("Cannot write file")}: "{os.path.normpath(filePath)}".'
+
+    return f'{_("File written")}: "{os.path.normpath(filePath)}".'
@@ -0,0 +1,257 @@
+"""Provide a class for an on-disk cache of parsed yWriter projects.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import gc
+import pickle
+import hashlib
+import tempfile
+from pywriter.model.novel import Novel
+from ywreporterlib.project_catalog import ProjectCatalog
+
+
+class ProjectCache:
+    """On-disk cache of the parsed project data, with LRU eviction.
+
+    Public methods:
+        load(novel, variant) -- restore the novel's data from the cache, if up to date.
+        store(novel, variant) -- save the novel's data in the cache.
+        load_data(filePath, variant) -- return the data stored for a file path.
+        store_data(filePath, variant, data) -- save any picklable data for a file path.
+        clear() -- remove all cache files.
+
+    Public instance variables:
+        cacheDir -- str: directory holding the cache files.
+        maxSize -- int: maximum total size of the cache files in bytes.
+        checkHash -- bool: if True, compare the project file's SHA-256 hash in addition to size and mtime.
+
+    There is one cache file per project and variant. It holds a small header
+    with the cache key, followed by the pickled project data.
+    The cache key includes a signature of the pickled classes' instance variables,
+    so cache files written by a different version of the model classes are ignored.
+    Cache files are touched when used; the least recently used files are
+    removed when the size limit is exceeded.
+    The cache files are trusted as being written by this application.
+    """
+    EXTENSION = '.cache'
+    _FORMAT = 4
+    # Increment this when the meaning of cached values changes without changing the classes' instance variables.
+
+    _ATTRIBUTES = ('title', 'desc', 'kwVar', 'authorName', 'authorBio',
+                   'fieldTitle1', 'fieldTitle2', 'fieldTitle3', 'fieldTitle4',
+                   'chapters', 'scenes', 'languages', 'srtChapters',
+                   'locations', 'srtLocations', 'items', 'srtItems', 'characters', 'srtCharacters',
+                   'projectNotes', 'srtPrjNotes', 'languageCode', 'countryCode')
+    # Novel instance variables to be cached.
+
+    _OPTIONAL_ATTRIBUTES = ('catalog',)
+    # Instance variables of Novel subclasses to be cached, if set.
+
+    def __init__(self, cacheDir, maxSize=0x10000000, checkHash=False):
+        """Set the cache location and limits.
+
+        Positional arguments:
+            cacheDir -- str: directory holding the cache files; created when needed.
+
+        Optional arguments:
+            maxSize -- int: maximum total size of the cache files in bytes; default: 256 MiB.
+            checkHash -- bool: if True, compare the project file's hash in addition to size and mtime.
+        """
+        self.cacheDir = cacheDir
+        self.maxSize = maxSize
+        self.checkHash = checkHash
+
+    def load(self, novel, variant=''):
+        """Restore the novel's data from the cache, if up to date.
+
+        Positional arguments:
+            novel -- Novel instance with the project file path set.
+
+        Optional arguments:
+            variant -- str: distinguishes cached data read with different options.
+
+        Return True in case of success.
+        Return False if there is no up-to-date cache entry, or if it cannot be read.
+        """
+        try:
+            key = self._get_key(novel)
+        except OSError:
+            return False
+
+        data = self._read(self._get_cache_path(novel.filePath, variant), key)
+        if data is None:
+            return False
+
+        for attribute in self._ATTRIBUTES:
+            setattr(novel, attribute, data[attribute])
+        for attribute in self._OPTIONAL_ATTRIBUTES:
+            if attribute in data:
+                setattr(novel, attribute, data[attribute])
+        return True
+
+    def store(self, novel, variant=''):
+        """Save the novel's data in the cache.
+
+        Positional arguments:
+            novel -- Novel instance holding the project data read from novel.filePath.
+
+        Optional arguments:
+            variant -- str: distinguishes cached data read with different options.
+
+        Remove the least recently used cache files if the size limit is exceeded.
+        Return True in case of success.
+        """
+        try:
+            key = self._get_key(novel)
+        except OSError:
+            return False
+
+        data = {attribute: getattr(novel, attribute) for attribute in self._ATTRIBUTES}
+        for attribute in self._OPTIONAL_ATTRIBUTES:
+            if getattr(novel, attribute, None) is not None:
+                data[attribute] = getattr(novel, attribute)
+        return self._write(self._get_cache_path(novel.filePath, variant), key, data)
+
+    def load_data(self, filePath, variant):
+        """Return the data stored for a file path, or None if there is none.
+
+        Positional arguments:
+            filePath -- str: path of the file the data belongs to.
+            variant -- str: kind of data.
+
+        Unlike load(), this does not check whether the file has changed.
+        """
+        return self._read(self._get_cache_path(filePath, variant), (self._FORMAT, os.path.realpath(filePath)))
+
+    def store_data(self, filePath, variant, data):
+        """Save any picklable data for a file path in the cache.
+
+        Positional arguments:
+            filePath -- str: path of the file the data belongs to.
+            variant -- str: kind of data.
+            data -- object to be stored.
+
+        Remove the least recently used cache files if the size limit is exceeded.
+        Return True in case of success.
+        """
+        return self._write(self._get_cache_path(filePath, variant), (self._FORMAT, os.path.realpath(filePath)), data)
+
+    def clear(self):
+        """Remove all cache files."""
+        for entry in self._get_entries():
+            try:
+                os.remove(entry.path)
+            except:
+                pass
+
+    def _get_cache_path(self, filePath, variant):
+        """Return the path of the cache file for a project file and a variant."""
+        name = hashlib.sha1(f'{os.path.realpath(filePath)}|{variant}'.encode('utf-8')).hexdigest()
+        return os.path.join(self.cacheDir, f'{name}{self.EXTENSION}')
+
+    def _get_key(self, novel):
+        """Return a tuple identifying the current state of a project file and the model classes."""
+        filePath = novel.filePath
+        stat = os.stat(filePath)
+        if self.checkHash:
+            fileHash = hashlib.sha256()
+            with open(filePath, 'rb') as f:
+                for block in iter(lambda: f.read(0x100000), b''):
+                    fileHash.update(block)
+            contentHash = fileHash.hexdigest()
+        else:
+            contentHash = None
+        return (self._FORMAT, self._get_schema(novel), os.path.realpath(filePath), stat.st_size, stat.st_mtime_ns,
+                contentHash)
+
+    def _get_schema(self, novel):
+        """Return a signature of the instance variables of the classes whose instances are cached.
+        
+        Positional arguments:
+            novel -- Novel instance determining the element classes.
+        """
+        elements = [novel.CHAPTER_CLASS(), novel.SCENE_CLASS(), novel.CHARACTER_CLASS(), novel.WE_CLASS(),
+                    novel.PN_CLASS(), ProjectCatalog(Novel(''))]
+        schema = [self._ATTRIBUTES, self._OPTIONAL_ATTRIBUTES]
+        for element in elements:
+            variables = set(getattr(element, '__dict__', ()))
+            for cls in type(element).__mro__:
+                variables.update(getattr(cls, '__slots__', ()))
+            schema.append((type(element).__module__, type(element).__qualname__, tuple(sorted(variables))))
+        return hashlib.sha1(repr(schema).encode('utf-8')).hexdigest()
+
+    def _read(self, cachePath, key):
+        """Return the data of a cache file, or None if the file's key does not match."""
+        gcEnabled = gc.isenabled()
+        try:
+            with open(cachePath, 'rb') as f:
+                if pickle.load(f) != key:
+                    return None
+
+                gc.disable()
+                # Unpickling creates many objects; garbage collection would only slow it down.
+                data = pickle.load(f)
+            os.utime(cachePath)
+        except:
+            return None
+
+        finally:
+            if gcEnabled:
+                gc.enable()
+        return data
+
+    def _write(self, cachePath, key, data):
+        """Save the key and the data in a cache file; return True in case of success."""
+        tempPath = None
+        try:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            fd, tempPath = tempfile.mkstemp(suffix='.tmp', prefix=f'{os.path.basename(cachePath)}.', dir=self.cacheDir)
+            with open(fd, 'wb') as f:
+                pickle.dump(key, f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tempPath, cachePath)
+        except:
+            if tempPath is not None:
+                try:
+                    os.remove(tempPath)
+                except:
+                    pass
+            return False
+
+        self._evict()
+        return True
+
+    def _get_entries(self):
+        """Return a list of os.DirEntry instances of the cache files."""
+        try:
+            with os.scandir(self.cacheDir) as entries:
+                return [entry for entry in entries if entry.name.endswith(self.EXTENSION)]
+
+        except OSError:
+            return []
+
+    def _evict(self):
+        """Remove the least recently used cache files until the size limit is kept."""
+        entries = []
+        totalSize = 0
+        for entry in self._get_entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            totalSize += stat.st_size
+        entries.sort()
+        for __, size, path in entries:
+            if totalSize <= self.maxSize:
+                break
+
+            try:
+                os.remove(path)
+                totalSize -= size
+            except OSError:
+                pass
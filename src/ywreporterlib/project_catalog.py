@@ -0,0 +1,73 @@
+"""Provide a class for the catalog of the values the scene filters can select.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+
+
+class ProjectCatalog:
+    """Tags, viewpoints, characters, locations, and items referred to by the scenes.
+
+    Public methods:
+        get_filter_terms() -- return a list of filter expression terms for all catalog entries.
+
+    Public instance variables:
+        tags -- dict: tag by tag.
+        viewpoints -- dict: character title by viewpoint character ID.
+        characters -- dict: character title by character ID.
+        locations -- dict: location title by location ID.
+        items -- dict: item title by item ID.
+
+    The catalog is built in a single pass over the scenes, in the chapter and scene order.
+    The entries are in order of their first occurrence.
+    """
+
+    def __init__(self, novel):
+        """Build the catalog.
+
+        Positional arguments:
+            novel -- Novel instance holding the scenes to catalog.
+        """
+        self.tags = {}
+        self.viewpoints = {}
+        self.characters = {}
+        self.locations = {}
+        self.items = {}
+        for chId in novel.srtChapters:
+            for scId in novel.chapters[chId].srtScenes:
+                scene = novel.scenes[scId]
+                if scene.tags:
+                    for tag in scene.tags:
+                        self.tags.setdefault(tag, tag)
+                if scene.characters:
+                    vpId = scene.characters[0]
+                    if not vpId in self.viewpoints:
+                        self.viewpoints[vpId] = novel.characters[vpId].title
+                    for crId in scene.characters:
+                        if not crId in self.characters:
+                            self.characters[crId] = novel.characters[crId].title
+                if scene.locations:
+                    for lcId in scene.locations:
+                        if not lcId in self.locations:
+                            self.locations[lcId] = novel.locations[lcId].title
+                if scene.items:
+                    for itId in scene.items:
+                        if not itId in self.items:
+                            self.items[itId] = novel.items[itId].title
+
+    def get_filter_terms(self):
+        """Return a list of filter expression terms for all catalog entries.
+
+        Each title occurs once per category, even if several elements have the same title.
+        Titles containing double quotes cannot be expressed as terms and are left out.
+        """
+        terms = []
+        for category, entries in (('tag', self.tags), ('viewpoint', self.viewpoints), ('character', self.characters),
+                                  ('location', self.locations), ('item', self.items)):
+            for title in dict.fromkeys(entries.values()):
+                if title is None or '"' in title:
+                    continue
+
+                terms.append(f'{category}:"{title}"')
+        return terms
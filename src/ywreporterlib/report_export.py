@@ -0,0 +1,326 @@
+"""Provide an abstract class for template-based report export.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+from pywriter.pywriter_globals import *
+from pywriter.file.file_export import FileExport
+from pywriter.file.atomic_file import AtomicFile
+from ywreporterlib.compiled_template import CompiledTemplate
+from ywreporterlib.profiler import Profiler
+
+
+class ReportExport(FileExport):
+    """Abstract report file representation.
+
+    Public methods:
+        merge(source) -- update instance variables from a source instance.
+        write() -- write instance variables to the report file line by line.
+
+    Public instance variables:
+        renderedRows -- int: number of chapter and scene rows rendered by the last write().
+        reusedRows -- int: number of chapter and scene rows taken from the previous write().
+
+    Row templates are compiled once per export instead of once per row.
+    Subclasses set up their templates in the constructor, and then call _compile_templates().
+    After that, the scene mapping includes only the fields referred to by the scene templates.
+
+    In incremental mode, the rendered chapter and scene rows are kept in the 
+    project cache, together with a fingerprint of the values they depend on. 
+    The next write() renders only the rows whose fingerprint has changed.
+
+    If a profiler is given, merge() and write() are measured as stages.
+    Within write(), each report section is a stage; within the chapters,
+    "substitution" is the rendering of the rows, and "mapping" the computation 
+    of the placeholder values. The self time of write() is the file output.
+    """
+    _SCENE_TEMPLATES = ('_sceneTemplate', '_firstSceneTemplate', '_appendedSceneTemplate', '_notesSceneTemplate',
+                        '_todoSceneTemplate', '_unusedSceneTemplate', '_notExportedSceneTemplate')
+
+    def __init__(self, filePath, **kwargs):
+        """Initialize the template cache.
+
+        Positional arguments:
+            filePath -- str: path to the report file.
+
+        Optional keyword arguments:
+            suffix -- str: report filename suffix; default: the class's SUFFIX.
+            incremental -- bool: if True, re-render only the rows that have changed since the last write().
+            project_cache -- ProjectCache instance: storage for the rows in incremental mode.
+            profiler -- Profiler instance: timing of the conversion stages.
+
+        Extends the superclass constructor.
+        """
+        suffix = kwargs.get('suffix', None)
+        if suffix is not None:
+            self.SUFFIX = suffix
+            # Several reports with different suffixes can be created from one project.
+        super().__init__(filePath, **kwargs)
+        self._compiledTemplates = {}
+        # key: template string, value: CompiledTemplate instance.
+        self._sceneFields = None
+        # set of the field names used by the scene templates; None means "all fields".
+        self.renderedRows = 0
+        self.reusedRows = 0
+        self._projectCache = None
+        if kwargs.get('incremental', False):
+            self._projectCache = kwargs.get('project_cache', None)
+        self._previousRows = None
+        # key: scene ID or (chapter ID, template string); value: (fingerprint, row).
+        self._currentRows = None
+        # Rows of the ongoing write(), to be stored for the next one.
+        self._rowsFingerprint = None
+        # Values all rows of the ongoing write() depend on.
+        self._profiler = kwargs.get('profiler', None) or Profiler(enabled=False)
+
+    def merge(self, source):
+        """Update instance variables from a source instance.
+        
+        Positional arguments:
+            source -- Novel subclass instance to merge.
+        
+        Return a message beginning with the ERROR constant in case of error.
+        Extends the superclass method.
+        """
+        with self._profiler.stage('merge'):
+            return super().merge(source)
+
+    def _compile_templates(self):
+        """Compile the file header and all row templates.
+        
+        Collect the field names used by the scene templates, and select the
+        field groups computing them. The scene rows' fingerprint is made up of
+        the values these field groups depend on.
+        """
+        self._sceneFields = set()
+        for name in dir(self):
+            if name == '_fileHeader' or name.endswith('Template'):
+                text = getattr(self, name)
+                if text and isinstance(text, str):
+                    template = self._get_template(text)
+                    if name in self._SCENE_TEMPLATES:
+                        self._sceneFields.update(template.fields)
+        self._sceneFieldGroups = []
+        dependencies = set()
+        for fieldNames, method, groupDependencies in self._SCENE_FIELD_GROUPS:
+            if not self._sceneFields.isdisjoint(fieldNames):
+                self._sceneFieldGroups.append(method)
+                dependencies.update(groupDependencies)
+        self._fingerprintDependencies = tuple(dependency.split('.') for dependency in sorted(dependencies))
+
+    def _get_template(self, text):
+        """Return a compiled template for text.
+
+        Positional arguments:
+            text -- str: template string with placeholders.
+
+        Templates not compiled in advance are compiled on first use.
+        Overrides the superclass method.
+        """
+        try:
+            return self._compiledTemplates[text]
+
+        except KeyError:
+            template = CompiledTemplate(text)
+            self._compiledTemplates[text] = template
+            return template
+
+    def write(self):
+        """Write instance variables to the report file line by line.
+        
+        The lines are written as they are produced, so the complete 
+        report text is never held in memory.
+        If the ui asks to cancel, discard the unfinished report and keep the previous one.
+        The file is replaced atomically; an existing file is kept as a backup.
+        Return a message beginning with the ERROR constant in case of a file error.
+        Exceptions raised while rendering the report are passed on; the previous report is kept.
+        Overrides the superclass method.
+        """
+        with self._profiler.stage('write'):
+            self._load_rows()
+            atomicFile = AtomicFile(self.filePath)
+            try:
+                with atomicFile as f:
+                    f.writelines(self._iter_text())
+                    canceled = self.ui.is_canceled()
+                    if canceled:
+                        atomicFile.discard()
+            except (OSError, UnicodeError) as ex:
+                return f'{ERROR}{_("Cannot write file")}: "{os.path.normpath(self.filePath)}" - {str(ex)}'
+
+            if canceled:
+                return f'{ERROR}{_("Action canceled by user")}.'
+
+            self._store_rows()
+            return f'{_("File written")}: "{os.path.normpath(self.filePath)}".'
+
+    def _get_rows_fingerprint(self):
+        """Return a tuple of the values all rows depend on."""
+        return (self.__class__.__name__, tuple(sorted(self._compiledTemplates)), self.projectName, self.projectPath,
+                self.fieldTitle1, self.fieldTitle2, self.fieldTitle3, self.fieldTitle4)
+
+    def _load_rows(self):
+        """Get the rows of the previous write() from the project cache, if in incremental mode."""
+        self.renderedRows = 0
+        self.reusedRows = 0
+        if self._projectCache is None or self._sceneFields is None:
+            self._previousRows = None
+            self._currentRows = None
+            return
+
+        self._previousRows = {}
+        self._currentRows = {}
+        self._rowsFingerprint = self._get_rows_fingerprint()
+        data = self._projectCache.load_data(self.filePath, 'rows')
+        if data is not None and data[0] == self._rowsFingerprint:
+            self._previousRows = data[1]
+
+    def _store_rows(self):
+        """Save the rows of this write() in the project cache, if in incremental mode."""
+        if self._currentRows is None:
+            return
+
+        self._projectCache.store_data(self.filePath, 'rows', (self._rowsFingerprint, self._currentRows))
+        self._previousRows = None
+        self._currentRows = None
+
+    def _render_chapter(self, template, chId, chapterNumber):
+        """Return a chapter row, substituting the template's placeholders.
+        
+        Positional arguments:
+            template -- CompiledTemplate instance.
+            chId -- str: chapter ID.
+            chapterNumber -- int: chapter number to be displayed.
+        
+        In incremental mode, reuse the previous row if the chapter is unchanged.
+        Extends the superclass method.
+        """
+        with self._profiler.stage('substitution'):
+            if self._currentRows is None:
+                self.renderedRows += 1
+                return super()._render_chapter(template, chId, chapterNumber)
+
+            key = (chId, template.template)
+            fingerprint = (template.template, chapterNumber, self.chapters[chId].title, self.chapters[chId].desc)
+            return self._get_row(key, fingerprint, super()._render_chapter, template, chId, chapterNumber)
+
+    def _render_scene(self, template, scId, sceneNumber, wordsTotal, lettersTotal):
+        """Return a scene row, substituting the template's placeholders.
+        
+        Positional arguments:
+            template -- CompiledTemplate instance.
+            scId -- str: scene ID.
+            sceneNumber -- int: scene number to be displayed.
+            wordsTotal -- int: accumulated wordcount.
+            lettersTotal -- int: accumulated lettercount.
+        
+        In incremental mode, reuse the previous row if the values the scene's fields depend on are unchanged.
+        Extends the superclass method.
+        """
+        with self._profiler.stage('substitution'):
+            if self._currentRows is None:
+                self.renderedRows += 1
+                return super()._render_scene(template, scId, sceneNumber, wordsTotal, lettersTotal)
+
+            scene = self.scenes[scId]
+            arguments = dict(sceneNumber=sceneNumber, wordsTotal=wordsTotal, lettersTotal=lettersTotal)
+            fingerprint = [template.template]
+            for source, name in self._fingerprintDependencies:
+                if source == 'scene':
+                    fingerprint.append(getattr(scene, name))
+                elif source == 'novel':
+                    fingerprint.append(getattr(self, name))
+                elif source == 'arg':
+                    fingerprint.append(arguments[name])
+                else:
+                    # Titles of the related elements.
+                    elements = getattr(self, source)
+                    titles = []
+                    for eId in getattr(scene, source) or []:
+                        try:
+                            titles.append(elements[eId].title)
+                        except KeyError:
+                            titles.append(None)
+                    fingerprint.append(tuple(titles))
+            return self._get_row(scId, tuple(fingerprint), super()._render_scene,
+                                 template, scId, sceneNumber, wordsTotal, lettersTotal)
+
+    def _get_row(self, key, fingerprint, render, *args):
+        """Return the previous row if its fingerprint matches; otherwise render a new one.
+        
+        Positional arguments:
+            key -- identifier of the row.
+            fingerprint -- tuple: values the row depends on.
+            render -- method rendering the row from args.
+        """
+        previous = self._previousRows.get(key, None)
+        if previous is not None and previous[0] == fingerprint:
+            row = previous[1]
+            self.reusedRows += 1
+        else:
+            row = render(*args)
+            self.renderedRows += 1
+        self._currentRows[key] = (fingerprint, row)
+        return row
+
+    def _get_text(self):
+        """Return the report as a single string.
+        
+        Overrides the superclass method.
+        """
+        return ''.join(self._iter_text())
+
+    def _iter_text(self):
+        """Call all processing methods, and generate the report line by line."""
+        with self._profiler.stage('header'):
+            lines = self._get_fileHeader()
+        yield from lines
+        yield from self._profiler.iterate('chapters', self._iter_chapters())
+        with self._profiler.stage('characters'):
+            lines = self._get_characters()
+        yield from lines
+        with self._profiler.stage('locations'):
+            lines = self._get_locations()
+        yield from lines
+        with self._profiler.stage('items'):
+            lines = self._get_items()
+        yield from lines
+        with self._profiler.stage('projectNotes'):
+            lines = self._get_projectNotes()
+        yield from lines
+        yield self._fileFooter
+
+    def _get_chapterMapping(self, chId, chapterNumber):
+        """Return a mapping dictionary for a chapter section.
+        
+        Positional arguments:
+            chId -- str: chapter ID.
+            chapterNumber -- int: chapter number.
+        
+        Extends the superclass method.
+        """
+        with self._profiler.stage('mapping'):
+            return super()._get_chapterMapping(chId, chapterNumber)
+
+    def _get_sceneMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        """Return a mapping dictionary for a scene section.
+        
+        Positional arguments:
+            scId -- str: scene ID.
+            sceneNumber -- int: scene number to be displayed.
+            wordsTotal -- int: accumulated wordcount.
+            lettersTotal -- int: accumulated lettercount.
+        
+        If the templates are compiled, compute only the field groups used by the scene templates.
+        Overrides the superclass method.
+        """
+        with self._profiler.stage('mapping'):
+            if self._sceneFields is None:
+                return super()._get_sceneMapping(scId, sceneNumber, wordsTotal, lettersTotal)
+
+            sceneMapping = {}
+            for method in self._sceneFieldGroups:
+                sceneMapping.update(getattr(self, method)(scId, sceneNumber, wordsTotal, lettersTotal))
+            return sceneMapping
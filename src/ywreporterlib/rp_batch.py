@@ -0,0 +1,212 @@
+"""Provide a class for generating yWriter reports for many projects on a process pool.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import glob
+import time
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import CancelledError
+from pywriter.pywriter_globals import *
+from pywriter.ui.ui import Ui
+from pywriter.yw.yw7_file import Yw7File
+from ywreporterlib.rp_converter import RpConverter
+from ywreporterlib.profiler import Profiler
+
+_runningUi = None
+# BatchUi instance of the conversion running in a worker process, to be canceled on SIGINT.
+
+
+class RpBatch:
+    """Report generator for a whole set of yWriter projects.
+
+    Public methods:
+        run(source, **kwargs) -- generate the reports for all projects found, using a process pool.
+        get_errors() -- return the project paths and error messages of the failed conversions.
+        get_summary() -- return the per-project results as a printable string.
+        cancel() -- skip the projects not yet started.
+
+    Public instance variables:
+        results -- list of tuples: (project path, message, conversion time in seconds).
+        elapsedTime -- float: wall time of the last run in seconds.
+        profiles -- list of dict: {'project': project path, 'stages': Profiler records}, if profiling.
+        maxWorkers -- int: number of worker processes; None means "CPU count".
+    """
+
+    def __init__(self, maxWorkers=None):
+        """Initialize instance variables.
+
+        Optional arguments:
+            maxWorkers -- int: number of worker processes; default: CPU count.
+        """
+        self.results = []
+        self.elapsedTime = 0.0
+        self.profiles = []
+        self.maxWorkers = maxWorkers
+        self._futures = []
+
+    def run(self, source, **kwargs):
+        """Generate the reports for all projects found, using a process pool.
+
+        Positional arguments:
+            source -- str: directory to be searched for yw7 files, or glob pattern.
+
+        Required keyword arguments:
+            The same as for RpConverter.run().
+
+        Optional keyword arguments:
+            profiler -- Profiler instance: if given, each project is profiled in its
+                        worker process by a profiler with the same settings.
+
+        The results are stored in the same order as the projects are found.
+        If the batch is canceled, the projects not yet started are marked as failed.
+        On SIGINT, the worker processes cancel their running conversions.
+        Return the number of failed conversions.
+        """
+        self.results = []
+        self.elapsedTime = 0.0
+        self.profiles = []
+        profiler = kwargs.get('profiler', None)
+        if profiler is not None and profiler.enabled:
+            traceMemory = profiler.traceMemory
+        else:
+            traceMemory = None
+        workerKwargs = {keyword: value for keyword, value in kwargs.items() if keyword != 'profiler'}
+        # A profiler cannot be passed to another process.
+        sourcePaths = get_project_paths(source)
+        if not sourcePaths:
+            self.results.append((source, f'{ERROR}{_("No yWriter project found")}.', 0.0))
+            return 1
+
+        if self.maxWorkers is None:
+            maxWorkers = os.cpu_count() or 1
+        else:
+            maxWorkers = self.maxWorkers
+        startTime = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=min(maxWorkers, len(sourcePaths)), initializer=init_worker) as executor:
+            self._futures = [executor.submit(convert_project, sourcePath, workerKwargs, traceMemory) for sourcePath in sourcePaths]
+            for sourcePath, future in zip(sourcePaths, self._futures):
+                try:
+                    result, records = future.result()
+                    self.results.append(result)
+                    if records is not None:
+                        self.profiles.append(dict(project=sourcePath, stages=records))
+                except CancelledError:
+                    self.results.append((sourcePath, f'{ERROR}{_("Action canceled by user")}.', 0.0))
+                except Exception as ex:
+                    self.results.append((sourcePath, f'{ERROR}{str(ex)}', 0.0))
+        self._futures = []
+        self.elapsedTime = time.perf_counter() - startTime
+        return len(self.get_errors())
+
+    def cancel(self):
+        """Skip the projects not yet started.
+
+        The running conversions are finished, unless their worker processes are interrupted, too.
+        Can be called from a signal handler.
+        """
+        for future in self._futures:
+            future.cancel()
+
+    def get_errors(self):
+        """Return a list of tuples (project path, error message) for the failed conversions."""
+        return [(sourcePath, message) for sourcePath, message, __ in self.results if message.startswith(ERROR)]
+
+    def get_summary(self):
+        """Return the per-project results as a printable string."""
+        lines = []
+        totalTime = 0.0
+        for sourcePath, message, seconds in self.results:
+            totalTime += seconds
+            if message.startswith(ERROR):
+                status = 'FAIL'
+            else:
+                status = 'OK'
+            lines.append(f'{seconds:8.2f} s  {status:4}  {os.path.normpath(sourcePath)}')
+        errors = self.get_errors()
+        if errors:
+            lines.append('')
+            lines.append('Errors:')
+            for sourcePath, message in errors:
+                lines.append(f'{os.path.normpath(sourcePath)}: {message.split(ERROR, maxsplit=1)[1].strip()}')
+        lines.append('')
+        lines.append(f'{len(self.results)} project(s), {len(errors)} error(s), {totalTime:.2f} s conversion time, {self.elapsedTime:.2f} s elapsed.')
+        return '\n'.join(lines)
+
+
+class BatchUi(Ui):
+    """Silent UI facade that only buffers the messages.
+
+    The message of the last conversion is kept unchanged in infoHowText,
+    so that the batch summary can tell success from failure.
+    """
+
+    def set_info_how(self, message):
+        """Buffer the message.
+
+        Positional arguments:
+            message -- message to be buffered.
+
+        Overrides the superclass method.
+        """
+        self.infoHowText = message
+
+
+def init_worker():
+    """Make SIGINT cancel the conversions instead of terminating; to be run in a worker process."""
+    signal.signal(signal.SIGINT, interrupt_worker)
+
+
+def interrupt_worker(signum, frame):
+    """Cancel the running conversion of a worker process; SIGINT handler."""
+    if _runningUi is not None:
+        _runningUi.cancel()
+
+
+def get_project_paths(source):
+    """Return a sorted list of the yWriter project paths found.
+
+    Positional arguments:
+        source -- str: directory to be searched recursively for yw7 files, or glob pattern.
+    """
+    if os.path.isdir(source):
+        pattern = os.path.join(source, '**', f'*{Yw7File.EXTENSION}')
+    else:
+        pattern = source
+    return sorted(path for path in glob.glob(pattern, recursive=True)
+                  if path.endswith(Yw7File.EXTENSION) and os.path.isfile(path))
+
+
+def convert_project(sourcePath, kwargs, traceMemory=None):
+    """Generate a report for a single project; to be run in a worker process.
+
+    Positional arguments:
+        sourcePath -- str: the yWriter project file path.
+        kwargs -- dict: keyword arguments for RpConverter.run().
+
+    Optional arguments:
+        traceMemory -- bool: if not None, profile the conversion; if True, trace the memory, too.
+
+    Return a tuple: ((project path, message, conversion time in seconds), profiler records or None).
+    """
+    global _runningUi
+    profiler = None
+    if traceMemory is not None:
+        profiler = Profiler(traceMemory=traceMemory)
+        kwargs = dict(kwargs, profiler=profiler)
+    startTime = time.perf_counter()
+    converter = RpConverter()
+    converter.ui = BatchUi('')
+    _runningUi = converter.ui
+    try:
+        converter.run(sourcePath, **kwargs)
+    finally:
+        _runningUi = None
+    result = (sourcePath, converter.ui.infoHowText, time.perf_counter() - startTime)
+    if profiler is None:
+        return result, None
+
+    return result, profiler.get_records()
@@ -5,9 +5,10 @@ For further information see https://github.com/peter88213/yw-reporter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import os
-from pywriter.pywriter_globals import ERROR
+from pywriter.pywriter_globals import *
 from pywriter.converter.yw_cnv_ui import YwCnvUi
 from pywriter.yw.yw7_file import Yw7File
+from ywreporterlib.yw7_stream_file import Yw7StreamFile
 from ywreporterlib.html_report import HtmlReport
 from ywreporterlib.csv_report import CsvReport
 
@@ -17,6 +18,7 @@ class RpConverter(YwCnvUi):
     
      Public methods:
         run(sourcePath, **kwargs) -- create source and target objects and run conversion.
+        run_reports(sourcePath, reports, **kwargs) -- read the project once and create several reports.
     """
 
     def run(self, sourcePath, **kwargs):
@@ -28,6 +30,9 @@ class RpConverter(YwCnvUi):
         Required keyword arguments:
             output_selection -- str: if '1' export csv, otherwise export html.
             suffix -- str: report filename suffix.
+
+        Optional keyword arguments:
+            metadata_only -- bool: if True, do not keep the scene contents when reading the project.
             
         Overrides the superclass method.
         """
@@ -37,11 +42,101 @@ class RpConverter(YwCnvUi):
             return
         fileName, fileExtension = os.path.splitext(sourcePath)
         if fileExtension == Yw7File.EXTENSION:
-            sourceFile = Yw7File(sourcePath, **kwargs)
-            if kwargs['output_selection'] == '1':
-                targetFile = CsvReport(f'{fileName}{kwargs["suffix"]}{CsvReport.EXTENSION}', **kwargs)
-            else:
-                targetFile = HtmlReport(f'{fileName}{kwargs["suffix"]}{HtmlReport.EXTENSION}', **kwargs)
+            sourceFile = Yw7StreamFile(sourcePath, **kwargs)
+            sourceFile.ui = self.ui
+            targetFile = self._new_report(fileName, **kwargs)
             self.export_from_yw(sourceFile, targetFile)
         else:
             self.ui.set_info_how(f'{ERROR}File type of "{os.path.normpath(sourcePath)}" not supported.')
+
+    def run_reports(self, sourcePath, reports, **kwargs):
+        """Read the project once and create several reports.
+        
+        Positional arguments: 
+            sourcePath -- str: the yWriter project file path.
+            reports -- list of dict: keyword arguments per report, overriding kwargs,
+                       e.g. output_selection, suffix, scene_filter, and the show_* columns.
+        
+        Required keyword arguments:
+            The same as for run(), unless specified for each report.
+
+        Optional keyword arguments:
+            metadata_only -- bool: if True, do not keep the scene contents when reading the project.
+        
+        All reports are merged from the same parsed project. 
+        If any report fails, the error messages come first.
+        """
+        self.newFile = None
+        if not os.path.isfile(sourcePath):
+            self.ui.set_info_how(f'{ERROR}File "{os.path.normpath(sourcePath)}" not found.')
+            return
+
+        fileName, fileExtension = os.path.splitext(sourcePath)
+        if fileExtension != Yw7File.EXTENSION:
+            self.ui.set_info_how(f'{ERROR}File type of "{os.path.normpath(sourcePath)}" not supported.')
+            return
+
+        sourceFile = Yw7StreamFile(sourcePath, **kwargs)
+        sourceFile.ui = self.ui
+        targetFiles = []
+        for report in reports:
+            reportKwargs = dict(kwargs)
+            reportKwargs.update(report)
+            targetFiles.append(self._new_report(fileName, **reportKwargs))
+        targetPaths = '\n'.join(f'{targetFile.DESCRIPTION} "{os.path.normpath(targetFile.filePath)}"' for targetFile in targetFiles)
+        self.ui.set_info_what(
+            _('Input: {0} "{1}"\nOutput: {2}').format(sourceFile.DESCRIPTION, os.path.normpath(sourceFile.filePath), targetPaths))
+        message = sourceFile.read()
+        if message.startswith(ERROR):
+            self.ui.set_info_how(message)
+            return
+
+        #--- Ask for permission to overwrite before any report is written.
+        messages = []
+        confirmedFiles = []
+        for targetFile in targetFiles:
+            if os.path.isfile(targetFile.filePath) and not self._confirm_overwrite(targetFile.filePath):
+                messages.append(f'{ERROR}{_("Action canceled by user")}: "{os.path.normpath(targetFile.filePath)}".')
+            else:
+                confirmedFiles.append(targetFile)
+        writeMessages = [self._write_report(targetFile, sourceFile) for targetFile in confirmedFiles]
+        for targetFile, message in zip(confirmedFiles, writeMessages):
+            if not message.startswith(ERROR):
+                self.newFile = targetFile.filePath
+        messages.extend(writeMessages)
+        messages.sort(key=lambda message: not message.startswith(ERROR))
+        self.ui.set_info_how('\n'.join(messages))
+
+    def _new_report(self, fileName, **kwargs):
+        """Return a report file instance.
+        
+        Positional arguments: 
+            fileName -- str: the yWriter project file path without extension.
+        
+        Required keyword arguments:
+            output_selection -- str: if '1' create a CsvReport, otherwise create a HtmlReport.
+            suffix -- str: report filename suffix.
+
+        The report sends its progress to the converter's ui.
+        """
+        if kwargs['output_selection'] == '1':
+            report = CsvReport(f'{fileName}{kwargs["suffix"]}{CsvReport.EXTENSION}', **kwargs)
+        else:
+            report = HtmlReport(f'{fileName}{kwargs["suffix"]}{HtmlReport.EXTENSION}', **kwargs)
+        report.ui = self.ui
+        return report
+
+    def _write_report(self, targetFile, sourceFile):
+        """Merge the parsed project into a report file instance and write it.
+        
+        Positional arguments: 
+            targetFile -- ReportExport instance.
+            sourceFile -- Novel instance holding the parsed project.
+        
+        Return a message beginning with the ERROR constant in case of error.
+        """
+        message = targetFile.merge(sourceFile)
+        if message.startswith(ERROR):
+            return message
+
+        return targetFile.write()
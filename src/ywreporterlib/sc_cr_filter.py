@@ -4,9 +4,10 @@ Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/yw-reporter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
+from ywreporterlib.sc_index_filter import ScIndexFilter
 
 
-class ScCrFilter():
+class ScCrFilter(ScIndexFilter):
     """Filter Scene per character.
     
     Public methods:
@@ -14,33 +15,14 @@ class ScCrFilter():
     
     Strategy class, implementing filtering criteria for template-based scene export.
     """
+    _CATEGORY = 'characters'
 
     def __init__(self, crId=None):
         """Set the filter character.
         
         Positional arguments:
             crId -- str: filter character ID.
-        """       
-        self._character = crId
 
-    def accept(self, source, eId):
-        """Check whether a scene is associated with the filter character.
-        
-        Positional arguments:
-            source -- Novel instance holding the scene to check.
-            eId -- scene ID of the scene to check.       
-        
-        Return True if a source scene's character matches the filter character.
-        Return True if no filter character is set. 
-        Oherwise, return False.
-        Overrides the superclass method.
+        Extends the superclass constructor.
         """
-        if self._character is not None:
-            try:
-                if self._character in source.scenes[eId].characters:
-                    return True
-                else:
-                    return False
-            except:
-                return False
-        return True
+        super().__init__(crId)
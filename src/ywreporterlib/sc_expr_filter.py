@@ -0,0 +1,219 @@
+"""Provide a scene filter class for boolean filter expressions.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import re
+from pywriter.pywriter_globals import *
+from pywriter.model.scene import Scene
+from ywreporterlib.scene_index import SceneIndex
+
+
+class ScExprFilter():
+    """Filter Scene by a boolean expression.
+
+    Public methods:
+        accept(source, eId) -- check whether a scene matches the filter expression.
+
+    Public instance variables:
+        expression -- str: the filter expression.
+
+    Strategy class, implementing filtering criteria for template-based scene export.
+
+    A filter expression consists of terms, combined by AND, OR, NOT, and parentheses.
+    NOT binds tighter than AND, and AND binds tighter than OR.
+    A term is category:value; values containing spaces or parentheses are put in double quotes.
+    Categories:
+        tag -- scenes tagged with value.
+        viewpoint -- scenes whose viewpoint character's title is value.
+        character -- scenes associated with a character whose title is value.
+        location -- scenes associated with a location whose title is value.
+        item -- scenes associated with an item whose title is value.
+        status -- scenes with the status value, e.g. Outline, Draft, "1st Edit", "2nd Edit", Done.
+    Operators, categories, and status values are case-insensitive.
+    Example: tag:battle AND (viewpoint:Alice OR location:Castle) AND NOT status:Done
+
+    The expression is parsed once, when the filter is created.
+    On the first call for a source, it is evaluated to the set of matching scene IDs
+    by set operations on the scene index, so that each further call is a set membership test.
+    """
+    _CATEGORIES = dict(
+        tag='tags',
+        viewpoint='viewpoints',
+        character='characters',
+        location='locations',
+        item='items',
+        status='status',
+    )
+    # key: expression category, value: SceneIndex category
+    _ELEMENTS = dict(
+        viewpoints='characters',
+        characters='characters',
+        locations='locations',
+        items='items',
+    )
+    # key: SceneIndex category, value: Novel attribute holding the elements referred to by title
+    _STATUS = {status.lower(): Scene.STATUS.index(status) for status in Scene.STATUS[1:]}
+    # key: lower case status value, value: scene status
+    _OPERATORS = ('AND', 'OR', 'NOT')
+    _TOKEN = re.compile(r'\s*(?:(?P<parenthesis>[()])|(?P<category>\w+):(?:"(?P<quoted>[^"]*)"|(?P<value>[^\s()"]+))|(?P<word>[^\s()]+))')
+
+    def __init__(self, expression):
+        """Parse the filter expression.
+
+        Positional arguments:
+            expression -- str: the filter expression.
+
+        Raise ValueError if the expression is not valid.
+        """
+        self.expression = expression
+        self._tokens = self._get_tokens(expression)
+        self._position = 0
+        self._tree = self._parse_or()
+        if self._position < len(self._tokens):
+            raise ValueError(f'{_("Unexpected filter expression token")}: "{self._tokens[self._position][2]}"')
+
+        del self._tokens
+        self._source = None
+        self._sceneIds = None
+
+    def accept(self, source, eId):
+        """Check whether a scene matches the filter expression.
+
+        Positional arguments:
+            source -- Novel instance holding the scene to check.
+            eId -- scene ID of the scene to check.
+
+        Return True if the source scene matches the filter expression.
+        Oherwise, return False.
+        """
+        if source is not self._source:
+            self._sceneIds = self._evaluate(self._tree, source, SceneIndex(source))
+            self._source = source
+        return eId in self._sceneIds
+
+    def _get_tokens(self, expression):
+        """Return a list of tuples: (token type, token, token text) for the expression.
+
+        Token types are 'operator', 'parenthesis', and 'term'.
+        A term token is a tuple (SceneIndex category, value).
+        """
+        tokens = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = self._TOKEN.match(expression, position)
+            if match is None:
+                raise ValueError(f'{_("Unexpected filter expression token")}: "{expression[position:].strip()}"')
+
+            position = match.end()
+            if match.group('parenthesis'):
+                tokens.append(('parenthesis', match.group('parenthesis'), match.group('parenthesis')))
+            elif match.group('category'):
+                category = match.group('category').lower()
+                if not category in self._CATEGORIES:
+                    raise ValueError(f'{_("Unknown filter category")}: "{match.group("category")}"')
+
+                value = match.group('quoted')
+                if value is None:
+                    value = match.group('value')
+                if category == 'status':
+                    if not value.lower() in self._STATUS:
+                        raise ValueError(f'{_("Unknown scene status")}: "{value}"')
+
+                    value = self._STATUS[value.lower()]
+                tokens.append(('term', (self._CATEGORIES[category], value), match.group().strip()))
+            elif match.group('word').upper() in self._OPERATORS:
+                tokens.append(('operator', match.group('word').upper(), match.group('word')))
+            else:
+                raise ValueError(f'{_("Unexpected filter expression token")}: "{match.group("word")}"')
+
+        if not tokens:
+            raise ValueError(_('Empty filter expression'))
+
+        return tokens
+
+    def _peek(self):
+        """Return the current token type and token, or (None, None) at the end of the expression."""
+        if self._position < len(self._tokens):
+            return self._tokens[self._position][:2]
+
+        return None, None
+
+    def _parse_or(self):
+        """Return the syntax tree of a sequence of AND expressions combined by OR."""
+        operands = [self._parse_and()]
+        while self._peek() == ('operator', 'OR'):
+            self._position += 1
+            operands.append(self._parse_and())
+        if len(operands) == 1:
+            return operands[0]
+
+        return ('OR', operands)
+
+    def _parse_and(self):
+        """Return the syntax tree of a sequence of NOT expressions combined by AND."""
+        operands = [self._parse_not()]
+        while self._peek() == ('operator', 'AND'):
+            self._position += 1
+            operands.append(self._parse_not())
+        if len(operands) == 1:
+            return operands[0]
+
+        return ('AND', operands)
+
+    def _parse_not(self):
+        """Return the syntax tree of a term or a parenthesized expression, optionally negated."""
+        tokenType, token = self._peek()
+        self._position += 1
+        if (tokenType, token) == ('operator', 'NOT'):
+            return ('NOT', self._parse_not())
+
+        if tokenType == 'term':
+            return ('TERM', token)
+
+        if (tokenType, token) == ('parenthesis', '('):
+            tree = self._parse_or()
+            if self._peek() != ('parenthesis', ')'):
+                raise ValueError(_('Missing closing parenthesis in filter expression'))
+
+            self._position += 1
+            return tree
+
+        if token is None:
+            raise ValueError(_('Incomplete filter expression'))
+
+        raise ValueError(f'{_("Unexpected filter expression token")}: "{self._tokens[self._position - 1][2]}"')
+
+    def _evaluate(self, tree, source, index):
+        """Return the set of IDs of the scenes matching a syntax tree.
+
+        Positional arguments:
+            tree -- tuple: (node type, operand(s)).
+            source -- Novel instance holding the scenes.
+            index -- SceneIndex instance of the source.
+        """
+        nodeType, operand = tree
+        if nodeType == 'TERM':
+            category, value = operand
+            if not category in self._ELEMENTS:
+                return set(index.get_scenes(category, value))
+
+            elements = getattr(source, self._ELEMENTS[category])
+            sceneIds = set()
+            for elemId in elements:
+                if elements[elemId].title == value:
+                    sceneIds |= index.get_scenes(category, elemId)
+            return sceneIds
+
+        if nodeType == 'NOT':
+            return set(source.scenes).difference(self._evaluate(operand, source, index))
+
+        sceneIds = self._evaluate(operand[0], source, index)
+        for subtree in operand[1:]:
+            if nodeType == 'AND':
+                sceneIds &= self._evaluate(subtree, source, index)
+            else:
+                sceneIds |= self._evaluate(subtree, source, index)
+        return sceneIds
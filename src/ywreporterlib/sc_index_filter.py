@@ -0,0 +1,50 @@
+"""Provide an abstract scene filter class using the scene index.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from ywreporterlib.scene_index import SceneIndex
+
+
+class ScIndexFilter():
+    """Filter Scene by an index category.
+
+    Public methods:
+        accept(source, eId) -- check whether a scene refers to the filter key.
+
+    Strategy class, implementing filtering criteria for template-based scene export.
+    On the first call for a source, the filter key is resolved to the set of
+    matching scene IDs, so that each further call is a set membership test.
+    Subclasses set the index category.
+    """
+    _CATEGORY = None
+
+    def __init__(self, key=None):
+        """Set the filter key.
+
+        Positional arguments:
+            key -- str: filter tag, or ID of the filter character/location/item.
+        """
+        self._key = key
+        self._source = None
+        self._sceneIds = None
+
+    def accept(self, source, eId):
+        """Check whether a scene refers to the filter key.
+
+        Positional arguments:
+            source -- Novel instance holding the scene to check.
+            eId -- scene ID of the scene to check.
+
+        Return True if the source scene refers to the filter key.
+        Return True if no filter key is set.
+        Oherwise, return False.
+        """
+        if self._key is None:
+            return True
+
+        if source is not self._source:
+            self._sceneIds = SceneIndex(source).get_scenes(self._CATEGORY, self._key)
+            self._source = source
+        return eId in self._sceneIds
@@ -4,9 +4,10 @@ Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/yw-reporter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
+from ywreporterlib.sc_index_filter import ScIndexFilter
 
 
-class ScItFilter():
+class ScItFilter(ScIndexFilter):
     """Filter Scene per item.
     
     Public methods:
@@ -14,33 +15,14 @@ class ScItFilter():
     
     Strategy class, implementing filtering criteria for template-based scene export.
     """
+    _CATEGORY = 'items'
 
     def __init__(self, itId=None):
         """Set the filter item.
                 
         Positional arguments:
             itId -- str: filter item ID.
-        """
-        self._item = itId
 
-    def accept(self, source, eId):
-        """Check whether a scene is associated with the filter item.
-        
-        Positional arguments:
-            source -- Novel instance holding the scene to check.
-            eId -- scene ID of the scene to check.       
-        
-        Return True if a source scene's item matches the filter item.
-        Return True if no filter item is set. 
-        Oherwise, return False.
-        Overrides the superclass method.
+        Extends the superclass constructor.
         """
-        if self._item is not None:
-            try:
-                if self._item in source.scenes[eId].items:
-                    return True
-                else:
-                    return False
-            except:
-                return False
-        return True
+        super().__init__(itId)
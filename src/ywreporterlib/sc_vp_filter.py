@@ -4,9 +4,10 @@ Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/yw-reporter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
+from ywreporterlib.sc_index_filter import ScIndexFilter
 
 
-class ScVpFilter():
+class ScVpFilter(ScIndexFilter):
     """Filter Scene per viewpoint.
     
     Public methods:
@@ -14,33 +15,14 @@ class ScVpFilter():
     
     Strategy class, implementing filtering criteria for template-based scene export.
     """
+    _CATEGORY = 'viewpoints'
 
     def __init__(self, crId=None):
         """Set the filter viewpoint.
         
         Positional arguments:
             crId -- str: viewpoint character ID.
-        """
-        self._viewpoint = crId
 
-    def accept(self, source, eId):
-        """Check whether a scene's viewpoint matches the filter viewpoint.
-        
-        Positional arguments:
-            source -- Novel instance holding the scene to check.
-            eId -- scene ID of the scene to check.
-        
-        Return True if the source scene's viewpoint matches the filter viewpoint.
-        Return True if no filter viewpoint is set. 
-        Oherwise, return False.
-        Overrides the superclass method.
+        Extends the superclass constructor.
         """
-        if self._viewpoint is not None:
-            try:
-                if self._viewpoint == source.scenes[eId].characters[0]:
-                    return True
-                else:
-                    return False
-            except:
-                return False
-        return True
+        super().__init__(crId)
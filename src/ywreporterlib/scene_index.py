@@ -0,0 +1,67 @@
+"""Provide a class for inverted indexes of the scene relationships.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+
+
+class SceneIndex:
+    """Inverted indexes of the scenes' tags, viewpoints, characters, locations, items, and status.
+
+    Public methods:
+        get_scenes(category, key) -- return the set of IDs of the scenes that refer to the key.
+
+    Public instance variables:
+        tags -- dict: set of scene IDs per tag.
+        viewpoints -- dict: set of scene IDs per viewpoint character ID.
+        characters -- dict: set of scene IDs per character ID.
+        locations -- dict: set of scene IDs per location ID.
+        items -- dict: set of scene IDs per item ID.
+        status -- dict: set of scene IDs per scene status.
+
+    The indexes are built in a single pass over the scenes.
+    They are not updated when the scenes change.
+    """
+    CATEGORIES = ('tags', 'viewpoints', 'characters', 'locations', 'items', 'status')
+
+    _EMPTY = frozenset()
+
+    def __init__(self, novel):
+        """Build the indexes.
+
+        Positional arguments:
+            novel -- Novel instance holding the scenes to index.
+        """
+        self.tags = {}
+        self.viewpoints = {}
+        self.characters = {}
+        self.locations = {}
+        self.items = {}
+        self.status = {}
+        for scId, scene in novel.scenes.items():
+            if scene.tags:
+                for tag in scene.tags:
+                    self.tags.setdefault(tag, set()).add(scId)
+            if scene.characters:
+                self.viewpoints.setdefault(scene.characters[0], set()).add(scId)
+                for crId in scene.characters:
+                    self.characters.setdefault(crId, set()).add(scId)
+            if scene.locations:
+                for lcId in scene.locations:
+                    self.locations.setdefault(lcId, set()).add(scId)
+            if scene.items:
+                for itId in scene.items:
+                    self.items.setdefault(itId, set()).add(scId)
+            self.status.setdefault(scene.status, set()).add(scId)
+
+    def get_scenes(self, category, key):
+        """Return the set of IDs of the scenes that refer to the key.
+
+        Positional arguments:
+            category -- str: one of the CATEGORIES.
+            key -- str: tag, or ID of the character/location/item; int: scene status.
+
+        The returned set must not be modified.
+        """
+        return getattr(self, category).get(key, self._EMPTY)
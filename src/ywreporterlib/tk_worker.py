@@ -0,0 +1,149 @@
+"""Provide a class for running tasks in the background of a tkinter GUI.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import queue
+import threading
+from pywriter.pywriter_globals import *
+
+
+class TkWorker:
+    """Run tasks in a background thread, passing their UI calls to the Tk main loop.
+
+    Public methods:
+        start(task, onDone) -- run a task in a background thread.
+        cancel() -- ask the running task to stop.
+        is_canceled() -- return True if the running task is asked to stop.
+        in_background() -- return True if called from the worker thread.
+        call(function, *args) -- run a function in the Tk main loop and return its result.
+        post(function, *args) -- run a function in the Tk main loop without waiting for it.
+
+    Public instance variables:
+        busy -- bool: True while a task is running.
+
+    Only one task runs at a time. The worker thread must not access the Tk widgets.
+    Instead, it passes UI calls to a queue, which the Tk main loop polls with after().
+    """
+    _POLL_INTERVAL = 50
+    # Milliseconds between two queue polls while a task is running.
+
+    def __init__(self, root):
+        """Initialize instance variables.
+
+        Positional arguments:
+            root -- tk top level window.
+        """
+        self.busy = False
+        self._root = root
+        self._queue = queue.Queue()
+        self._thread = None
+        self._canceled = threading.Event()
+        self._polling = False
+
+    def start(self, task, onDone):
+        """Run a task in a background thread.
+
+        Positional arguments:
+            task -- callable without arguments, returning a message.
+            onDone -- callable, called in the Tk main loop with the task's message when the task is done.
+
+        An exception raised by the task is turned into a message beginning with the ERROR constant.
+        Return False if another task is running, otherwise return True.
+        """
+        if self.busy:
+            return False
+
+        self.busy = True
+        self._canceled.clear()
+        self._thread = threading.Thread(target=self._run, args=(task, onDone), daemon=True)
+        self._thread.start()
+        self._schedule_poll()
+        return True
+
+    def cancel(self):
+        """Ask the running task to stop."""
+        if self.busy:
+            self._canceled.set()
+
+    def is_canceled(self):
+        """Return True if the running task is asked to stop."""
+        return self._canceled.is_set()
+
+    def in_background(self):
+        """Return True if called from the worker thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def call(self, function, *args):
+        """Run a function in the Tk main loop and return its result.
+
+        Positional arguments:
+            function -- callable to be run in the Tk main loop.
+            args -- arguments passed to function.
+
+        If called from the worker thread, wait until the Tk main loop has run the function.
+        Otherwise, run the function directly.
+        """
+        if not self.in_background():
+            return function(*args)
+
+        reply = queue.Queue(maxsize=1)
+        self._queue.put((function, args, reply))
+        return reply.get()
+
+    def post(self, function, *args):
+        """Run a function in the Tk main loop without waiting for it.
+
+        Positional arguments:
+            function -- callable to be run in the Tk main loop.
+            args -- arguments passed to function.
+
+        If called from the worker thread, queue the function call and return at once.
+        Otherwise, run the function directly.
+        """
+        if not self.in_background():
+            function(*args)
+            return
+
+        self._queue.put((function, args, None))
+
+    def _run(self, task, onDone):
+        """Run the task in the worker thread, and queue the completion call."""
+        try:
+            message = task()
+        except Exception as ex:
+            message = f'{ERROR}{str(ex)}'
+        self._queue.put((self._finish, (onDone, message), None))
+
+    def _finish(self, onDone, message):
+        """Mark the task as done, and pass its message to the completion callback."""
+        self.busy = False
+        self._thread = None
+        onDone(message)
+
+    def _schedule_poll(self):
+        """Make the Tk main loop poll the queue, unless already scheduled."""
+        if not self._polling:
+            self._polling = True
+            self._root.after(self._POLL_INTERVAL, self._poll)
+
+    def _poll(self):
+        """Run the queued UI calls; continue polling while a task is running."""
+        self._polling = False
+        try:
+            while True:
+                try:
+                    function, args, reply = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                result = None
+                try:
+                    result = function(*args)
+                finally:
+                    if reply is not None:
+                        reply.put(result)
+        finally:
+            if self.busy:
+                self._schedule_poll()
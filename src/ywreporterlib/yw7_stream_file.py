@@ -0,0 +1,254 @@
+"""Provide a class for reading yWriter 7 projects in a single streaming pass.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import re
+import codecs
+import xml.etree.ElementTree as ET
+from pywriter.pywriter_globals import *
+from pywriter.yw.yw7_file import Yw7File
+from ywreporterlib.project_catalog import ProjectCatalog
+from ywreporterlib.profiler import Profiler
+
+
+class Yw7StreamFile(Yw7File):
+    """yWriter 7 project file representation for read-only access.
+
+    Public methods:
+        read() -- parse the yWriter xml file incrementally and get the instance variables.
+        write() -- refuse writing, because no xml element tree is kept.
+        get_catalog() -- return the catalog of the values the scene filters can select.
+
+    Public instance variables:
+        metadataOnly -- bool: if True, do not keep the scene contents.
+        projectCache -- ProjectCache instance, or None.
+        catalog -- ProjectCatalog instance, or None.
+
+    The xml file is fed to the parser block by block. Each section is
+    decoded as soon as the parser has finished it, and then discarded.
+    So the memory footprint does not depend on the size of the scene contents.
+    The resulting instance variables are the same as with Yw7File.read(),
+    except for the scene contents in metadata-only mode.
+    If a project cache is given, unchanged projects are read from the cache instead.
+    The progress is reported to the ui by bytes read; reading can be canceled after each block.
+    If a profiler is given, read() is measured in the stages "parse" (decoding and
+    xml parsing), "populate" (building the model), and "cache".
+    The project catalog is built when the project is parsed, and cached with it.
+    """
+    _BLOCK_SIZE = 0x10000
+    # Number of bytes fed to the parser at a time.
+
+    _SECTIONS = ('LOCATIONS', 'ITEMS', 'CHARACTERS', 'PROJECTVARS', 'PROJECTNOTES', 'SCENES', 'CHAPTERS')
+    # Containers of the elements that are discarded after decoding.
+
+    _RAW_CODE_MARKERS = ('<HTML>', '<TEX>')
+    # Scene contents starting with these markers are kept in metadata-only mode,
+    # because the exporters skip such scenes.
+
+    def __init__(self, filePath, **kwargs):
+        """Initialize instance variables.
+
+        Positional arguments:
+            filePath -- str: path to the yw7 file.
+
+        Optional keyword arguments:
+            metadata_only -- bool: if True, count words and letters, but do not keep the scene contents.
+            project_cache -- ProjectCache instance: cache for the parsed project data.
+            profiler -- Profiler instance: timing of the read stages.
+
+        Extends the superclass constructor.
+        """
+        super().__init__(filePath, **kwargs)
+        self.metadataOnly = kwargs.get('metadata_only', False)
+        self.projectCache = kwargs.get('project_cache', None)
+        self.catalog = None
+        self._profiler = kwargs.get('profiler', None) or Profiler(enabled=False)
+
+    def read(self):
+        """Parse the yWriter xml file incrementally and get the instance variables.
+
+        Return a message beginning with the ERROR constant in case of error.
+        Overrides the superclass method.
+        """
+        with self._profiler.stage('read'):
+            if self.is_locked():
+                return f'{ERROR}{_("yWriter seems to be open. Please close first")}.'
+
+            self.tree = None
+            self.idAllocator.reset()
+            # New IDs are to be allocated above the IDs read, whether parsed or loaded from the cache.
+            if self.metadataOnly:
+                cacheVariant = 'metadata'
+            else:
+                cacheVariant = 'full'
+            if self.projectCache is not None:
+                with self._profiler.stage('cache'):
+                    cached = self.projectCache.load(self, cacheVariant)
+                if cached:
+                    return 'yWriter project data read in.'
+
+            try:
+                try:
+                    complete = self._parse_file('utf-8')
+                except UnicodeError:
+                    # yw7 file may be UTF-16 encoded, with a wrong XML header (yWriter for iOS)
+                    complete = self._parse_file('utf-16')
+            except Exception as ex:
+                return f'{ERROR}{_("Can not process file")} - {str(ex)}'
+
+            if not complete:
+                return f'{ERROR}{_("Action canceled by user")}.'
+
+            with self._profiler.stage('populate'):
+                self._remove_invalid_references()
+                self.adjust_scene_types()
+                self.catalog = ProjectCatalog(self)
+            if self.projectCache is not None:
+                with self._profiler.stage('cache'):
+                    self.projectCache.store(self, cacheVariant)
+            return 'yWriter project data read in.'
+
+    def get_catalog(self):
+        """Return the catalog of the values the scene filters can select."""
+        if self.catalog is None:
+            self.catalog = ProjectCatalog(self)
+        return self.catalog
+
+    def write(self):
+        """Refuse writing, because no xml element tree is kept.
+
+        Return a message beginning with the ERROR constant.
+        Overrides the superclass method.
+        """
+        return f'{ERROR}{_("Cannot write file")}: "{os.path.normpath(self.filePath)}" (read-only).'
+
+    def _parse_file(self, encoding):
+        """Feed the xml file to a pull parser and process the elements when complete.
+
+        Positional arguments:
+            encoding -- str: encoding of the yWriter xml file.
+
+        Return False if canceled by the ui, otherwise return True.
+        """
+        self.locations = {}
+        self.srtLocations = []
+        self.items = {}
+        self.srtItems = []
+        self.characters = {}
+        self.srtCharacters = []
+        self.projectNotes = {}
+        self.srtPrjNotes = []
+        self.scenes = {}
+        self.chapters = {}
+        self.srtChapters = []
+        # This is necessary for re-reading, and for retrying with another encoding
+        # after a parsing pass has been aborted.
+
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        sections = {}
+        # key: section tag, value: section element while being parsed.
+        decoder = codecs.getincrementaldecoder(encoding)()
+        total = os.path.getsize(self.filePath)
+        count = 0
+        with open(self.filePath, 'rb') as f:
+            while True:
+                if self.ui.is_canceled():
+                    return False
+
+                with self._profiler.stage('parse'):
+                    data = f.read(self._BLOCK_SIZE)
+                    text = decoder.decode(data, final=not data)
+                    if text:
+                        parser.feed(re.sub('[\x00-\x08|\x0b-\x0c|\x0e-\x1f]', '', text))
+                with self._profiler.stage('populate'):
+                    self._process_events(parser, sections)
+                if not data:
+                    break
+
+                count += len(data)
+                self.ui.set_progress(_('Reading project'), count, total)
+        with self._profiler.stage('parse'):
+            parser.close()
+        with self._profiler.stage('populate'):
+            self._process_events(parser, sections)
+        return True
+
+    def _process_events(self, parser, sections):
+        """Decode the elements completed by the parser, and discard them.
+
+        Positional arguments:
+            parser -- XMLPullParser instance.
+            sections -- dict: section elements being parsed (to be updated).
+        """
+        for event, element in parser.read_events():
+            tag = element.tag
+            if event == 'start':
+                if tag in self._SECTIONS:
+                    sections[tag] = element
+                continue
+
+            if tag == 'SCENE':
+                self._read_scene(element)
+                self._discard(element, sections.get('SCENES', None))
+            elif tag == 'CHAPTER':
+                self._read_chapter(element)
+                self._discard(element, sections.get('CHAPTERS', None))
+            elif tag == 'PROJECT':
+                self._read_project(element)
+                element.clear()
+            elif tag == 'LOCATIONS':
+                self._read_locations(element)
+                element.clear()
+            elif tag == 'ITEMS':
+                self._read_items(element)
+                element.clear()
+            elif tag == 'CHARACTERS':
+                self._read_characters(element)
+                element.clear()
+            elif tag == 'PROJECTVARS':
+                self._read_projectvars(element)
+                element.clear()
+            elif tag == 'PROJECTNOTES':
+                self._read_projectnotes(element)
+                element.clear()
+
+    def _read_scene(self, scn):
+        """Read attributes at scene level from the xml element tree.
+
+        Positional arguments:
+            scn -- xml element: a <SCENE> subtree.
+
+        In metadata-only mode, get word count and letter count from the
+        scene content, but do not keep the text in the Scene instance.
+        Extends the superclass method.
+        """
+        if not self.metadataOnly:
+            super()._read_scene(scn)
+            return
+
+        xmlContent = scn.find('SceneContent')
+        if xmlContent is not None:
+            scn.remove(xmlContent)
+        super()._read_scene(scn)
+        if xmlContent is None or xmlContent.text is None:
+            return
+
+        scId = scn.find('ID').text
+        if xmlContent.text.startswith(self._RAW_CODE_MARKERS):
+            self.scenes[scId].sceneContent = xmlContent.text
+        else:
+            self.scenes[scId].update_counts(xmlContent.text)
+
+    def _discard(self, element, parent):
+        """Remove a decoded element from the partial tree.
+
+        Positional arguments:
+            element -- xml element to discard.
+            parent -- xml element: the element's parent, if known.
+        """
+        element.clear()
+        if parent is not None:
+            parent.remove(element)
@@ -4,9 +4,11 @@ Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/yw-reporter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
+import os
 import webbrowser
 import tkinter as tk
 from tkinter import ttk
+from pywriter.pywriter_globals import *
 from pywriter.file.filter import Filter
 from pywriter.ui.main_tk import MainTk
 from ywreporterlib.sc_tg_filter import ScTgFilter
@@ -14,15 +16,29 @@ from ywreporterlib.sc_vp_filter import ScVpFilter
 from ywreporterlib.sc_cr_filter import ScCrFilter
 from ywreporterlib.sc_lc_filter import ScLcFilter
 from ywreporterlib.sc_it_filter import ScItFilter
+from ywreporterlib.sc_expr_filter import ScExprFilter
 from ywreporterlib.html_report import HtmlReport
+from ywreporterlib.yw7_stream_file import Yw7StreamFile
+from ywreporterlib.tk_worker import TkWorker
 
 
 class YwReporterTk(MainTk):
     """A tkinter GUI class for yWriter report generation.    
 
     Public methods:
-        open_project(fileName) -- create a yWriter project instance and read the file. 
+        open_project(fileName) -- create a yWriter project instance and read the file in the background.
+        convert_file() -- create a report in the background.
+        cancel_task() -- ask the background task to stop.
+        show_progress(message) -- put a progress message on the status bar.
+        set_progress(message, count, total) -- show how far the background task has got.
+        cancel() -- ask the background task to stop.
+        is_canceled() -- return True if the background task is asked to stop.
+
+    Reading the project and creating the report are done by a worker thread,
+    so that the GUI stays responsive. The message methods can be called
+    from the worker thread; they are passed to the Tk main loop.
     """
+    _YW_CLASS = Yw7StreamFile
 
     def __init__(self, title, **kwargs):
         """Put a text box to the GUI main window.
@@ -47,6 +63,7 @@ class YwReporterTk(MainTk):
             show_description -- bool: if True, include "Description" column.
             show_viewpoint -- bool: if True, include "Viewpoint" column.
             show_tags -- bool: if True, include "Tags" column.
+            show_languages -- bool: if True, include "Languages" column.
             show_notes -- bool: if True, include "Notes" column.
             show_date -- bool: if True, include "Date" column.
             show_time -- bool: if True, include "Time" column.
@@ -61,9 +78,16 @@ class YwReporterTk(MainTk):
             show_locations -- bool: if True, include "Locations" column.
             show_items -- bool: if True, include "Items" column.
 
+        Optional keyword arguments:
+            metadata_only -- bool: if True, do not keep the scene contents when reading the project.
+            scene_filter -- ScExprFilter instance: filter expression to be preset.
+
         Extends the superclass constructor.
         """
         super().__init__(title, **kwargs)
+        self._worker = TkWorker(self.root)
+        self._progress = None
+        # Last progress shown: (message, percentage).
         self.converter = None
         self._tagList = []
         self._viewpointTitles = []
@@ -75,6 +99,9 @@ class YwReporterTk(MainTk):
         self._itemTitles = []
         self._itemList = []
         self._filterCat = []
+        self._filterExpression = ''
+        if isinstance(kwargs.get('scene_filter', None), ScExprFilter):
+            self._filterExpression = kwargs['scene_filter'].expression
 
         #--- Row 1: "Levels" checkboxes (chapters, scenes)
         row1Cnt = 1
@@ -151,6 +178,10 @@ class YwReporterTk(MainTk):
             self.mainWindow, text='Item', variable=self._filterCatSelection, value=5, command=lambda: self._set_filter_category(5))
         itemsCheckbox.grid(row=row2Cnt, column=2, sticky=tk.W, padx=20)
         row2Cnt += 1
+        expressionCheckbox = ttk.Radiobutton(
+            self.mainWindow, text='Expression', variable=self._filterCatSelection, value=6, command=lambda: self._set_filter_category(6))
+        expressionCheckbox.grid(row=row2Cnt, column=2, sticky=tk.W, padx=20)
+        row2Cnt += 1
         self._filterCombobox = ttk.Combobox(self.mainWindow, values=[])
         self._filterCombobox.grid(row=row2Cnt, column=2, sticky=tk.W, padx=20)
 
@@ -201,6 +232,11 @@ class YwReporterTk(MainTk):
                                            variable=self._showTags, onvalue=True, offvalue=False)
         showTagsCheckbox.grid(row=row3Cnt, column=3, sticky=tk.W, padx=20)
         row3Cnt += 1
+        self._showLanguages = tk.BooleanVar(value=kwargs['show_languages'])
+        showLanguagesCheckbox = ttk.Checkbutton(
+            self.mainWindow, text='Languages', variable=self._showLanguages, onvalue=True, offvalue=False)
+        showLanguagesCheckbox.grid(row=row3Cnt, column=3, sticky=tk.W, padx=20)
+        row3Cnt += 1
         self._showNotes = tk.BooleanVar(value=kwargs['show_notes'])
         showNotesCheckbox = ttk.Checkbutton(
             self.mainWindow, text='Notes', variable=self._showNotes, onvalue=True, offvalue=False)
@@ -274,6 +310,8 @@ class YwReporterTk(MainTk):
         super()._build_main_menu()
         self.mainMenu.add_command(label='Create report', command=self.convert_file)
         self.mainMenu.entryconfig('Create report', state='disabled')
+        self.mainMenu.add_command(label='Cancel', command=self.cancel_task)
+        self.mainMenu.entryconfig('Cancel', state='disabled')
 
     def disable_menu(self):
         """Disable menu entries when no project is open.
@@ -290,56 +328,76 @@ class YwReporterTk(MainTk):
         self.mainMenu.entryconfig('Create report', state='normal')
 
     def open_project(self, fileName):
-        """Create a yWriter project instance and read the file.
+        """Create a yWriter project instance and read the file in the background.
         
-        Display project title, description and status.
-        Return True on success, otherwise return False.
-        Extends the superclass method.
+        Positional arguments:
+            fileName -- str: project file path.
+            
+        When the file is read, display project title and file path, 
+        and build the filter selector lists.
+        Return True if reading has started, otherwise return False.
+        Overrides the superclass method.
         """
-        if not super().open_project(fileName):
+        if self._worker.busy:
             return False
 
+        self.show_status(self._statusText)
+        fileName = self.select_project(fileName)
+        if not fileName:
+            return False
+
+        if self.ywPrj is not None:
+            self.close_project()
+        self.kwargs['yw_last_open'] = fileName
+        self._progress = None
+        ywPrj = self._YW_CLASS(fileName, **self.kwargs)
+        ywPrj.ui = self
+        self._lock_menu()
+        self.show_progress(f'{_("Reading")} "{os.path.normpath(fileName)}" ...')
+        self._worker.start(ywPrj.read, lambda message: self._on_project_read(ywPrj, message))
+        return True
+
+    def _on_project_read(self, ywPrj, message):
+        """Take over the project read in the background, unless reading failed or was canceled.
+        
+        Positional arguments:
+            ywPrj -- yWriter project instance.
+            message -- str: message returned by the project's read() method.
+        """
+        if self._worker.is_canceled():
+            message = f'{ERROR}{_("Action canceled by user")}.'
+        if message.startswith(ERROR):
+            self._unlock_menu()
+            self.set_info_how(message)
+            return
+
+        self.ywPrj = ywPrj
+        self.show_status(self._statusText)
+        self.show_path(f'{os.path.normpath(self.ywPrj.filePath)}')
+        self.set_title()
+        self._unlock_menu()
+
         # -- Build filter selector lists.
-        self._tagList = []
-        self._viewpointList = []
-        self._viewpointTitles = []
-        self._characterList = []
-        self._characterTitles = []
-        self._locationList = []
-        self._locationTitles = []
-        self._itemList = []
-        self._itemTitles = []
-        for chId in self.ywPrj.srtChapters:
-            for scId in self.ywPrj.chapters[chId].srtScenes:
-                if self.ywPrj.scenes[scId].tags:
-                    for tag in self.ywPrj.scenes[scId].tags:
-                        if not tag in self._tagList:
-                            self._tagList.append(tag)
-                if self.ywPrj.scenes[scId].characters:
-                    vpId = self.ywPrj.scenes[scId].characters[0]
-                    if not vpId in self._viewpointList:
-                        self._viewpointList.append(vpId)
-                        self._viewpointTitles.append(self.ywPrj.characters[vpId].title)
-                    for crId in self.ywPrj.scenes[scId].characters:
-                        if not crId in self._characterList:
-                            self._characterList.append(crId)
-                            self._characterTitles.append(self.ywPrj.characters[crId].title)
-                if self.ywPrj.scenes[scId].locations:
-                    for lcId in self.ywPrj.scenes[scId].locations:
-                        if not lcId in self._locationList:
-                            self._locationList.append(lcId)
-                            self._locationTitles.append(self.ywPrj.locations[lcId].title)
-                if self.ywPrj.scenes[scId].items:
-                    for itId in self.ywPrj.scenes[scId].items:
-                        if not itId in self._itemList:
-                            self._itemList.append(itId)
-                            self._itemTitles.append(self.ywPrj.items[itId].title)
+        catalog = self.ywPrj.get_catalog()
+        self._tagList = list(catalog.tags)
+        self._viewpointList = list(catalog.viewpoints)
+        self._viewpointTitles = list(catalog.viewpoints.values())
+        self._characterList = list(catalog.characters)
+        self._characterTitles = list(catalog.characters.values())
+        self._locationList = list(catalog.locations)
+        self._locationTitles = list(catalog.locations.values())
+        self._itemList = list(catalog.items)
+        self._itemTitles = list(catalog.items.values())
 
         # Initialize the filter category selection widgets.
-        self._filterCat = [[], self._tagList, self._viewpointTitles, self._characterTitles, self._locationTitles, self._itemTitles]
-        self._set_filter_category(0)
-        self._filterCatSelection.set(0)
-        return True
+        self._filterCat = [[], self._tagList, self._viewpointTitles, self._characterTitles, self._locationTitles, self._itemTitles,
+                           [self._filterExpression]]
+        if self._filterExpression:
+            self._set_filter_category(6)
+            self._filterCatSelection.set(6)
+        else:
+            self._set_filter_category(0)
+            self._filterCatSelection.set(0)
 
     def close_project(self, event=None):
         """Clear the text box.
@@ -347,7 +405,7 @@ class YwReporterTk(MainTk):
         Extends the superclass method.
         """
         super().close_project()
-        self._filterCat = [[], [], [], [], [], []]
+        self._filterCat = [[], [], [], [], [], [], []]
         self._filterCombobox['values'] = []
         self._set_filter_category(0)
         self._filterCatSelection.set(0)
@@ -362,7 +420,10 @@ class YwReporterTk(MainTk):
             self._filterCombobox.set('')
 
     def convert_file(self):
-        """Call the converter's conversion method, if a source file is selected."""
+        """Create a report in the background, if a source file is selected."""
+        if self._worker.busy:
+            return
+
         self.show_status('')
 
         # Filter options.
@@ -380,6 +441,15 @@ class YwReporterTk(MainTk):
             sceneFilter = ScLcFilter(self._locationList[option])
         elif filterCat == 5:
             sceneFilter = ScItFilter(self._itemList[option])
+        elif filterCat == 6:
+            try:
+                sceneFilter = ScExprFilter(self._filterCombobox.get())
+            except ValueError as ex:
+                self.set_info_how(f'{ERROR}{str(ex)}')
+                return
+
+            self._filterExpression = sceneFilter.expression
+            self._filterCat[6] = [self._filterExpression]
         self.kwargs['yw_last_open'] = self.ywPrj.filePath
         self.kwargs['output_selection'] = str(self._outputSelection.get())
         self.kwargs['suffix'] = HtmlReport.SUFFIX
@@ -397,6 +467,7 @@ class YwReporterTk(MainTk):
         self.kwargs['show_description'] = self._showDescription.get()
         self.kwargs['show_viewpoint'] = self._showViewpoint.get()
         self.kwargs['show_tags'] = self._showTags.get()
+        self.kwargs['show_languages'] = self._showLanguages.get()
         self.kwargs['show_notes'] = self._showNotes.get()
         self.kwargs['show_date'] = self._showDate.get()
         self.kwargs['show_time'] = self._showTime.get()
@@ -410,6 +481,146 @@ class YwReporterTk(MainTk):
         self.kwargs['show_characters'] = self._showCharacters.get()
         self.kwargs['show_locations'] = self._showLocations.get()
         self.kwargs['show_items'] = self._showItems.get()
-        self.converter.run(self.ywPrj.filePath, **self.kwargs)
+        kwargs = dict(self.kwargs)
+        sourcePath = self.ywPrj.filePath
+        self._lock_menu()
+        self._progress = None
+        self.show_progress(_('Creating report ...'))
+        self._worker.start(lambda: self._create_report(sourcePath, kwargs), self._on_report_created)
+
+    def _create_report(self, sourcePath, kwargs):
+        """Run the converter; to be called by the worker thread.
+        
+        Return the converter's message.
+        """
+        self.infoHowText = ''
+        self.converter.run(sourcePath, **kwargs)
+        return self.infoHowText
+
+    def _on_report_created(self, message):
+        """Show the new report, if any.
+        
+        Positional arguments:
+            message -- str: the converter's message.
+        """
+        self._unlock_menu()
         if self.converter.newFile is not None:
             webbrowser.open(self.converter.newFile)
+
+    def cancel_task(self):
+        """Ask the background task to stop, and tell the user."""
+        self.cancel()
+        self.show_progress(_('Canceling ...'))
+
+    def cancel(self):
+        """Ask the background task to stop.
+        
+        Overrides the superclass method.
+        """
+        self._worker.cancel()
+
+    def is_canceled(self):
+        """Return True if the background task is asked to stop.
+        
+        Can be called from the worker thread.
+        Overrides the superclass method.
+        """
+        return self._worker.is_canceled()
+
+    def set_progress(self, message, count, total):
+        """Show how far the background task has got, as a percentage on the status bar.
+        
+        Positional arguments:
+            message -- str: what the background task is doing.
+            count -- int: number of elements processed.
+            total -- int: number of elements to be processed.
+        
+        The status bar is updated only when the percentage changes,  
+        and the worker thread does not wait for the update.
+        Overrides the superclass method.
+        """
+        if self._worker.is_canceled():
+            return
+
+        if total:
+            progress = (message, count * 100 // total)
+        else:
+            progress = (message, 100)
+        if progress != self._progress:
+            self._progress = progress
+            self._worker.post(self._show_progress, f'{message} ... {progress[1]}%')
+
+    def _lock_menu(self):
+        """Disable the menu entries that would interfere with a background task."""
+        self.fileMenu.entryconfig(_('Open...'), state='disabled')
+        self.disable_menu()
+        self.mainMenu.entryconfig('Cancel', state='normal')
+
+    def _unlock_menu(self):
+        """Enable the menu entries after a background task."""
+        self.mainMenu.entryconfig('Cancel', state='disabled')
+        self.fileMenu.entryconfig(_('Open...'), state='normal')
+        if self.ywPrj is not None:
+            self.enable_menu()
+
+    def show_progress(self, message):
+        """Put a progress message on the status bar.
+        
+        Positional arguments:
+            message -- str: message to be displayed. 
+            
+        Unlike show_status(), this does not change the status to be restored.
+        Can be called from the worker thread.
+        """
+        self._worker.call(self._show_progress, message)
+
+    def _show_progress(self, message):
+        self.statusBar.config(bg=self.root.cget('background'))
+        self.statusBar.config(fg='black')
+        self.statusBar.config(text=message)
+
+    def ask_yes_no(self, text):
+        """Query yes or no with a pop-up box.
+        
+        Positional arguments:
+            text -- question to be asked in the pop-up box. 
+            
+        Can be called from the worker thread.
+        Extends the superclass method.
+        """
+        return self._worker.call(super().ask_yes_no, text)
+
+    def set_info_how(self, message):
+        """Show how the converter is doing.
+        
+        Positional arguments:
+            message -- message to be displayed. 
+            
+        Can be called from the worker thread.
+        Extends the superclass method.
+        """
+        self._worker.call(super().set_info_how, message)
+
+    def show_status(self, message):
+        """Put text on the status bar.
+        
+        Can be called from the worker thread.
+        Extends the superclass method.
+        """
+        self._worker.call(super().show_status, message)
+
+    def show_warning(self, message):
+        """Display a warning message box.
+        
+        Can be called from the worker thread.
+        Extends the superclass method.
+        """
+        self._worker.call(super().show_warning, message)
+
+    def on_quit(self, event=None):
+        """Stop the background task, if any, and save keyword arguments before exiting the program.
+        
+        Extends the superclass method.
+        """
+        self._worker.cancel()
+        super().on_quit(event)
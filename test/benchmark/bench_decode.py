@@ -0,0 +1,77 @@
+"""Microbenchmark: decoding cost per scene and per chapter element of a yWriter project.
+
+Usage: python bench_decode.py [--scenes N] [--words N] [--repeat N]
+
+The project is generated by yw7_generator.py, and kept in the temp directory.
+The xml file is parsed once; then the time for converting the <SCENE> and
+<CHAPTER> elements into Scene and Chapter instances is measured.
+Parsing the xml and reading the other sections are not included.
+The scenes are measured a second time without their <SceneContent> elements,
+because counting the words of the scene contents takes a large share of the time.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import xml.etree.ElementTree as ET
+
+BENCHMARK_PATH = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_PATH, '..', '..', 'src'))
+from pywriter.yw.yw7_file import Yw7File
+from yw7_generator import generate_project
+
+
+def get_project(scenes, words):
+    """Return the path of the generated project; generate it if missing."""
+    directory = os.path.join(tempfile.gettempdir(), 'yw-reporter-benchmark')
+    os.makedirs(directory, exist_ok=True)
+    filePath = os.path.join(directory, f'decode-{scenes}-{words}.yw7')
+    if not os.path.isfile(filePath):
+        generate_project(filePath, scenes=scenes, words=words)
+    return filePath
+
+
+def measure(xmlElements, decode, repeat):
+    """Return the minimum time in seconds for decoding all xml elements.
+
+    Positional arguments:
+        xmlElements -- list of xml elements.
+        decode -- function(novel, xmlElement) decoding an element into a Yw7File instance.
+        repeat -- int: number of runs.
+    """
+    times = []
+    for __ in range(repeat):
+        novel = Yw7File('')
+        novel.srtChapters = []
+        start = time.perf_counter()
+        for xmlElement in xmlElements:
+            decode(novel, xmlElement)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='yWriter element decoding microbenchmark')
+    parser.add_argument('--scenes', type=int, default=20000, help='number of scenes of the generated project')
+    parser.add_argument('--words', type=int, default=100, help='number of words per scene')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs')
+    args = parser.parse_args()
+    root = ET.parse(get_project(args.scenes, args.words)).getroot()
+    xmlScenes = root.findall('SCENES/SCENE')
+    xmlChapters = root.findall('CHAPTERS/CHAPTER')
+    results = [('scenes', len(xmlScenes), measure(xmlScenes, Yw7File._read_scene, args.repeat)),
+               ('chapters', len(xmlChapters), measure(xmlChapters, Yw7File._read_chapter, args.repeat))]
+    for scn in xmlScenes:
+        scn.remove(scn.find('SceneContent'))
+    results.insert(1, ('scenes w/o content', len(xmlScenes), measure(xmlScenes, Yw7File._read_scene, args.repeat)))
+    for name, count, seconds in results:
+        print(f'{count:6} {name:20} {seconds:8.4f} s {seconds / count * 1e6:8.2f} us each')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Memory benchmark: memory held by the project model after reading yWriter projects.
+
+Usage: python bench_memory.py [--scale NAME ...]
+
+The projects are generated by yw7_generator.py, and kept in the temp directory.
+For each reader class, the memory retained after reading (the model), and the
+peak memory while reading are measured with tracemalloc. In addition, the size
+of a single scene, chapter, and character instance is shown, not counting the
+strings and lists they refer to.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import sys
+import gc
+import argparse
+import tracemalloc
+
+from bench_suite import get_project
+from pywriter.yw.yw7_file import Yw7File
+from ywreporterlib.yw7_stream_file import Yw7StreamFile
+from yw7_generator import SCALES
+
+READERS = (Yw7File, Yw7StreamFile)
+
+
+def get_instance_size(element):
+    """Return the size of an element instance in bytes, including its attribute dictionary, if any."""
+    size = sys.getsizeof(element)
+    if hasattr(element, '__dict__'):
+        size += sys.getsizeof(element.__dict__)
+    return size
+
+
+def measure(readerClass, sourcePath):
+    """Return the retained and the peak memory in bytes, and the project read."""
+    gc.collect()
+    tracemalloc.start()
+    novel = readerClass(sourcePath)
+    message = novel.read()
+    if message.startswith('!'):
+        sys.exit(message)
+
+    novel.tree = None
+    # The xml tree is not part of the model.
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained, peak, novel
+
+
+def main():
+    parser = argparse.ArgumentParser(description='yWriter reporter memory benchmark')
+    parser.add_argument('--scale', nargs='+', choices=SCALES.keys(), default=['small', 'medium'],
+                        help='project scales to be benchmarked')
+    args = parser.parse_args()
+    print(f'{"benchmark":28} {"retained [MiB]":>15} {"peak [MiB]":>11} {"scene [B]":>10} {"chapter [B]":>12} '
+          f'{"character [B]":>14}')
+    for scale in args.scale:
+        sourcePath = get_project(scale)
+        for readerClass in READERS:
+            retained, peak, novel = measure(readerClass, sourcePath)
+            scene = next(iter(novel.scenes.values()))
+            chapter = next(iter(novel.chapters.values()))
+            character = next(iter(novel.characters.values()))
+            key = f'{scale}/{readerClass.__name__}'
+            print(f'{key:28} {retained / 0x100000:>15.1f} {peak / 0x100000:>11.1f} '
+                  f'{get_instance_size(scene):>10} {get_instance_size(chapter):>12} '
+                  f'{get_instance_size(character):>14}')
+            del novel
+
+
+if __name__ == '__main__':
+    main()
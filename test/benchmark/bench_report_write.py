@@ -0,0 +1,162 @@
+"""Benchmark the report generation: legacy FileExport methods vs. current.
+
+Usage: python bench_report_write.py [--scenes N] [--repeat N]
+
+The legacy reports create a string.Template instance and a full scene mapping per row,
+and build the whole report text before writing it.
+The reports are generated from a synthetic novel held in memory,
+so that the measurement does not include reading the project file.
+The peak memory is the maximum allocated while writing the report file.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from string import Template
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+from pywriter.file.filter import Filter
+from pywriter.file.file_export import FileExport
+from pywriter.model.novel import Novel
+from pywriter.model.chapter import Chapter
+from pywriter.model.scene import Scene
+from pywriter.model.character import Character
+from ywreporterlib.html_report import HtmlReport
+from ywreporterlib.csv_report import CsvReport
+
+SCENES_PER_CHAPTER = 10
+DEFAULT_COLUMNS = ('show_title', 'show_description')
+ALL_COLUMNS = ('show_uid', 'show_number', 'show_title', 'show_description', 'show_viewpoint', 'show_tags',
+               'show_languages', 'show_notes', 'show_date', 'show_time', 'show_duration', 'show_action_pattern',
+               'show_ratings', 'show_words_total', 'show_wordcount', 'show_lettercount', 'show_status',
+               'show_characters', 'show_locations', 'show_items')
+TYPES = ('show_chapters', 'show_scenes', 'show_normal_type', 'show_unused_type', 'show_notes_type',
+         'show_todo_type', 'show_unexported')
+
+
+class LegacyHtmlReport(HtmlReport):
+    """HTML report using the legacy FileExport methods."""
+    write = FileExport.write
+    _get_text = FileExport._get_text
+
+    def _compile_templates(self):
+        pass
+
+    def _get_template(self, text):
+        return Template(text)
+
+
+class LegacyCsvReport(CsvReport):
+    """CSV report using the legacy FileExport methods."""
+    write = FileExport.write
+    _get_text = FileExport._get_text
+
+    def _compile_templates(self):
+        pass
+
+    def _get_template(self, text):
+        return Template(text)
+
+
+def build_novel(scenes):
+    """Return a Novel instance with the given number of scenes."""
+    novel = Novel('synthetic.yw7')
+    novel.title = 'Synthetic novel'
+    novel.authorName = 'Benchmark'
+    for i in range(1, 11):
+        crId = str(i)
+        novel.characters[crId] = Character()
+        novel.characters[crId].title = f'Character {i}'
+        novel.srtCharacters.append(crId)
+    for i in range(scenes):
+        scId = str(i + 1)
+        if i % SCENES_PER_CHAPTER == 0:
+            chId = str(len(novel.srtChapters) + 1)
+            novel.chapters[chId] = Chapter()
+            novel.chapters[chId].title = f'Chapter {chId}'
+            novel.chapters[chId].desc = f'Description of chapter {chId}.'
+            novel.chapters[chId].chLevel = 0
+            novel.chapters[chId].chType = 0
+            novel.chapters[chId].srtScenes = []
+            novel.srtChapters.append(chId)
+        scene = Scene()
+        scene.title = f'Scene {scId}'
+        scene.desc = f'Description of scene {scId}, with "quotes".'
+        scene.notes = f'Notes on scene {scId}.'
+        scene.tags = [f'tag{i % 7}', f'tag{i % 5}']
+        scene.characters = [str(i % 10 + 1), str((i + 3) % 10 + 1)]
+        scene.locations = []
+        scene.items = []
+        scene.status = i % 5 + 1
+        scene.scType = 0
+        scene.goal = 'Goal'
+        scene.conflict = 'Conflict'
+        scene.outcome = 'Outcome'
+        scene.field1 = scene.field2 = scene.field3 = scene.field4 = '1'
+        scene.sceneContent = 'Lorem ipsum dolor sit amet. ' * 20
+        novel.scenes[scId] = scene
+        novel.chapters[chId].srtScenes.append(scId)
+    return novel
+
+
+def create_report(reportClass, novel, columns, directory):
+    """Return a report instance for novel, showing the given columns."""
+    kwargs = {option: False for option in ALL_COLUMNS}
+    kwargs.update({option: True for option in columns + TYPES})
+    kwargs['scene_filter'] = Filter()
+    report = reportClass(os.path.join(directory, f'synthetic_report{reportClass.EXTENSION}'), **kwargs)
+    report.merge(novel)
+    return report
+
+
+def measure(reportClass, novel, columns, repeat):
+    """Return the best wall time of writing the report, the peak memory in KiB, and the report text."""
+    best = None
+    with tempfile.TemporaryDirectory() as directory:
+        for __ in range(repeat):
+            report = create_report(reportClass, novel, columns, directory)
+            start = time.perf_counter()
+            message = report.write()
+            wall = time.perf_counter() - start
+            if best is None or wall < best:
+                best = wall
+        if message.startswith('!'):
+            sys.exit(message)
+
+        with open(report.filePath, encoding='utf-8') as f:
+            text = f.read()
+        report = create_report(reportClass, novel, columns, directory)
+        tracemalloc.start()
+        report.write()
+        __, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak // 1024, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description='yWriter report template benchmark')
+    parser.add_argument('--scenes', type=int, default=50000, help='number of scenes of the synthetic novel')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per report')
+    args = parser.parse_args()
+    novel = build_novel(args.scenes)
+    print(f'{args.scenes} scenes, {len(novel.srtChapters)} chapters')
+    print(f'{"report":8} {"columns":8} {"legacy [s]":>12} {"current [s]":>12} {"speed-up":>10}'
+          f' {"legacy peak [KiB]":>18} {"current peak [KiB]":>19}')
+    for columnsName, columns in (('default', DEFAULT_COLUMNS), ('all', ALL_COLUMNS)):
+        for name, legacyClass, reportClass in (('html', LegacyHtmlReport, HtmlReport), ('csv', LegacyCsvReport, CsvReport)):
+            legacyWall, legacyPeak, legacyText = measure(legacyClass, novel, columns, args.repeat)
+            wall, peak, text = measure(reportClass, novel, columns, args.repeat)
+            if text != legacyText:
+                sys.exit(f'{name}: Output differs.')
+            print(f'{name:8} {columnsName:8} {legacyWall:>12.3f} {wall:>12.3f} {legacyWall / wall:>9.2f}x'
+                  f' {legacyPeak:>18} {peak:>19}')
+
+
+if __name__ == '__main__':
+    main()
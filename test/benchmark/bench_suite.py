@@ -0,0 +1,180 @@
+"""Benchmark suite: read and write yWriter projects, and write reports, at several scales.
+
+Usage: python bench_suite.py [--scale NAME ...] [--repeat N] [--save NAME] [--compare NAME] [--tolerance F]
+
+The projects are generated by yw7_generator.py, and kept in the temp directory.
+Each benchmark runs repeat times; the minimum wall time is compared with the
+stored baseline. A benchmark slower than the baseline by more than the tolerance
+is reported as a regression, and the exit code is 1.
+The baselines are machine dependent; save a new one after changing the machine.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+
+BENCHMARK_PATH = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_PATH, '..', '..', 'src'))
+from pywriter.file.filter import Filter
+from pywriter.yw.yw7_file import Yw7File
+from ywreporterlib.html_report import HtmlReport
+from ywreporterlib.csv_report import CsvReport
+from yw7_generator import SCALES
+from yw7_generator import generate_project
+
+BASELINE_PATH = os.path.join(BENCHMARK_PATH, 'baselines')
+REPORT_OPTIONS = ('show_chapters', 'show_scenes', 'show_normal_type', 'show_unused_type', 'show_notes_type',
+                  'show_todo_type', 'show_unexported', 'show_uid', 'show_number', 'show_title', 'show_description',
+                  'show_viewpoint', 'show_tags', 'show_languages', 'show_notes', 'show_date', 'show_time',
+                  'show_duration', 'show_action_pattern', 'show_ratings', 'show_words_total', 'show_wordcount',
+                  'show_lettercount', 'show_status', 'show_characters', 'show_locations', 'show_items')
+
+
+def get_project(scale):
+    """Return the path of the generated project for a scale; generate it if missing."""
+    directory = os.path.join(tempfile.gettempdir(), 'yw-reporter-benchmark')
+    os.makedirs(directory, exist_ok=True)
+    settings = SCALES[scale]
+    filePath = os.path.join(directory, f'{scale}-{settings["scenes"]}-{settings["words"]}.yw7')
+    if not os.path.isfile(filePath):
+        generate_project(filePath, **settings)
+    return filePath
+
+
+def read_project(sourcePath):
+    """Return a Yw7File instance with the project read in."""
+    novel = Yw7File(sourcePath)
+    message = novel.read()
+    if message.startswith('!'):
+        sys.exit(message)
+
+    return novel
+
+
+def setup_yw7_read(sourcePath, directory):
+    novel = Yw7File(sourcePath)
+    return novel.read
+
+
+def setup_yw7_write(sourcePath, directory):
+    targetPath = os.path.join(directory, 'project.yw7')
+    shutil.copyfile(sourcePath, targetPath)
+    novel = read_project(targetPath)
+    return novel.write
+
+
+def setup_yw7_merge(sourcePath, directory):
+    targetPath = os.path.join(directory, 'project.yw7')
+    shutil.copyfile(sourcePath, targetPath)
+    novel = read_project(targetPath)
+    source = read_project(sourcePath)
+    return lambda: novel.merge(source)
+
+
+def setup_report_write(reportClass, sourcePath, directory):
+    kwargs = {option: True for option in REPORT_OPTIONS}
+    kwargs['scene_filter'] = Filter()
+    report = reportClass(os.path.join(directory, f'project{reportClass.SUFFIX}{reportClass.EXTENSION}'), **kwargs)
+    message = report.merge(read_project(sourcePath))
+    if message.startswith('!'):
+        sys.exit(message)
+
+    return report.write
+
+
+BENCHMARKS = dict(
+    yw7_read=setup_yw7_read,
+    yw7_write=setup_yw7_write,
+    yw7_merge=setup_yw7_merge,
+    html_write=lambda sourcePath, directory: setup_report_write(HtmlReport, sourcePath, directory),
+    csv_write=lambda sourcePath, directory: setup_report_write(CsvReport, sourcePath, directory),
+)
+# key: benchmark name, value: setup function returning the callable to be measured.
+
+
+def measure(setup, sourcePath, repeat):
+    """Return the wall times in seconds of repeat runs; each run has its own setup."""
+    times = []
+    with tempfile.TemporaryDirectory() as directory:
+        for __ in range(repeat):
+            function = setup(sourcePath, directory)
+            start = time.perf_counter()
+            message = function()
+            times.append(time.perf_counter() - start)
+            if message.startswith('!'):
+                sys.exit(message)
+
+    return times
+
+
+def load_baseline(name):
+    """Return the results of a stored baseline, or None if there is none."""
+    try:
+        with open(os.path.join(BASELINE_PATH, f'{name}.json'), encoding='utf-8') as f:
+            return json.load(f)['results']
+
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(name, results):
+    """Store the results as a baseline."""
+    os.makedirs(BASELINE_PATH, exist_ok=True)
+    data = dict(
+        python=platform.python_version(),
+        platform=f'{platform.system()} {platform.machine()}',
+        results=results,
+    )
+    with open(os.path.join(BASELINE_PATH, f'{name}.json'), 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='yWriter reporter benchmark suite')
+    parser.add_argument('--scale', nargs='+', choices=SCALES.keys(), default=['small', 'medium'],
+                        help='project scales to be benchmarked')
+    parser.add_argument('--benchmark', nargs='+', choices=BENCHMARKS.keys(), default=list(BENCHMARKS),
+                        help='benchmarks to be run')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs per benchmark')
+    parser.add_argument('--compare', default='default', help='name of the baseline to compare with')
+    parser.add_argument('--save', metavar='NAME', help='store the results as a baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='relative slowdown against the baseline reported as a regression')
+    args = parser.parse_args()
+    baseline = load_baseline(args.compare) or {}
+    results = {}
+    regressions = []
+    print(f'{"benchmark":24} {"min [s]":>10} {"median [s]":>11} {"baseline [s]":>13} {"change":>8}')
+    for scale in args.scale:
+        sourcePath = get_project(scale)
+        for name in args.benchmark:
+            key = f'{scale}/{name}'
+            times = measure(BENCHMARKS[name], sourcePath, args.repeat)
+            results[key] = dict(min=min(times), median=statistics.median(times))
+            line = f'{key:24} {results[key]["min"]:>10.4f} {results[key]["median"]:>11.4f}'
+            if key in baseline:
+                change = results[key]['min'] / baseline[key]['min'] - 1
+                line = f'{line} {baseline[key]["min"]:>13.4f} {change:>+7.0%}'
+                if change > args.tolerance:
+                    regressions.append(key)
+                    line = f'{line}  REGRESSION'
+            print(line)
+    if args.save:
+        save_baseline(args.save, results)
+        print(f'Baseline "{args.save}" saved.')
+    if regressions:
+        print(f'{len(regressions)} regression(s) against baseline "{args.compare}".')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
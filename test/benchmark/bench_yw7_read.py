@@ -0,0 +1,112 @@
+"""Benchmark the yWriter project readers: wall time and peak memory.
+
+Usage: python bench_yw7_read.py [Sourcefile] [--repeat N]
+
+Each reader runs in a separate process, so that the peak memory 
+of one reader does not affect the other.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tracemalloc
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src')
+DEFAULT_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Data', 'normal.yw7')
+READERS = {
+    'tree': ('pywriter.yw.yw7_file', 'Yw7File', {}),
+    'stream': ('ywreporterlib.yw7_stream_file', 'Yw7StreamFile', {}),
+    'meta': ('ywreporterlib.yw7_stream_file', 'Yw7StreamFile', {'metadata_only': True}),
+    }
+# key: reader name, value: (module name, class name, keyword arguments)
+
+
+def get_peak_rss():
+    """Return the peak resident set size of this process in KiB, or None if unknown."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        # macOS reports bytes.
+        peak //= 1024
+    return peak
+
+
+def get_peak_memory(startRss):
+    """Return the peak memory of the measurement in KiB.
+
+    Positional arguments:
+        startRss -- int: peak resident set size before the measurement, or None.
+
+    Use the peak resident set size where the platform provides it;
+    otherwise fall back on the Python memory tracer, which slows the reader down.
+    """
+    if startRss is None:
+        __, tracedPeak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return tracedPeak // 1024
+
+    return get_peak_rss()
+
+
+def measure(reader, sourcePath):
+    """Read sourcePath once with the given reader; return a result dictionary."""
+    sys.path.insert(0, SRC_PATH)
+    moduleName, className, kwargs = READERS[reader]
+    module = __import__(moduleName, fromlist=[className])
+    readerClass = getattr(module, className)
+    startRss = get_peak_rss()
+    if startRss is None:
+        tracemalloc.start()
+    startWall = time.perf_counter()
+    startCpu = time.process_time()
+    novel = readerClass(sourcePath, **kwargs)
+    message = novel.read()
+    wall = time.perf_counter() - startWall
+    cpu = time.process_time() - startCpu
+    return dict(
+        reader=reader,
+        message=message,
+        scenes=len(novel.scenes),
+        wall=wall,
+        cpu=cpu,
+        peak_kib=get_peak_memory(startRss),
+        )
+
+
+def run_child(reader, sourcePath):
+    """Run a measurement in a fresh interpreter and return the result dictionary."""
+    output = subprocess.check_output([sys.executable, __file__, sourcePath, '--child', reader])
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='yWriter reader benchmark')
+    parser.add_argument('sourcePath', metavar='Sourcefile', nargs='?', default=DEFAULT_SOURCE,
+                        help='The path of the yWriter project file.')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per reader')
+    parser.add_argument('--child', choices=READERS.keys(), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(measure(args.child, args.sourcePath)))
+        return
+
+    print(f'{os.path.normpath(args.sourcePath)}: {os.path.getsize(args.sourcePath) // 1024} KiB')
+    print(f'{"reader":8} {"scenes":>8} {"wall [s]":>10} {"cpu [s]":>10} {"peak [KiB]":>12}')
+    for reader in READERS:
+        results = [run_child(reader, args.sourcePath) for __ in range(args.repeat)]
+        best = min(results, key=lambda result: result['wall'])
+        print(f'{reader:8} {best["scenes"]:>8} {best["wall"]:>10.3f} {best["cpu"]:>10.3f} {best["peak_kib"]:>12}')
+
+
+if __name__ == '__main__':
+    main()
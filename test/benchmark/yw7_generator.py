@@ -0,0 +1,172 @@
+"""Generate synthetic yWriter 7 projects for benchmarking.
+
+Usage: python yw7_generator.py Targetfile [--scenes N] [--words N] [--scenes-per-chapter N]
+       [--characters N] [--locations N] [--items N] [--tags N] [--custom-fields N] [--seed N]
+
+The project is generated from a seeded random number generator,
+so that the same arguments always produce the same file.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import random
+import argparse
+
+WORDS = ('the', 'ship', 'robot', 'pilot', 'landed', 'quickly', 'on', 'a', 'deserted', 'field', 'and', 'nobody',
+         'noticed', 'Hal', 'Jock', 'said', 'well-known', 'freighter', 'loan', 'midnight', 'of', 'in', 'to', 'was')
+PUNCTUATION = ('.', ',', '!', '?', ';', '')
+SCALES = dict(
+    small=dict(scenes=200, words=300),
+    medium=dict(scenes=2000, words=500),
+    large=dict(scenes=10000, words=1000),
+)
+# Benchmark presets; the other settings are the defaults of generate_project().
+
+
+def generate_scene_text(rnd, words):
+    """Return a scene text of the given number of words, with paragraphs and some markup."""
+    paragraphs = []
+    sentence = []
+    paragraph = []
+    for i in range(words):
+        word = rnd.choice(WORDS)
+        if i % 97 == 0:
+            word = f'[i]{word}[/i]'
+        sentence.append(word)
+        if len(sentence) >= rnd.randint(6, 18):
+            paragraph.append(f'{" ".join(sentence).capitalize()}{rnd.choice(PUNCTUATION)}')
+            sentence = []
+            if len(paragraph) >= 4:
+                paragraphs.append(' '.join(paragraph))
+                paragraph = []
+    if sentence:
+        paragraph.append(f'{" ".join(sentence).capitalize()}.')
+    if paragraph:
+        paragraphs.append(' '.join(paragraph))
+    return '\n'.join(paragraphs)
+
+
+def generate_project(filePath, scenes=1000, words=300, scenesPerChapter=10, characters=30, locations=20, items=15,
+                     tags=2, customFields=4, seed=1):
+    """Write a synthetic yWriter 7 project.
+
+    Positional arguments:
+        filePath -- str: path to the yw7 file to be written.
+
+    Optional arguments:
+        scenes -- int: number of scenes.
+        words -- int: number of words per scene.
+        scenesPerChapter -- int: number of scenes per chapter.
+        characters -- int: number of characters; each scene refers to up to three of them.
+        locations -- int: number of locations; each scene refers to up to two of them.
+        items -- int: number of items; each scene refers to up to two of them.
+        tags -- int: number of tags per scene.
+        customFields -- int: number of scene rating fields with project field titles (0..4).
+        seed -- int: seed of the random number generator.
+
+    Return the number of chapters.
+    """
+    rnd = random.Random(seed)
+    customFields = max(0, min(customFields, 4))
+    lines = ['<?xml version="1.0" encoding="utf-8"?>', '<YWRITER7>', '\t<PROJECT>', '\t\t<Ver>7</Ver>',
+             '\t\t<Title><![CDATA[Synthetic project]]></Title>',
+             '\t\t<AuthorName><![CDATA[Benchmark]]></AuthorName>',
+             '\t\t<Desc><![CDATA[Generated for benchmarking.]]></Desc>']
+    for i in range(1, customFields + 1):
+        lines.append(f'\t\t<FieldTitle{i}><![CDATA[Field {i}]]></FieldTitle{i}>')
+    lines.append('\t</PROJECT>')
+    for section, tag, count in (('LOCATIONS', 'LOCATION', locations), ('ITEMS', 'ITEM', items),
+                                ('CHARACTERS', 'CHARACTER', characters)):
+        lines.append(f'\t<{section}>')
+        for i in range(1, count + 1):
+            lines.append(f'\t<{tag}>')
+            lines.append(f'\t\t<ID>{i}</ID>')
+            lines.append(f'\t\t<Title><![CDATA[{tag.title()} {i}]]></Title>')
+            lines.append(f'\t\t<Desc><![CDATA[Description of {tag.lower()} {i}.]]></Desc>')
+            lines.append(f'\t\t<Tags><![CDATA[group{i % 3}]]></Tags>')
+            if tag == 'CHARACTER':
+                lines.append(f'\t\t<FullName><![CDATA[Full name {i}]]></FullName>')
+                lines.append(f'\t\t<Bio><![CDATA[Biography of character {i}.]]></Bio>')
+                lines.append(f'\t\t<Goals><![CDATA[Goals of character {i}.]]></Goals>')
+                if i % 3 == 1:
+                    lines.append('\t\t<Major>-1</Major>')
+            lines.append(f'\t\t<SortOrder>{i}</SortOrder>')
+            lines.append(f'\t</{tag}>')
+        lines.append(f'\t</{section}>')
+    lines.append('\t<SCENES>')
+    for scId in range(1, scenes + 1):
+        lines.append('\t<SCENE>')
+        lines.append(f'\t\t<ID>{scId}</ID>')
+        lines.append(f'\t\t<Title><![CDATA[Scene {scId}]]></Title>')
+        lines.append(f'\t\t<Desc><![CDATA[Description of scene {scId}, with "quotes".]]></Desc>')
+        lines.append(f'\t\t<SceneContent><![CDATA[{generate_scene_text(rnd, words)}]]></SceneContent>')
+        lines.append(f'\t\t<WordCount>{words}</WordCount>')
+        lines.append(f'\t\t<Status>{rnd.randint(1, 5)}</Status>')
+        lines.append(f'\t\t<Notes><![CDATA[Notes on scene {scId}.]]></Notes>')
+        if tags:
+            sceneTags = ';'.join(f'tag{rnd.randint(1, 4 * tags)}' for __ in range(tags))
+            lines.append(f'\t\t<Tags><![CDATA[{sceneTags}]]></Tags>')
+        for i in range(1, customFields + 1):
+            lines.append(f'\t\t<Field{i}>{rnd.randint(1, 5)}</Field{i}>')
+        if scId % 2:
+            lines.append('\t\t<ReactionScene>-1</ReactionScene>')
+        lines.append(f'\t\t<Goal><![CDATA[Goal {scId}]]></Goal>')
+        lines.append(f'\t\t<Conflict><![CDATA[Conflict {scId}]]></Conflict>')
+        lines.append(f'\t\t<Outcome><![CDATA[Outcome {scId}]]></Outcome>')
+        lines.append(f'\t\t<SpecificDateTime>2021-{scId % 12 + 1:02}-{scId % 28 + 1:02} {scId % 24:02}:{scId % 60:02}:00'
+                     '</SpecificDateTime>')
+        lines.append('\t\t<SpecificDateMode>-1</SpecificDateMode>')
+        lines.append(f'\t\t<LastsHours>{scId % 5}</LastsHours>')
+        for section, tag, count, maxRefs in (('Characters', 'CharID', characters, 3), ('Locations', 'LocID', locations, 2),
+                                            ('Items', 'ItemID', items, 2)):
+            if count:
+                refs = dict.fromkeys(rnd.randint(1, count) for __ in range(rnd.randint(1, maxRefs)))
+                lines.append(f'\t\t<{section}>')
+                for ref in refs:
+                    lines.append(f'\t\t\t<{tag}>{ref}</{tag}>')
+                lines.append(f'\t\t</{section}>')
+        lines.append('\t</SCENE>')
+    lines.append('\t</SCENES>')
+    lines.append('\t<CHAPTERS>')
+    chapters = 0
+    for first in range(1, scenes + 1, scenesPerChapter):
+        chapters += 1
+        lines.append('\t<CHAPTER>')
+        lines.append(f'\t\t<ID>{chapters}</ID>')
+        lines.append(f'\t\t<SortOrder>{chapters}</SortOrder>')
+        lines.append(f'\t\t<Title><![CDATA[Chapter {chapters}]]></Title>')
+        lines.append(f'\t\t<Desc><![CDATA[Description of chapter {chapters}.]]></Desc>')
+        lines.append('\t\t<Scenes>')
+        for scId in range(first, min(first + scenesPerChapter, scenes + 1)):
+            lines.append(f'\t\t\t<ScID>{scId}</ScID>')
+        lines.append('\t\t</Scenes>')
+        lines.append('\t</CHAPTER>')
+    lines.append('\t</CHAPTERS>')
+    lines.append('</YWRITER7>')
+    lines.append('')
+    with open(filePath, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+    return chapters
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthetic yWriter project generator')
+    parser.add_argument('filePath', metavar='Targetfile', help='path of the yw7 file to be written')
+    parser.add_argument('--scenes', type=int, default=1000, help='number of scenes')
+    parser.add_argument('--words', type=int, default=300, help='number of words per scene')
+    parser.add_argument('--scenes-per-chapter', type=int, default=10, help='number of scenes per chapter')
+    parser.add_argument('--characters', type=int, default=30, help='number of characters')
+    parser.add_argument('--locations', type=int, default=20, help='number of locations')
+    parser.add_argument('--items', type=int, default=15, help='number of items')
+    parser.add_argument('--tags', type=int, default=2, help='number of tags per scene')
+    parser.add_argument('--custom-fields', type=int, default=4, help='number of scene rating fields (0..4)')
+    parser.add_argument('--seed', type=int, default=1, help='seed of the random number generator')
+    args = parser.parse_args()
+    chapters = generate_project(args.filePath, args.scenes, args.words, args.scenes_per_chapter, args.characters,
+                                args.locations, args.items, args.tags, args.custom_fields, args.seed)
+    print(f'{args.filePath}: {args.scenes} scenes, {chapters} chapters')
+
+
+if __name__ == '__main__':
+    main()
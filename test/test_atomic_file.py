@@ -0,0 +1,163 @@
+"""Unit test for the atomic file replacement.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import stat
+import unittest
+from pywriter.file.atomic_file import AtomicFile
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# Test data
+TEST_FILE = TEST_EXEC_PATH + 'yw7 Atomic File.txt'
+BACKUP_FILE = f'{TEST_FILE}.bak'
+OLD_TEXT = 'Old text\n'
+NEW_TEXT = 'New text\nÄÖÜ\n'
+
+
+def read_file(inputFile):
+    with open(inputFile, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def write_file(outputFile, text):
+    with open(outputFile, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def get_test_files():
+    """Return the names of the target file and of all files derived from it."""
+    fileName = os.path.basename(TEST_FILE)
+    return sorted(name for name in os.listdir(TEST_EXEC_PATH) if name.startswith(fileName))
+
+
+def remove_all_testfiles():
+    fileName = os.path.basename(TEST_FILE)
+    for name in os.listdir(TEST_EXEC_PATH):
+        if name.startswith(fileName):
+            os.remove(TEST_EXEC_PATH + name)
+
+
+class NormalOperation(unittest.TestCase):
+    """Write, discard, and fail writing with and without a previous file."""
+
+    def setUp(self):
+        remove_all_testfiles()
+
+    def test_new_file(self):
+        with AtomicFile(TEST_FILE) as f:
+            f.write(NEW_TEXT)
+        self.assertEqual(read_file(TEST_FILE), NEW_TEXT)
+        self.assertEqual(get_test_files(), [os.path.basename(TEST_FILE)])
+
+    def test_default_permissions(self):
+        umask = os.umask(0)
+        os.umask(umask)
+        with AtomicFile(TEST_FILE) as f:
+            f.write(NEW_TEXT)
+        self.assertEqual(stat.S_IMODE(os.stat(TEST_FILE).st_mode), 0o666 & ~umask)
+
+    def test_umask_unchanged(self):
+        """The process-wide umask is not set while writing, as other threads may create files."""
+        umask = os.umask
+
+        def set_umask(mask):
+            raise AssertionError('umask set while writing')
+
+        os.umask = set_umask
+        try:
+            with AtomicFile(TEST_FILE) as f:
+                f.write(NEW_TEXT)
+        finally:
+            os.umask = umask
+        self.assertEqual(read_file(TEST_FILE), NEW_TEXT)
+
+    def test_replace_with_backup(self):
+        write_file(TEST_FILE, OLD_TEXT)
+        write_file(BACKUP_FILE, 'Older text\n')
+        with AtomicFile(TEST_FILE) as f:
+            f.write(NEW_TEXT)
+        self.assertEqual(read_file(TEST_FILE), NEW_TEXT)
+        self.assertEqual(read_file(BACKUP_FILE), OLD_TEXT)
+        self.assertEqual(get_test_files(), [os.path.basename(TEST_FILE), os.path.basename(BACKUP_FILE)])
+
+    def test_replace_without_backup(self):
+        write_file(TEST_FILE, OLD_TEXT)
+        with AtomicFile(TEST_FILE, backup=False) as f:
+            f.write(NEW_TEXT)
+        self.assertEqual(read_file(TEST_FILE), NEW_TEXT)
+        self.assertEqual(get_test_files(), [os.path.basename(TEST_FILE)])
+
+    def test_keep_permissions(self):
+        write_file(TEST_FILE, OLD_TEXT)
+        os.chmod(TEST_FILE, 0o640)
+        with AtomicFile(TEST_FILE) as f:
+            f.write(NEW_TEXT)
+        self.assertEqual(stat.S_IMODE(os.stat(TEST_FILE).st_mode), 0o640)
+
+    def test_exception(self):
+        write_file(TEST_FILE, OLD_TEXT)
+        with self.assertRaises(RuntimeError):
+            with AtomicFile(TEST_FILE) as f:
+                f.write(NEW_TEXT)
+                raise RuntimeError
+
+        self.assertEqual(read_file(TEST_FILE), OLD_TEXT)
+        self.assertEqual(get_test_files(), [os.path.basename(TEST_FILE)])
+
+    def test_exception_without_previous_file(self):
+        with self.assertRaises(RuntimeError):
+            with AtomicFile(TEST_FILE) as f:
+                f.write(NEW_TEXT)
+                raise RuntimeError
+
+        self.assertEqual(get_test_files(), [])
+
+    def test_discard(self):
+        write_file(TEST_FILE, OLD_TEXT)
+        atomicFile = AtomicFile(TEST_FILE)
+        with atomicFile as f:
+            f.write(NEW_TEXT)
+            atomicFile.discard()
+        self.assertEqual(read_file(TEST_FILE), OLD_TEXT)
+        self.assertEqual(get_test_files(), [os.path.basename(TEST_FILE)])
+
+        # The instance can be used again.
+        with atomicFile as f:
+            f.write(NEW_TEXT)
+        self.assertEqual(read_file(TEST_FILE), NEW_TEXT)
+        self.assertEqual(read_file(BACKUP_FILE), OLD_TEXT)
+
+    def test_concurrent_writers(self):
+        """Two writers of the same target file in one process do not share the temporary file."""
+        first = AtomicFile(TEST_FILE)
+        second = AtomicFile(TEST_FILE)
+        with first as f:
+            f.write(OLD_TEXT)
+            with second as g:
+                g.write(NEW_TEXT)
+            self.assertEqual(read_file(TEST_FILE), NEW_TEXT)
+        self.assertEqual(read_file(TEST_FILE), OLD_TEXT)
+        self.assertEqual(read_file(BACKUP_FILE), NEW_TEXT)
+        self.assertEqual(get_test_files(), [os.path.basename(TEST_FILE), os.path.basename(BACKUP_FILE)])
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""Unit test for canceling the report generation.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import unittest
+from pywriter.pywriter_globals import *
+from pywriter.config.configuration import Configuration
+from pywriter.model.chapter import Chapter
+from pywriter.ui.ui import Ui
+from pywriter.yw.yw7_file import Yw7File
+from ywreporterlib.html_report import HtmlReport
+from ywreporterlib.rp_converter import RpConverter
+import yw_reporter_
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# To be placed in TEST_DATA_PATH:
+NORMAL_YW7 = TEST_DATA_PATH + 'normal.yw7'
+
+# Test data
+TEST_YW7 = TEST_EXEC_PATH + 'yw7 Cancel Project.yw7'
+TEST_HTML = TEST_EXEC_PATH + 'yw7 Cancel Project_report.html'
+TEST_CSV = TEST_EXEC_PATH + 'yw7 Cancel Project_report.csv'
+
+
+def read_file(inputFile):
+    with open(inputFile, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def remove_all_testfiles():
+    for filePath in (TEST_YW7, TEST_HTML, TEST_CSV):
+        for path in (filePath, f'{filePath}.bak'):
+            try:
+                os.remove(path)
+            except:
+                pass
+
+
+def get_report_files():
+    """Return the names of the files written next to the project."""
+    projectFile = os.path.basename(TEST_YW7)
+    prefix = projectFile[:-len(Yw7File.EXTENSION)]
+    return sorted(name for name in os.listdir(TEST_EXEC_PATH) if name.startswith(prefix) and name != projectFile)
+
+
+class CancelingUi(Ui):
+    """Ui asking to cancel after a given number of checks during a task."""
+
+    def __init__(self, message, checks):
+        """Cancel when is_canceled() has been called "checks" times after the first progress report of "message"."""
+        super().__init__('')
+        self.message = message
+        self.checks = checks
+        self.started = False
+
+    def set_progress(self, message, count, total):
+        if message == self.message:
+            self.started = True
+
+    def is_canceled(self):
+        if self.started and not self._canceled:
+            self.checks -= 1
+            if self.checks <= 0:
+                self.cancel()
+        return super().is_canceled()
+
+
+class CountingUi(Ui):
+    """Ui asking to cancel after a given number of checks."""
+
+    def __init__(self, checks):
+        super().__init__('')
+        self.checks = checks
+
+    def is_canceled(self):
+        self.checks -= 1
+        if self.checks <= 0:
+            self.cancel()
+        return super().is_canceled()
+
+
+class NormalOperation(unittest.TestCase):
+    """Cancel reading and report generation midway."""
+
+    def setUp(self):
+        remove_all_testfiles()
+        with open(NORMAL_YW7, 'rb') as f:
+            data = f.read()
+        with open(TEST_YW7, 'wb') as f:
+            f.write(data)
+        configuration = Configuration(yw_reporter_.SETTINGS, yw_reporter_.OPTIONS)
+        self.kwargs = yw_reporter_.get_kwargs(configuration)
+
+    def convert(self, ui, **kwargs):
+        converter = RpConverter()
+        converter.ui = ui
+        self.kwargs.update(kwargs)
+        converter.run(TEST_YW7, **self.kwargs)
+        return converter
+
+    def test_cancel_scene_decoding(self):
+        novel = Yw7File(TEST_YW7)
+        novel.ui = CountingUi(10)
+        self.assertEqual(novel.read(), f'{ERROR}Action canceled by user.')
+        self.assertEqual(len(novel.scenes), 9)
+
+    def test_progress_reports(self):
+
+        class ProgressUi(Ui):
+            reports = []
+
+            def set_progress(self, message, count, total):
+                self.reports.append((message, count, total))
+
+        novel = Yw7File(TEST_YW7)
+        novel.ui = ProgressUi('')
+        novel.read()
+        total = len(novel.scenes) + len(novel.chapters)
+        self.assertLessEqual(len(ProgressUi.reports), Yw7File._PROGRESS_STEPS + 1)
+        self.assertEqual(ProgressUi.reports[-1], (_('Reading project'), total, total))
+
+    def test_export_progress_reports(self):
+
+        class ProgressUi(Ui):
+            reports = []
+
+            def set_progress(self, message, count, total):
+                self.reports.append((message, count, total))
+
+        novel = Yw7File(TEST_YW7)
+        novel.read()
+        for i in range(1000):
+            chId = str(1000 + i)
+            novel.chapters[chId] = Chapter()
+            novel.chapters[chId].title = f'Chapter {chId}'
+            novel.srtChapters.append(chId)
+        report = HtmlReport(TEST_HTML, **self.kwargs)
+        report.ui = ProgressUi('')
+        report.merge(novel)
+        message = report.write()
+        self.assertFalse(message.startswith(ERROR), message)
+        total = len(novel.srtChapters)
+        self.assertLessEqual(len(ProgressUi.reports), HtmlReport._PROGRESS_STEPS + 1)
+        self.assertEqual(ProgressUi.reports[-1], (_('Creating report'), total, total))
+
+    def test_cancel_reading(self):
+        converter = self.convert(CancelingUi(_('Reading project'), 1))
+        self.assertIn('Action canceled by user', converter.ui.infoHowText)
+        self.assertIsNone(converter.newFile)
+        self.assertEqual(get_report_files(), [])
+
+    def test_cancel_report(self):
+        for outputSelection in ('0', '1'):
+            with self.subTest(output_selection=outputSelection):
+                converter = self.convert(CancelingUi(_('Creating report'), 5), output_selection=outputSelection)
+                self.assertIn('Action canceled by user', converter.ui.infoHowText)
+                self.assertIsNone(converter.newFile)
+                self.assertEqual(get_report_files(), [])
+
+    def test_keep_previous_report(self):
+        converter = self.convert(Ui(''))
+        self.assertEqual(converter.newFile, TEST_HTML)
+        previousReport = read_file(TEST_HTML)
+        self.kwargs['show_uid'] = True
+        converter = self.convert(CancelingUi(_('Creating report'), 5))
+        self.assertIn('Action canceled by user', converter.ui.infoHowText)
+        self.assertEqual(get_report_files(), [os.path.basename(TEST_HTML)])
+        self.assertEqual(read_file(TEST_HTML), previousReport)
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
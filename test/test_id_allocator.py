@@ -0,0 +1,190 @@
+"""Unit test for the allocation of IDs for new elements.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import shutil
+import unittest
+from pywriter.pywriter_globals import *
+from pywriter.model.chapter import Chapter
+from pywriter.model.novel import Novel
+from pywriter.model.scene import Scene
+from pywriter.yw.yw7_file import Yw7File
+from ywreporterlib.project_cache import ProjectCache
+from ywreporterlib.yw7_stream_file import Yw7StreamFile
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# To be placed in TEST_DATA_PATH:
+NORMAL_YW7 = TEST_DATA_PATH + 'normal.yw7'
+
+# Test data
+TEST_YW7 = TEST_EXEC_PATH + 'yw7 Id Project.yw7'
+TEST_CACHE_DIR = TEST_EXEC_PATH + 'yw7 Id Cache'
+
+
+def copy_file(inputFile, outputFile):
+    with open(inputFile, 'rb') as f:
+        data = f.read()
+    with open(outputFile, 'wb') as f:
+        f.write(data)
+
+
+def remove_all_testfiles():
+    try:
+        os.remove(TEST_YW7)
+    except:
+        pass
+    shutil.rmtree(TEST_CACHE_DIR, ignore_errors=True)
+
+
+def get_next_id(elements):
+    """Return the ID following the highest numeric ID."""
+    return str(max(int(elemId) for elemId in elements) + 1)
+
+
+def raise_high_water_mark(novel, elementType):
+    """Let the allocator hand out an ID far above the IDs that will be read."""
+    elements = getattr(novel, elementType)
+    elements['1000'] = None
+    novel.idAllocator.new_id(elementType)
+    del elements['1000']
+
+
+class AllocateIds(unittest.TestCase):
+    """Test case: Allocate IDs for a novel built in memory."""
+
+    def setUp(self):
+        self.novel = Novel('')
+        for scId in ('1', '3', '7'):
+            self.novel.scenes[scId] = Scene()
+        self.novel.chapters['2'] = Chapter()
+
+    def test_high_water_mark(self):
+        self.assertEqual(self.novel.idAllocator.new_id('scenes'), '8')
+        self.assertEqual(self.novel.idAllocator.new_id('chapters'), '3')
+
+    def test_successive_ids(self):
+        """Successive calls return different IDs, even if no element is added."""
+        self.assertEqual(self.novel.idAllocator.new_id('scenes'), '8')
+        self.assertEqual(self.novel.idAllocator.new_id('scenes'), '9')
+        self.assertEqual(self.novel.idAllocator.new_id('scenes'), '10')
+
+    def test_empty_novel(self):
+        self.assertEqual(Novel('').idAllocator.new_id('scenes'), '1')
+
+    def test_non_numeric_ids(self):
+        self.novel.scenes['x12'] = Scene()
+        self.assertEqual(self.novel.idAllocator.new_id('scenes'), '8')
+
+    def test_elements_added_without_allocator(self):
+        self.assertEqual(self.novel.idAllocator.new_id('scenes'), '8')
+        self.novel.scenes['9'] = Scene()
+        self.novel.scenes['10'] = Scene()
+        self.assertEqual(self.novel.idAllocator.new_id('scenes'), '11')
+
+    def test_fill_gaps(self):
+        self.assertEqual(self.novel.idAllocator.new_id('scenes', fillGaps=True), '2')
+        self.novel.scenes['2'] = Scene()
+        self.assertEqual(self.novel.idAllocator.new_id('scenes', fillGaps=True), '4')
+
+        # Filling gaps leaves the high-water mark alone.
+        self.assertEqual(self.novel.idAllocator.new_id('scenes'), '8')
+        self.assertEqual(self.novel.idAllocator.new_id('scenes', fillGaps=True), '4')
+
+    def test_reset(self):
+        self.assertEqual(self.novel.idAllocator.new_id('scenes'), '8')
+        self.assertEqual(self.novel.idAllocator.new_id('chapters'), '3')
+        self.novel.scenes['20'] = Scene()
+        self.novel.chapters['20'] = Chapter()
+        self.novel.idAllocator.reset()
+        self.assertEqual(self.novel.idAllocator.new_id('scenes'), '21')
+        self.assertEqual(self.novel.idAllocator.new_id('chapters'), '21')
+
+    def test_reset_element_type(self):
+        self.assertEqual(self.novel.idAllocator.new_id('scenes'), '8')
+        self.assertEqual(self.novel.idAllocator.new_id('chapters'), '3')
+        self.novel.scenes['20'] = Scene()
+        self.novel.chapters['20'] = Chapter()
+        self.novel.idAllocator.reset('scenes')
+        self.assertEqual(self.novel.idAllocator.new_id('scenes'), '21')
+        self.assertEqual(self.novel.idAllocator.new_id('chapters'), '4')
+
+
+class ResetAfterReading(unittest.TestCase):
+    """Test case: New IDs are allocated above the IDs read or merged."""
+
+    def setUp(self):
+        remove_all_testfiles()
+        copy_file(NORMAL_YW7, TEST_YW7)
+
+    def read(self, novel):
+        message = novel.read()
+        self.assertFalse(message.startswith(ERROR), message)
+        return novel
+
+    def check_ids(self, novel):
+        self.assertEqual(novel.idAllocator.new_id('scenes'), get_next_id(novel.scenes))
+        self.assertEqual(novel.idAllocator.new_id('chapters'), get_next_id(novel.chapters))
+
+    def test_yw7_file(self):
+        novel = Yw7File(TEST_YW7)
+        raise_high_water_mark(novel, 'scenes')
+        raise_high_water_mark(novel, 'chapters')
+        self.check_ids(self.read(novel))
+
+    def test_stream_file(self):
+        novel = Yw7StreamFile(TEST_YW7)
+        raise_high_water_mark(novel, 'scenes')
+        raise_high_water_mark(novel, 'chapters')
+        self.check_ids(self.read(novel))
+
+    def test_stream_file_from_cache(self):
+        projectCache = ProjectCache(TEST_CACHE_DIR)
+        self.read(Yw7StreamFile(TEST_YW7, project_cache=projectCache))
+        novel = Yw7StreamFile(TEST_YW7, project_cache=projectCache)
+        raise_high_water_mark(novel, 'scenes')
+        raise_high_water_mark(novel, 'chapters')
+        self.read(novel)
+        self.assertIsNone(novel.tree)
+        # The project was loaded from the cache.
+        self.check_ids(novel)
+
+    def test_merge(self):
+        novel = self.read(Yw7File(TEST_YW7))
+        nextScId = int(novel.idAllocator.new_id('scenes'))
+        source = self.read(Yw7File(NORMAL_YW7))
+
+        # Add a scene with an ID above the target's high-water mark, split by a scene divider.
+        newScId = str(nextScId + 5)
+        source.scenes[newScId] = Scene()
+        source.scenes[newScId].status = 1
+        source.scenes[newScId].sceneContent = f'First part.\n{source.sceneSplitter.SCENE_SEPARATOR} Split scene\nSecond part.'
+        source.chapters[source.srtChapters[0]].srtScenes.append(newScId)
+        message = novel.merge(source)
+        self.assertFalse(message.startswith(ERROR), message)
+        self.assertIn(newScId, novel.scenes)
+        self.assertEqual(novel.sceneSplitter.newScenes, 1)
+        self.assertIn(str(nextScId + 6), novel.scenes)
+        self.assertNotIn(str(nextScId), novel.scenes)
+        self.check_ids(novel)
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""Unit test for the incremental report rendering.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import copy
+import shutil
+import unittest
+from pywriter.pywriter_globals import *
+from pywriter.file.filter import Filter
+from pywriter.model.scene import Scene
+from ywreporterlib.project_cache import ProjectCache
+from ywreporterlib.yw7_stream_file import Yw7StreamFile
+from ywreporterlib.html_report import HtmlReport
+from ywreporterlib.csv_report import CsvReport
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# To be placed in TEST_DATA_PATH:
+NORMAL_YW7 = TEST_DATA_PATH + 'normal.yw7'
+
+# Test data
+TEST_HTML = TEST_EXEC_PATH + 'yw7 Incremental Project_report.html'
+TEST_CSV = TEST_EXEC_PATH + 'yw7 Incremental Project_report.csv'
+TEST_CACHE_DIR = TEST_EXEC_PATH + 'yw7 Incremental Cache'
+
+REPORT_OPTIONS = ('show_chapters', 'show_scenes', 'show_normal_type', 'show_unused_type', 'show_notes_type',
+                  'show_todo_type', 'show_unexported', 'show_uid', 'show_number', 'show_title', 'show_description',
+                  'show_viewpoint', 'show_tags', 'show_languages', 'show_notes', 'show_date', 'show_time',
+                  'show_duration', 'show_action_pattern', 'show_ratings', 'show_words_total', 'show_wordcount',
+                  'show_lettercount', 'show_status', 'show_characters', 'show_locations', 'show_items')
+
+NOVEL_ATTRIBUTES = ('title', 'desc', 'authorName', 'authorBio', 'fieldTitle1', 'fieldTitle2', 'fieldTitle3',
+                    'fieldTitle4', 'projectName', 'projectPath', 'languageCode', 'countryCode')
+
+SENTINEL = object()
+
+
+def read_file(inputFile):
+    with open(inputFile, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def remove_all_testfiles():
+    for filePath in (TEST_HTML, TEST_CSV):
+        for path in (filePath, f'{filePath}.bak'):
+            try:
+                os.remove(path)
+            except:
+                pass
+    shutil.rmtree(TEST_CACHE_DIR, ignore_errors=True)
+
+
+class RecordingMixin:
+    """Keep track of the scenes rendered by the last write()."""
+
+    def _get_sceneMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        self.renderedScenes.add(scId)
+        return super()._get_sceneMapping(scId, sceneNumber, wordsTotal, lettersTotal)
+
+    def write(self):
+        self.renderedScenes = set()
+        return super().write()
+
+
+class RecordingHtmlReport(RecordingMixin, HtmlReport):
+    pass
+
+
+class RecordingCsvReport(RecordingMixin, CsvReport):
+    pass
+
+
+class NormalOperation(unittest.TestCase):
+    """Write incremental reports of the sample project, changing the project in between."""
+
+    def setUp(self):
+        remove_all_testfiles()
+        self.novel = Yw7StreamFile(NORMAL_YW7)
+        message = self.novel.read()
+        self.assertFalse(message.startswith(ERROR), message)
+        self.cache = ProjectCache(TEST_CACHE_DIR)
+
+    def write_reports(self, incremental=True):
+        """Write an HTML and a CSV report with all columns; return the report instances."""
+        kwargs = {option: True for option in REPORT_OPTIONS}
+        kwargs['scene_filter'] = Filter()
+        kwargs['incremental'] = incremental
+        kwargs['project_cache'] = self.cache
+        reports = []
+        for reportClass, reportPath in ((RecordingHtmlReport, TEST_HTML), (RecordingCsvReport, TEST_CSV)):
+            report = reportClass(reportPath, **kwargs)
+            message = report.merge(self.novel)
+            if not message.startswith(ERROR):
+                message = report.write()
+            self.assertFalse(message.startswith(ERROR), message)
+            reports.append(report)
+        return reports
+
+    def assert_rendered(self, expectedScenes):
+        """Write the reports incrementally, and compare them with completely rendered ones."""
+        texts = []
+        for report in self.write_reports():
+            self.assertEqual(report.renderedScenes, expectedScenes)
+            self.assertEqual(report.renderedRows, len(expectedScenes))
+            texts.append(read_file(report.filePath))
+        for report in self.write_reports(incremental=False):
+            self.assertEqual(read_file(report.filePath), texts.pop(0))
+
+    def get_exported_scenes(self):
+        reports = self.write_reports()
+        self.assertEqual(reports[0].renderedScenes, reports[1].renderedScenes)
+        return reports[0].renderedScenes
+
+    def test_unchanged(self):
+        self.get_exported_scenes()
+        for report in self.write_reports():
+            self.assertEqual(report.renderedRows, 0)
+            self.assertGreater(report.reusedRows, 0)
+
+    def test_scene_changed(self):
+        scId = sorted(self.get_exported_scenes())[0]
+        self.novel.scenes[scId].title = 'Changed scene title'
+        self.assert_rendered({scId})
+
+    def test_character_changed(self):
+        exportedScenes = self.get_exported_scenes()
+        crId = self.novel.srtCharacters[0]
+        self.novel.characters[crId].title = 'Changed character name'
+        expectedScenes = set()
+        for scId in exportedScenes:
+            if crId in (self.novel.scenes[scId].characters or []):
+                expectedScenes.add(scId)
+        self.assertTrue(expectedScenes)
+        self.assertLess(len(expectedScenes), len(exportedScenes))
+        self.assert_rendered(expectedScenes)
+
+    def test_location_changed(self):
+        exportedScenes = self.get_exported_scenes()
+        lcId = self.novel.srtLocations[0]
+        self.novel.locations[lcId].title = 'Changed location name'
+        expectedScenes = set()
+        for scId in exportedScenes:
+            if lcId in (self.novel.scenes[scId].locations or []):
+                expectedScenes.add(scId)
+        self.assertTrue(expectedScenes)
+        self.assertLess(len(expectedScenes), len(exportedScenes))
+        self.assert_rendered(expectedScenes)
+
+    def test_field_group_dependencies(self):
+        """Check that the field groups use no values besides the declared ones."""
+        kwargs = {option: True for option in REPORT_OPTIONS}
+        report = HtmlReport(TEST_HTML, scene_filter=Filter(), **kwargs)
+        report.merge(self.novel)
+        sceneVariables = set()
+        for cls in Scene.__mro__:
+            sceneVariables.update(name.lstrip('_') for name in getattr(cls, '__slots__', ()))
+        for fieldNames, method, dependencies in report._SCENE_FIELD_GROUPS:
+            with self.subTest(method=method):
+                declared = [dependency.split('.') for dependency in dependencies]
+                sceneDependencies = set(name for source, name in declared if source == 'scene')
+                for source, name in declared:
+                    if source == 'scene':
+                        self.assertIn(name, sceneVariables)
+                    elif source == 'novel':
+                        self.assertTrue(hasattr(report, name))
+                    elif source != 'arg':
+                        self.assertIn(source, sceneVariables)
+                        self.assertIsInstance(getattr(report, source), dict)
+                        self.assertEqual(name, 'title')
+                    else:
+                        self.assertIn(name, ('sceneNumber', 'wordsTotal', 'lettersTotal'))
+                render = getattr(report, method)
+                for scId in report.scenes:
+                    expected = render(scId, 1, 2, 3)
+                    self.assertEqual(set(expected), set(fieldNames))
+                    arguments = dict(sceneNumber=1, wordsTotal=2, lettersTotal=3)
+                    for name in arguments:
+                        if not ['arg', name] in declared:
+                            changedArguments = dict(arguments)
+                            changedArguments[name] = 10
+                            self.assertEqual(render(scId, **changedArguments), expected, name)
+                    scene = report.scenes[scId]
+                    for name in sceneVariables - sceneDependencies:
+                        for value in (None, SENTINEL):
+                            changedScene = copy.copy(scene)
+                            if name == 'sceneContent':
+                                changedScene._sceneContent = value
+                            else:
+                                setattr(changedScene, name, value)
+                            report.scenes[scId] = changedScene
+                            try:
+                                self.assertEqual(render(scId, 1, 2, 3), expected, name)
+                            finally:
+                                report.scenes[scId] = scene
+                    for name in NOVEL_ATTRIBUTES:
+                        if ['novel', name] in declared:
+                            continue
+
+                        original = getattr(report, name)
+                        for value in (None, SENTINEL):
+                            setattr(report, name, value)
+                            try:
+                                self.assertEqual(render(scId, 1, 2, 3), expected, name)
+                            finally:
+                                setattr(report, name, original)
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
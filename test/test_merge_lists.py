@@ -0,0 +1,92 @@
+"""Unit test for the merging of the sorted ID lists.
+
+Compare the results with the former algorithm.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import random
+import unittest
+from pywriter.yw.yw7_file import merge_lists
+
+EDGE_CASES = (
+    # srcLst, tgtLst
+    ([], []),
+    ([], ['1', '2']),
+    (['1', '2'], []),
+    (['1', '2', '3'], ['1', '2', '3']),
+    # Insertions at the head.
+    (['9', '1', '2'], ['1', '2']),
+    (['8', '9', '1', '2'], ['1', '2']),
+    (['9', '2'], ['1', '2']),
+    # Insertions at the tail.
+    (['1', '2', '9'], ['1', '2']),
+    (['2', '8', '9'], ['1', '2', '3']),
+    # Insertions in the middle.
+    (['1', '9', '2'], ['1', '2', '3']),
+    (['1', '8', '3', '9'], ['1', '2', '3']),
+    # IDs deleted in the source are kept.
+    (['1', '3'], ['1', '2', '3']),
+    (['3'], ['1', '2', '3']),
+    (['4', '3', '5'], ['1', '2', '3']),
+    # Order of the source differs from the target.
+    (['3', '9', '1'], ['1', '2', '3']),
+    (['3', '2', '1', '9'], ['1', '2', '3']),
+    # Repeated items.
+    (['9', '9', '1'], ['1', '2']),
+    (['1', '9', '1', '8'], ['1', '2']),
+    (['9', '2', '8'], ['1', '2', '1']),
+)
+
+
+def merge_lists_linear_search(srcLst, tgtLst):
+    """Insert srcLst items to tgtLst, if missing (former algorithm)."""
+    j = 0
+    for item in srcLst:
+        if not item in tgtLst:
+            tgtLst.insert(j, item)
+            j += 1
+        else:
+            j = tgtLst.index(item) + 1
+
+
+class MergeLists(unittest.TestCase):
+    """Test case: The merged lists are the same as with the former algorithm."""
+
+    def check(self, srcLst, tgtLst):
+        expected = list(tgtLst)
+        merge_lists_linear_search(srcLst, expected)
+        result = list(tgtLst)
+        merge_lists(list(srcLst), result)
+        self.assertEqual(result, expected)
+
+    def test_edge_cases(self):
+        for srcLst, tgtLst in EDGE_CASES:
+            with self.subTest(srcLst=srcLst, tgtLst=tgtLst):
+                self.check(srcLst, tgtLst)
+
+    def test_source_not_changed(self):
+        srcLst = ['9', '1', '8']
+        merge_lists(srcLst, ['1', '2'])
+        self.assertEqual(srcLst, ['9', '1', '8'])
+
+    def test_random_lists(self):
+        randomGenerator = random.Random(1)
+        for __ in range(20000):
+            tgtLst = [str(randomGenerator.randint(0, 15)) for __ in range(randomGenerator.randint(0, 8))]
+            srcLst = [str(randomGenerator.randint(0, 15)) for __ in range(randomGenerator.randint(0, 12))]
+            if randomGenerator.random() < 0.5:
+                # IDs are unique in a project.
+                tgtLst = list(dict.fromkeys(tgtLst))
+                srcLst = list(dict.fromkeys(srcLst))
+            with self.subTest(srcLst=srcLst, tgtLst=tgtLst):
+                self.check(srcLst, tgtLst)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
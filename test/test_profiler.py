@@ -0,0 +1,120 @@
+"""Unit test for the timing of the conversion stages.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import unittest
+from pywriter.pywriter_globals import *
+from pywriter.file.filter import Filter
+from ywreporterlib.profiler import Profiler
+from ywreporterlib.yw7_stream_file import Yw7StreamFile
+from ywreporterlib.html_report import HtmlReport
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# To be placed in TEST_DATA_PATH:
+NORMAL_YW7 = TEST_DATA_PATH + 'normal.yw7'
+
+# Test data
+TEST_HTML = TEST_EXEC_PATH + 'yw7 Profiled Project_report.html'
+
+REPORT_OPTIONS = ('show_chapters', 'show_scenes', 'show_normal_type', 'show_unused_type', 'show_notes_type',
+                  'show_todo_type', 'show_unexported', 'show_uid', 'show_number', 'show_title', 'show_description',
+                  'show_viewpoint', 'show_tags', 'show_notes', 'show_date', 'show_time',
+                  'show_duration', 'show_action_pattern', 'show_ratings', 'show_words_total', 'show_wordcount',
+                  'show_lettercount', 'show_status', 'show_characters', 'show_locations', 'show_items')
+
+STAGES = ['read', 'read/parse', 'read/populate', 'merge', 'write', 'write/header', 'write/chapters',
+          'write/chapters/substitution', 'write/chapters/substitution/mapping', 'write/characters',
+          'write/locations', 'write/items', 'write/projectNotes']
+
+
+def remove_all_testfiles():
+    for path in (TEST_HTML, f'{TEST_HTML}.bak'):
+        try:
+            os.remove(path)
+        except:
+            pass
+
+
+class ExtendedHtmlReport(HtmlReport):
+    """HTML report extending the measured methods."""
+
+    def write(self):
+        self.written = True
+        return super().write()
+
+
+class NormalOperation(unittest.TestCase):
+    """Profile reading the sample project and writing a report."""
+
+    def setUp(self):
+        remove_all_testfiles()
+
+    def convert(self, profiler, reportClass=HtmlReport):
+        novel = Yw7StreamFile(NORMAL_YW7, profiler=profiler)
+        message = novel.read()
+        self.assertFalse(message.startswith(ERROR), message)
+        kwargs = {option: True for option in REPORT_OPTIONS}
+        kwargs['scene_filter'] = Filter()
+        kwargs['profiler'] = profiler
+        report = reportClass(TEST_HTML, **kwargs)
+        message = report.merge(novel)
+        self.assertFalse(message.startswith(ERROR), message)
+        message = report.write()
+        self.assertFalse(message.startswith(ERROR), message)
+        return novel, report
+
+    def test_stages(self):
+        profiler = Profiler()
+        novel, report = self.convert(profiler)
+        records = profiler.get_records()
+        self.assertEqual([record['stage'] for record in records], STAGES)
+        calls = {record['stage']: record['calls'] for record in records}
+        self.assertEqual(calls['write'], 1)
+        self.assertEqual(calls['write/chapters/substitution'], report.renderedRows)
+        for record in records:
+            self.assertIsNone(record['peak'])
+            self.assertGreaterEqual(record['wall'], record['self'])
+
+    def test_trace_memory(self):
+        profiler = Profiler(traceMemory=True)
+        self.convert(profiler)
+        for record in profiler.get_records():
+            self.assertGreater(record['peak'], 0)
+
+    def test_no_instance_methods(self):
+        """The measured methods stay class methods, and can be extended by subclasses."""
+        profiler = Profiler()
+        novel, report = self.convert(profiler, ExtendedHtmlReport)
+        self.assertTrue(report.written)
+        for name in ('read', 'merge', 'write', '_render_chapter', '_render_scene', '_get_chapterMapping',
+                     '_get_sceneMapping'):
+            self.assertNotIn(name, vars(novel))
+            self.assertNotIn(name, vars(report))
+        self.assertEqual([record['stage'] for record in profiler.get_records()], STAGES)
+
+    def test_disabled(self):
+        profiler = Profiler(enabled=False)
+        self.convert(profiler)
+        self.assertEqual(profiler.get_records(), [])
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
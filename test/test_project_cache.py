@@ -0,0 +1,213 @@
+"""Unit test for the on-disk cache of parsed yWriter projects.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import shutil
+import unittest
+from pywriter.pywriter_globals import *
+from pywriter.model.scene import Scene
+from ywreporterlib.project_cache import ProjectCache
+from ywreporterlib.yw7_stream_file import Yw7StreamFile
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# To be placed in TEST_DATA_PATH:
+NORMAL_YW7 = TEST_DATA_PATH + 'normal.yw7'
+
+# Test data
+TEST_YW7 = TEST_EXEC_PATH + 'yw7 Cache Project.yw7'
+TEST_CACHE_DIR = TEST_EXEC_PATH + 'yw7 Cache'
+
+
+def read_file(inputFile):
+    with open(inputFile, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def copy_file(inputFile, outputFile):
+    with open(inputFile, 'rb') as f:
+        data = f.read()
+    with open(outputFile, 'wb') as f:
+        f.write(data)
+
+
+def remove_all_testfiles():
+    try:
+        os.remove(TEST_YW7)
+    except:
+        pass
+    shutil.rmtree(TEST_CACHE_DIR, ignore_errors=True)
+
+
+class CountingReader(Yw7StreamFile):
+    """Stream reader counting the parsing passes."""
+    parsed = 0
+
+    def _parse_file(self, encoding):
+        CountingReader.parsed += 1
+        return super()._parse_file(encoding)
+
+
+class ExtendedScene(Scene):
+    """Scene class with an additional instance variable."""
+    __slots__ = ('extension',)
+
+    def __init__(self):
+        super().__init__()
+        self.extension = None
+
+
+class ExtendedReader(CountingReader):
+    """Stream reader with a different scene class."""
+    SCENE_CLASS = ExtendedScene
+
+
+class NormalOperation(unittest.TestCase):
+    """Read the sample project with a project cache."""
+
+    def setUp(self):
+        remove_all_testfiles()
+        copy_file(NORMAL_YW7, TEST_YW7)
+        CountingReader.parsed = 0
+        self.cache = ProjectCache(TEST_CACHE_DIR)
+
+    def read(self, readerClass=CountingReader, **kwargs):
+        novel = readerClass(TEST_YW7, project_cache=self.cache, **kwargs)
+        message = novel.read()
+        self.assertFalse(message.startswith(ERROR), message)
+        return novel
+
+    def get_cache_files(self):
+        return sorted(os.listdir(TEST_CACHE_DIR))
+
+    def test_hit(self):
+        parsed = self.read()
+        cached = self.read()
+        self.assertEqual(CountingReader.parsed, 1)
+        self.assertEqual(cached.srtChapters, parsed.srtChapters)
+        for scId in parsed.scenes:
+            self.assertEqual(cached.scenes[scId].title, parsed.scenes[scId].title)
+            self.assertEqual(cached.scenes[scId].sceneContent, parsed.scenes[scId].sceneContent)
+            self.assertEqual(cached.scenes[scId].wordCount, parsed.scenes[scId].wordCount)
+        self.assertEqual(cached.catalog.get_filter_terms(), parsed.catalog.get_filter_terms())
+
+    def test_miss_after_source_change(self):
+        self.read()
+        text = read_file(TEST_YW7)
+        with open(TEST_YW7, 'w', encoding='utf-8') as f:
+            f.write(text.replace('<![CDATA[Chapter 1]]>', '<![CDATA[Chapter One]]>'))
+        stat = os.stat(TEST_YW7)
+        os.utime(TEST_YW7, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        novel = self.read()
+        self.assertEqual(CountingReader.parsed, 2)
+        self.assertIn('Chapter One', [novel.chapters[chId].title for chId in novel.srtChapters])
+
+    def test_miss_after_mtime_change(self):
+        self.read()
+        stat = os.stat(TEST_YW7)
+        os.utime(TEST_YW7, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        self.read()
+        self.assertEqual(CountingReader.parsed, 2)
+
+    def test_miss_after_schema_change(self):
+        self.read()
+        novel = self.read(ExtendedReader)
+        self.assertEqual(CountingReader.parsed, 2)
+        for scene in novel.scenes.values():
+            self.assertIsInstance(scene, ExtendedScene)
+        self.read(ExtendedReader)
+        self.assertEqual(CountingReader.parsed, 2)
+
+    def test_variants(self):
+        metadata = self.read(metadata_only=True)
+        for scene in metadata.scenes.values():
+            self.assertIsNone(scene.sceneContent)
+        full = self.read()
+        self.assertEqual(CountingReader.parsed, 2)
+        self.assertTrue(any(scene.sceneContent for scene in full.scenes.values()))
+        self.assertEqual(len(self.get_cache_files()), 2)
+
+        metadata = self.read(metadata_only=True)
+        full = self.read()
+        self.assertEqual(CountingReader.parsed, 2)
+        for scene in metadata.scenes.values():
+            self.assertIsNone(scene.sceneContent)
+        self.assertTrue(any(scene.sceneContent for scene in full.scenes.values()))
+
+    def test_lru_eviction(self):
+        self.read()
+        self.read(metadata_only=True)
+        fullPath = self.cache._get_cache_path(TEST_YW7, 'full')
+        metadataPath = self.cache._get_cache_path(TEST_YW7, 'metadata')
+        fullSize = os.path.getsize(fullPath)
+        metadataSize = os.path.getsize(metadataPath)
+        os.utime(fullPath, ns=(0, 1000000000))
+        os.utime(metadataPath, ns=(0, 2000000000))
+
+        # Loading touches the cache file, so the metadata variant becomes the least recently used.
+        self.read()
+        self.assertEqual(CountingReader.parsed, 2)
+        self.assertGreater(os.path.getmtime(fullPath), os.path.getmtime(metadataPath))
+
+        self.cache.maxSize = fullSize + metadataSize + 100
+        self.assertTrue(self.cache.store_data(TEST_YW7, 'rows', 'x' * 200))
+        self.assertFalse(os.path.isfile(metadataPath))
+        self.assertTrue(os.path.isfile(fullPath))
+        self.read()
+        self.assertEqual(CountingReader.parsed, 2)
+        self.read(metadata_only=True)
+        self.assertEqual(CountingReader.parsed, 3)
+
+    def test_truncated_cache_file(self):
+        parsed = self.read()
+        cachePath = self.cache._get_cache_path(TEST_YW7, 'full')
+        with open(cachePath, 'rb') as f:
+            data = f.read()
+        for size in (0, 10, len(data) // 2, len(data) - 1):
+            with open(cachePath, 'wb') as f:
+                f.write(data[:size])
+            self.assertFalse(self.cache.load(CountingReader(TEST_YW7), 'full'))
+        novel = self.read()
+        self.assertEqual(CountingReader.parsed, 2)
+        self.assertEqual(novel.srtChapters, parsed.srtChapters)
+        self.read()
+        self.assertEqual(CountingReader.parsed, 2)
+
+    def test_corrupt_cache_file(self):
+        self.read()
+        cachePath = self.cache._get_cache_path(TEST_YW7, 'full')
+        with open(cachePath, 'wb') as f:
+            f.write(b'\x80\x05This is not a pickle.' * 100)
+        self.assertFalse(self.cache.load(CountingReader(TEST_YW7), 'full'))
+        self.read()
+        self.assertEqual(CountingReader.parsed, 2)
+
+    def test_no_temporary_files(self):
+        self.read()
+        self.assertTrue(self.cache.store_data(TEST_YW7, 'rows', 'data'))
+        self.assertFalse(self.cache.store_data(TEST_YW7, 'rows', lambda: None))
+        self.assertEqual(self.cache.load_data(TEST_YW7, 'rows'), 'data')
+        for fileName in self.get_cache_files():
+            self.assertTrue(fileName.endswith(ProjectCache.EXTENSION))
+        self.assertEqual(len(self.get_cache_files()), 2)
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Unit test for the project catalog of the scene filter values.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import unittest
+from pywriter.pywriter_globals import *
+from ywreporterlib.project_catalog import ProjectCatalog
+from ywreporterlib.sc_expr_filter import ScExprFilter
+from ywreporterlib.yw7_stream_file import Yw7StreamFile
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# To be placed in TEST_DATA_PATH:
+NORMAL_YW7 = TEST_DATA_PATH + 'normal.yw7'
+
+# Test data
+NORMAL_TERMS = [
+    'tag:"Exposition"',
+    'tag:"Pinch Point"',
+    'tag:"Plot Point"',
+    'viewpoint:"Hal"',
+    'viewpoint:"Jerling"',
+    'viewpoint:"Clunk"',
+    'viewpoint:"Farrell"',
+    'viewpoint:"Terry"',
+    'character:"Hal"',
+    'character:"Navcom"',
+    'character:"Vurdi"',
+    'character:"Brutus"',
+    'character:"Jerling"',
+    'character:"Carina"',
+    'character:"Clunk"',
+    'character:"Portmaster"',
+    'character:"Farrell"',
+    'character:"Terry"',
+    'location:"Black Gull"',
+    'location:"Lamira Spaceport"',
+    'location:"Planet Forg"',
+    'location:"Jerling Enterprises"',
+]
+
+
+def read_project():
+    novel = Yw7StreamFile(NORMAL_YW7, metadata_only=True)
+    message = novel.read()
+    assert not message.startswith(ERROR), message
+    return novel
+
+
+class NormalOperation(unittest.TestCase):
+    """Get the filter expression terms of the sample project."""
+
+    def setUp(self):
+        self.novel = read_project()
+
+    def test_filter_terms(self):
+        self.assertEqual(self.novel.get_catalog().get_filter_terms(), NORMAL_TERMS)
+
+    def test_order_of_occurrence(self):
+        """The terms of each category are in the order of the first scene referring to them."""
+        occurrences = dict(tag=[], viewpoint=[], character=[], location=[])
+        for chId in self.novel.srtChapters:
+            for scId in self.novel.chapters[chId].srtScenes:
+                scene = self.novel.scenes[scId]
+                occurrences['tag'].extend(scene.tags or [])
+                if scene.characters:
+                    occurrences['viewpoint'].append(self.novel.characters[scene.characters[0]].title)
+                    occurrences['character'].extend(self.novel.characters[crId].title for crId in scene.characters)
+                occurrences['location'].extend(self.novel.locations[lcId].title for lcId in scene.locations or [])
+        expected = []
+        for category, titles in occurrences.items():
+            expected.extend(f'{category}:"{title}"' for title in dict.fromkeys(titles))
+        self.assertEqual(self.novel.get_catalog().get_filter_terms(), expected)
+
+    def test_terms_select_scenes(self):
+        """Each term is a valid filter expression matching at least one scene."""
+        for term in self.novel.get_catalog().get_filter_terms():
+            with self.subTest(term=term):
+                sceneFilter = ScExprFilter(term)
+                self.assertTrue(any(sceneFilter.accept(self.novel, scId) for scId in self.novel.scenes))
+
+    def test_quoting(self):
+        """Titles are quoted; duplicate titles occur once; titles with double quotes are left out."""
+        crIds = {character.title: crId for crId, character in self.novel.characters.items()}
+        self.novel.characters[crIds['Navcom']].title = 'Hal'
+        self.novel.characters[crIds['Vurdi']].title = 'Vurdi "the Mole"'
+        self.novel.characters[crIds['Brutus']].title = 'Brutus (the Dog)'
+        terms = ProjectCatalog(self.novel).get_filter_terms()
+        self.assertEqual(terms.count('character:"Hal"'), 1)
+        self.assertNotIn('character:"Vurdi "the Mole""', terms)
+        self.assertFalse([term for term in terms if 'Vurdi' in term])
+        self.assertIn('character:"Brutus (the Dog)"', terms)
+        sceneFilter = ScExprFilter('character:"Brutus (the Dog)"')
+        self.assertTrue(any(sceneFilter.accept(self.novel, scId) for scId in self.novel.scenes))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
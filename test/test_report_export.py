@@ -0,0 +1,116 @@
+"""Unit test for the error handling of the report export.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import unittest
+from pywriter.pywriter_globals import *
+from pywriter.file.filter import Filter
+from ywreporterlib.yw7_stream_file import Yw7StreamFile
+from ywreporterlib.html_report import HtmlReport
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# To be placed in TEST_DATA_PATH:
+NORMAL_YW7 = TEST_DATA_PATH + 'normal.yw7'
+
+# Test data
+TEST_HTML = TEST_EXEC_PATH + 'yw7 Export Project_report.html'
+MISSING_DIR_HTML = TEST_EXEC_PATH + 'yw7 Missing Directory/yw7 Export Project_report.html'
+PREVIOUS_REPORT = '<html>Previous report</html>\n'
+
+REPORT_OPTIONS = ('show_chapters', 'show_scenes', 'show_normal_type', 'show_unused_type', 'show_notes_type',
+                  'show_todo_type', 'show_unexported', 'show_uid', 'show_number', 'show_title', 'show_description',
+                  'show_viewpoint', 'show_tags', 'show_notes', 'show_date', 'show_time',
+                  'show_duration', 'show_action_pattern', 'show_ratings', 'show_words_total', 'show_wordcount',
+                  'show_lettercount', 'show_status', 'show_characters', 'show_locations', 'show_items')
+
+
+def read_file(inputFile):
+    with open(inputFile, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def get_report_files():
+    """Return the names of the report file and of all files derived from it."""
+    fileName = os.path.basename(TEST_HTML)
+    return sorted(name for name in os.listdir(TEST_EXEC_PATH) if name.startswith(fileName))
+
+
+def remove_all_testfiles():
+    fileName = os.path.basename(TEST_HTML)
+    for name in os.listdir(TEST_EXEC_PATH):
+        if name.startswith(fileName):
+            os.remove(TEST_EXEC_PATH + name)
+
+
+class FailingHtmlReport(HtmlReport):
+    """HTML report with a bug in the scene mapping."""
+
+    def _get_sceneMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        raise KeyError('Bug in the scene mapping')
+
+
+class WriteErrors(unittest.TestCase):
+    """Tell file errors from errors while rendering the report."""
+
+    def setUp(self):
+        remove_all_testfiles()
+        self.novel = Yw7StreamFile(NORMAL_YW7)
+        message = self.novel.read()
+        self.assertFalse(message.startswith(ERROR), message)
+
+    def new_report(self, reportClass, filePath):
+        kwargs = {option: True for option in REPORT_OPTIONS}
+        kwargs['scene_filter'] = Filter()
+        report = reportClass(filePath, **kwargs)
+        message = report.merge(self.novel)
+        self.assertFalse(message.startswith(ERROR), message)
+        return report
+
+    def test_file_error(self):
+        message = self.new_report(HtmlReport, MISSING_DIR_HTML).write()
+        self.assertTrue(message.startswith(f'{ERROR}{_("Cannot write file")}'), message)
+        self.assertIn('No such file or directory', message)
+
+    def test_rendering_error(self):
+        with open(TEST_HTML, 'w', encoding='utf-8') as f:
+            f.write(PREVIOUS_REPORT)
+        report = self.new_report(FailingHtmlReport, TEST_HTML)
+        with self.assertRaisesRegex(KeyError, 'Bug in the scene mapping'):
+            report.write()
+        self.assertEqual(read_file(TEST_HTML), PREVIOUS_REPORT)
+        self.assertEqual(get_report_files(), [os.path.basename(TEST_HTML)])
+
+    def test_interrupt(self):
+        """KeyboardInterrupt is not taken for a file error."""
+
+        class InterruptedHtmlReport(HtmlReport):
+
+            def _get_sceneMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+                raise KeyboardInterrupt
+
+        report = self.new_report(InterruptedHtmlReport, TEST_HTML)
+        with self.assertRaises(KeyboardInterrupt):
+            report.write()
+        self.assertEqual(get_report_files(), [])
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Unit test for the batch report generation.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import signal
+import unittest
+from pywriter.pywriter_globals import *
+from pywriter.config.configuration import Configuration
+from ywreporterlib import rp_batch
+from ywreporterlib.rp_batch import RpBatch
+from ywreporterlib.profiler import Profiler
+import yw_reporter_
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# To be placed in TEST_DATA_PATH:
+NORMAL_YW7 = TEST_DATA_PATH + 'normal.yw7'
+
+# Test data
+TEST_YW7 = TEST_EXEC_PATH + 'yw7 Batch Project.yw7'
+TEST_HTML = TEST_EXEC_PATH + 'yw7 Batch Project_report.html'
+
+
+def remove_all_testfiles():
+    for filePath in (TEST_YW7, TEST_HTML, f'{TEST_HTML}.bak'):
+        try:
+            os.remove(filePath)
+        except:
+            pass
+
+
+class InterruptingUi(rp_batch.BatchUi):
+    """Batch ui receiving SIGINT when the conversion reports its first progress."""
+
+    def set_progress(self, message, count, total):
+        rp_batch.interrupt_worker(signal.SIGINT, None)
+
+
+class NormalOperation(unittest.TestCase):
+    """Convert a project the way the worker processes do."""
+
+    def setUp(self):
+        remove_all_testfiles()
+        with open(NORMAL_YW7, 'rb') as f:
+            data = f.read()
+        with open(TEST_YW7, 'wb') as f:
+            f.write(data)
+        configuration = Configuration(yw_reporter_.SETTINGS, yw_reporter_.OPTIONS)
+        self.kwargs = yw_reporter_.get_kwargs(configuration)
+
+    def test_interrupt(self):
+        """SIGINT cancels the running conversion only."""
+        batchUi = rp_batch.BatchUi
+        rp_batch.BatchUi = InterruptingUi
+        try:
+            (sourcePath, message, __), __ = rp_batch.convert_project(TEST_YW7, self.kwargs)
+        finally:
+            rp_batch.BatchUi = batchUi
+        self.assertEqual(sourcePath, TEST_YW7)
+        self.assertIn('Action canceled by user', message)
+        self.assertFalse(os.path.isfile(TEST_HTML))
+
+        # SIGINT between the conversions does not affect the next one.
+        rp_batch.interrupt_worker(signal.SIGINT, None)
+        (__, message, __), __ = rp_batch.convert_project(TEST_YW7, self.kwargs)
+        self.assertFalse(message.startswith(ERROR), message)
+        self.assertTrue(os.path.isfile(TEST_HTML))
+
+    def test_run(self):
+        """The caller's keyword arguments are left unchanged."""
+        kwargs = dict(self.kwargs, profiler=Profiler())
+        expected = dict(kwargs)
+        batch = RpBatch(maxWorkers=1)
+        self.assertEqual(batch.run(TEST_YW7, **kwargs), 0)
+        self.assertEqual(kwargs, expected)
+        self.assertEqual(len(batch.results), 1)
+        self.assertEqual([profile['project'] for profile in batch.profiles], [TEST_YW7])
+        self.assertTrue(os.path.isfile(TEST_HTML))
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""Unit test for the scene filter expressions.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import unittest
+from pywriter.model.novel import Novel
+from pywriter.model.chapter import Chapter
+from pywriter.model.scene import Scene
+from pywriter.model.character import Character
+from pywriter.model.world_element import WorldElement
+from ywreporterlib.sc_expr_filter import ScExprFilter
+
+# Test data
+CHARACTERS = {'1': 'Alice', '2': 'Bob', '3': 'Alice Smith'}
+LOCATIONS = {'1': 'Castle', '2': 'Dark (Forest)'}
+ITEMS = {'1': 'Sword'}
+SCENES = {
+    # scene ID: (tags, character IDs, location IDs, item IDs, status)
+    '1': (['battle'], ['1', '2'], ['1'], ['1'], 1),
+    '2': (['battle', 'night'], ['2'], ['2'], None, 2),
+    '3': (['romance'], ['3', '1'], None, None, 3),
+    '4': (None, ['1'], ['1', '2'], ['1'], 4),
+    '5': (['night'], None, None, None, 5),
+    '6': ([], [], [], [], 5),
+}
+
+
+def new_novel():
+    """Return a Novel instance holding the test scenes."""
+    novel = Novel('')
+    for elements, titles, elementClass in ((novel.characters, CHARACTERS, Character),
+                                           (novel.locations, LOCATIONS, WorldElement),
+                                           (novel.items, ITEMS, WorldElement)):
+        for elemId, title in titles.items():
+            elements[elemId] = elementClass()
+            elements[elemId].title = title
+    chapter = Chapter()
+    novel.chapters['1'] = chapter
+    novel.srtChapters.append('1')
+    for scId, (tags, characters, locations, items, status) in SCENES.items():
+        scene = Scene()
+        scene.tags = tags
+        scene.characters = characters
+        scene.locations = locations
+        scene.items = items
+        scene.status = status
+        novel.scenes[scId] = scene
+        chapter.srtScenes.append(scId)
+    return novel
+
+
+class NormalOperation(unittest.TestCase):
+    """Parse and evaluate valid filter expressions."""
+
+    def setUp(self):
+        self.novel = new_novel()
+
+    def select(self, expression):
+        """Return the IDs of the scenes matching the expression."""
+        sceneFilter = ScExprFilter(expression)
+        return [scId for scId in self.novel.scenes if sceneFilter.accept(self.novel, scId)]
+
+    def test_terms(self):
+        self.assertEqual(self.select('tag:battle'), ['1', '2'])
+        self.assertEqual(self.select('viewpoint:Alice'), ['1', '4'])
+        self.assertEqual(self.select('character:Alice'), ['1', '3', '4'])
+        self.assertEqual(self.select('location:Castle'), ['1', '4'])
+        self.assertEqual(self.select('item:Sword'), ['1', '4'])
+        self.assertEqual(self.select('status:Done'), ['5', '6'])
+
+    def test_unknown_values(self):
+        self.assertEqual(self.select('tag:unknown'), [])
+        self.assertEqual(self.select('character:Nobody'), [])
+        self.assertEqual(self.select('NOT character:Nobody'), list(SCENES))
+
+    def test_precedence(self):
+        """NOT binds tighter than AND, and AND binds tighter than OR."""
+        expected = self.select('tag:battle OR (tag:night AND (NOT location:Castle))')
+        self.assertEqual(expected, ['1', '2', '5'])
+        self.assertEqual(self.select('tag:battle OR tag:night AND NOT location:Castle'), expected)
+        self.assertEqual(self.select('(tag:battle OR tag:night) AND NOT location:Castle'), ['2', '5'])
+        self.assertNotEqual(self.select('NOT (tag:battle AND location:Castle)'),
+                            self.select('NOT tag:battle AND location:Castle'))
+        self.assertEqual(self.select('NOT tag:battle AND location:Castle'), ['4'])
+        self.assertEqual(ScExprFilter('tag:a OR tag:b AND NOT tag:c')._tree,
+                         ('OR', [('TERM', ('tags', 'a')),
+                                 ('AND', [('TERM', ('tags', 'b')), ('NOT', ('TERM', ('tags', 'c')))])]))
+
+    def test_parentheses(self):
+        self.assertEqual(self.select('(tag:battle)'), ['1', '2'])
+        self.assertEqual(self.select('((tag:battle OR tag:romance) AND (status:Draft OR status:"1st Edit"))'),
+                         ['2', '3'])
+        self.assertEqual(self.select('NOT (tag:battle OR tag:night)'), ['3', '4', '6'])
+        self.assertEqual(self.select('tag:battle AND(location:Castle)'), ['1'])
+        self.assertEqual(self.select('NOT NOT tag:battle'), ['1', '2'])
+
+    def test_quoted_terms(self):
+        self.assertEqual(self.select('character:"Alice Smith"'), ['3'])
+        self.assertEqual(self.select('viewpoint:"Alice Smith"'), ['3'])
+        self.assertEqual(self.select('location:"Dark (Forest)"'), ['2', '4'])
+        self.assertEqual(self.select('status:"2nd Edit" OR location:"Dark (Forest)"'), ['2', '4'])
+        self.assertEqual(self.select('tag:"battle"'), ['1', '2'])
+
+    def test_case_insensitivity(self):
+        self.assertEqual(self.select('status:done'), ['5', '6'])
+        self.assertEqual(self.select('STATUS:DONE'), ['5', '6'])
+        self.assertEqual(self.select('status:"1st edit"'), ['3'])
+        self.assertEqual(self.select('Tag:battle and not Location:Castle or tag:romance'), ['2', '3'])
+        self.assertEqual(self.select('tag:Battle'), [])
+
+    def test_source_change(self):
+        sceneFilter = ScExprFilter('tag:battle')
+        otherNovel = new_novel()
+        otherNovel.scenes['5'].tags = ['battle']
+        self.assertEqual([scId for scId in self.novel.scenes if sceneFilter.accept(self.novel, scId)], ['1', '2'])
+        self.assertEqual([scId for scId in otherNovel.scenes if sceneFilter.accept(otherNovel, scId)],
+                         ['1', '2', '5'])
+
+
+class InvalidExpressions(unittest.TestCase):
+    """Reject invalid filter expressions when the filter is created."""
+
+    def assert_error(self, expression, message):
+        with self.assertRaises(ValueError) as context:
+            ScExprFilter(expression)
+        self.assertIn(message, str(context.exception))
+
+    def test_unknown_category(self):
+        self.assert_error('genre:fantasy', 'Unknown filter category: "genre"')
+        self.assert_error('tag:battle OR Scene:1', 'Unknown filter category: "Scene"')
+
+    def test_unknown_status(self):
+        self.assert_error('status:Finished', 'Unknown scene status: "Finished"')
+        self.assert_error('status:""', 'Unknown scene status: ""')
+
+    def test_empty_expression(self):
+        self.assert_error('', 'Empty filter expression')
+        self.assert_error('   ', 'Empty filter expression')
+
+    def test_incomplete_expression(self):
+        self.assert_error('tag:battle AND', 'Incomplete filter expression')
+        self.assert_error('NOT', 'Incomplete filter expression')
+        self.assert_error('(tag:battle OR', 'Incomplete filter expression')
+
+    def test_missing_parenthesis(self):
+        self.assert_error('(tag:battle', 'Missing closing parenthesis in filter expression')
+        self.assert_error('((tag:battle OR tag:night)', 'Missing closing parenthesis in filter expression')
+
+    def test_unexpected_token(self):
+        self.assert_error('tag:battle)', 'Unexpected filter expression token: ")"')
+        self.assert_error('tag:battle tag:night', 'Unexpected filter expression token: "tag:night"')
+        self.assert_error('AND tag:battle', 'Unexpected filter expression token: "AND"')
+        self.assert_error('battle', 'Unexpected filter expression token: "battle"')
+        self.assert_error('tag:battle XOR tag:night', 'Unexpected filter expression token: "XOR"')
+        self.assert_error('()', 'Unexpected filter expression token: ")"')
+        self.assert_error('tag:"battle', 'Unexpected filter expression token')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
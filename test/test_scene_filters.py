@@ -0,0 +1,129 @@
+"""Unit test for the index-based scene filters.
+
+Compare the selected scenes with the results of the former linear filters.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import unittest
+from pywriter.pywriter_globals import *
+from ywreporterlib.yw7_stream_file import Yw7StreamFile
+from ywreporterlib.sc_tg_filter import ScTgFilter
+from ywreporterlib.sc_vp_filter import ScVpFilter
+from ywreporterlib.sc_cr_filter import ScCrFilter
+from ywreporterlib.sc_lc_filter import ScLcFilter
+from ywreporterlib.sc_it_filter import ScItFilter
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# To be placed in TEST_DATA_PATH:
+NORMAL_YW7 = TEST_DATA_PATH + 'normal.yw7'
+
+
+def linear_accept(attribute, viewpoint=False):
+    """Return the accept() function of the former linear filter for a scene attribute."""
+
+    def accept(key, source, eId):
+        if key is not None:
+            try:
+                if viewpoint:
+                    return key == getattr(source.scenes[eId], attribute)[0]
+
+                return key in getattr(source.scenes[eId], attribute)
+
+            except:
+                return False
+        return True
+
+    return accept
+
+
+FILTERS = (
+    (ScTgFilter, linear_accept('tags'), 'tags'),
+    (ScVpFilter, linear_accept('characters', viewpoint=True), 'characters'),
+    (ScCrFilter, linear_accept('characters'), 'characters'),
+    (ScLcFilter, linear_accept('locations'), 'locations'),
+    (ScItFilter, linear_accept('items'), 'items'),
+)
+# (index-based filter class, former accept() function, scene attribute holding the filter keys)
+
+
+def read_project():
+    novel = Yw7StreamFile(NORMAL_YW7, metadata_only=True)
+    message = novel.read()
+    assert not message.startswith(ERROR), message
+    return novel
+
+
+def make_edge_cases(novel):
+    """Modify the project's scenes, so that the filters meet empty and missing references, and items."""
+    scIds = list(novel.scenes)
+    novel.scenes[scIds[0]].tags = None
+    novel.scenes[scIds[0]].characters = None
+    novel.scenes[scIds[0]].locations = None
+    novel.scenes[scIds[0]].items = None
+    novel.scenes[scIds[1]].tags = []
+    novel.scenes[scIds[1]].characters = []
+    novel.scenes[scIds[1]].locations = []
+    novel.scenes[scIds[1]].items = []
+    # The sample project has no items.
+    for scId in scIds[2:5]:
+        novel.scenes[scId].items = ['1', '2']
+    novel.scenes[scIds[5]].items = ['2', '3']
+    return novel
+
+
+class NormalOperation(unittest.TestCase):
+    """Check that the index-based filters select the same scenes as the linear ones."""
+
+    def get_keys(self, novel, attribute):
+        keys = set()
+        for scene in novel.scenes.values():
+            keys.update(getattr(scene, attribute) or [])
+        return sorted(keys) + [None, 'unknown key']
+
+    def assert_same_selection(self, novel):
+        scIds = list(novel.scenes) + ['unknown scene']
+        for filterClass, linearAccept, attribute in FILTERS:
+            for key in self.get_keys(novel, attribute):
+                with self.subTest(filter=filterClass.__name__, key=key):
+                    sceneFilter = filterClass(key)
+                    selected = [scId for scId in scIds if sceneFilter.accept(novel, scId)]
+                    expected = [scId for scId in scIds if linearAccept(key, novel, scId)]
+                    self.assertEqual(selected, expected)
+
+    def test_sample_project(self):
+        self.assert_same_selection(read_project())
+
+    def test_edge_cases(self):
+        self.assert_same_selection(make_edge_cases(read_project()))
+
+    def test_source_change(self):
+        """A filter used with another project resolves the key again."""
+        novel = read_project()
+        otherNovel = make_edge_cases(read_project())
+        for filterClass, linearAccept, attribute in FILTERS:
+            for key in self.get_keys(novel, attribute):
+                with self.subTest(filter=filterClass.__name__, key=key):
+                    sceneFilter = filterClass(key)
+                    for source in (novel, otherNovel, novel):
+                        selected = [scId for scId in source.scenes if sceneFilter.accept(source, scId)]
+                        expected = [scId for scId in source.scenes if linearAccept(key, source, scId)]
+                        self.assertEqual(selected, expected)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
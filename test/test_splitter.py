@@ -0,0 +1,195 @@
+"""Unit test for the splitting of scenes by part, chapter, and scene dividers.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import random
+import unittest
+from pywriter.pywriter_globals import *
+from pywriter.model.chapter import Chapter
+from pywriter.model.novel import Novel
+from pywriter.model.scene import Scene
+from pywriter.model.splitter import Splitter
+
+
+def make_novel(*texts):
+    """Return a novel with one chapter containing a scene for each text."""
+    novel = Novel('')
+    novel.chapters['1'] = Chapter()
+    novel.chapters['1'].title = 'Chapter'
+    novel.chapters['1'].chLevel = 0
+    novel.srtChapters = ['1']
+    for i, text in enumerate(texts, 1):
+        scId = str(i)
+        novel.scenes[scId] = Scene()
+        novel.scenes[scId].title = f'Scene {scId}'
+        novel.scenes[scId].status = 1
+        if text is not None:
+            novel.scenes[scId].sceneContent = text
+        novel.chapters['1'].srtScenes.append(scId)
+    return novel
+
+
+def get_structure(novel):
+    """Return a list of (chapter title, chapter level, list of (scene title, scene content)) tuples."""
+    structure = []
+    for chId in novel.srtChapters:
+        chapter = novel.chapters[chId]
+        scenes = [(novel.scenes[scId].title, novel.scenes[scId].sceneContent) for scId in chapter.srtScenes]
+        structure.append((chapter.title, chapter.chLevel, scenes))
+    return structure
+
+
+class SplitScenes(unittest.TestCase):
+    """Test case: Split scenes and check the resulting structure and statistics."""
+
+    def split(self, *texts):
+        novel = make_novel(*texts)
+        self.splitter = Splitter()
+        self.changed = self.splitter.split_scenes(novel)
+        return novel
+
+    def assertStatistics(self, splitScenes, newScenes, newChapters, newParts):
+        self.assertEqual((self.splitter.splitScenes, self.splitter.newScenes,
+                          self.splitter.newChapters, self.splitter.newParts),
+                         (splitScenes, newScenes, newChapters, newParts))
+
+    def test_no_dividers(self):
+        text = 'First line\nLast line'
+        novel = self.split(text, '', None)
+        self.assertFalse(self.changed)
+        self.assertEqual(get_structure(novel), [('Chapter', 0, [('Scene 1', text), ('Scene 2', ''), ('Scene 3', None)])])
+        self.assertStatistics(0, 0, 0, 0)
+
+    def test_scene_divider(self):
+        novel = self.split('First\n### Second|Description\nSecond text')
+        self.assertTrue(self.changed)
+        self.assertEqual(get_structure(novel), [('Chapter', 0, [('Scene 1', 'First'), ('Second', 'Second text')])])
+        self.assertEqual(novel.scenes['2'].desc, 'Description')
+        self.assertEqual((novel.scenes['1'].wordCount, novel.scenes['2'].wordCount), (1, 2))
+        self.assertStatistics(1, 1, 0, 0)
+
+    def test_leading_scene_divider(self):
+        novel = self.split('### Second\nSecond text')
+        self.assertEqual(get_structure(novel), [('Chapter', 0, [('Scene 1', ''), ('Second', 'Second text')])])
+        self.assertStatistics(1, 1, 0, 0)
+
+    def test_leading_chapter_divider(self):
+        novel = self.split('## New chapter\nText')
+        self.assertEqual(get_structure(novel), [
+            ('Chapter', 0, [('Scene 1', '')]),
+            ('New chapter', 0, [('Scene 1 Split: 1', 'Text')]),
+        ])
+        self.assertStatistics(1, 1, 1, 0)
+
+    def test_leading_part_divider(self):
+        novel = self.split('# New part\nText')
+        self.assertEqual(get_structure(novel), [
+            ('Chapter', 0, [('Scene 1', '')]),
+            ('New part', 1, [('Scene 1 Split: 1', 'Text')]),
+        ])
+        self.assertStatistics(1, 1, 0, 1)
+
+    def test_consecutive_dividers(self):
+        """A scene divider directly after a chapter or part divider keeps the preceding text."""
+        novel = self.split('First\n# New part\n## New chapter\n### Second\nSecond text')
+        self.assertEqual(get_structure(novel), [
+            ('Chapter', 0, [('Scene 1', 'First')]),
+            ('New part', 1, []),
+            ('New chapter', 0, [('Second', 'Second text')]),
+        ])
+        self.assertStatistics(1, 1, 1, 1)
+
+    def test_consecutive_scene_dividers(self):
+        novel = self.split('First\n### Second\n### Third\nThird text')
+        self.assertEqual(get_structure(novel), [
+            ('Chapter', 0, [('Scene 1', 'First'), ('Second', ''), ('Third', 'Third text')]),
+        ])
+        self.assertStatistics(1, 2, 0, 0)
+
+    def test_trailing_chapter_divider(self):
+        """A chapter divider as the last line keeps the preceding text."""
+        novel = self.split('First\nSecond line\n## New chapter')
+        self.assertEqual(get_structure(novel), [
+            ('Chapter', 0, [('Scene 1', 'First\nSecond line')]),
+            ('New chapter', 0, []),
+        ])
+        self.assertStatistics(1, 0, 1, 0)
+
+    def test_trailing_part_divider(self):
+        """A part divider as the last line keeps the preceding text."""
+        novel = self.split('First\n# New part')
+        self.assertEqual(get_structure(novel), [
+            ('Chapter', 0, [('Scene 1', 'First')]),
+            ('New part', 1, []),
+        ])
+        self.assertStatistics(1, 0, 0, 1)
+
+    def test_trailing_scene_divider(self):
+        novel = self.split('First\n### Second')
+        self.assertEqual(get_structure(novel), [('Chapter', 0, [('Scene 1', 'First'), ('Second', '')])])
+        self.assertStatistics(1, 1, 0, 0)
+
+    def test_empty_lines(self):
+        novel = self.split('First\n\n### Second\n\nSecond text\n')
+        self.assertEqual(get_structure(novel), [('Chapter', 0, [('Scene 1', 'First\n'), ('Second', '\nSecond text\n')])])
+
+    def test_default_titles(self):
+        novel = self.split('First\n##\nText\n#\nText')
+        self.assertEqual(get_structure(novel), [
+            ('Chapter', 0, [('Scene 1', 'First')]),
+            (_('New Chapter'), 0, [('Scene 1 Split: 1', 'Text')]),
+            (_('New Part'), 1, [('Scene 1 Split: 1', 'Text')]),
+        ])
+
+    def test_statistics(self):
+        novel = self.split(
+            'A\n### B\nB text\n## C\nC text\n### D\nD text',
+            'No dividers',
+            '# E\n## F\nF text\n# G',
+        )
+        self.assertTrue(self.changed)
+        self.assertStatistics(2, 4, 2, 2)
+        self.assertEqual(len(novel.scenes), 3 + 4)
+        self.assertEqual(len(novel.chapters), 1 + 2 + 2)
+
+        # The statistics refer to the last call.
+        self.splitter.split_scenes(novel)
+        self.assertStatistics(0, 0, 0, 0)
+
+    def test_new_ids(self):
+        novel = self.split('A\n## B\n### C\nC text', 'D\n### E\nE text')
+        self.assertEqual(novel.srtChapters, ['1', '2'])
+        self.assertEqual(novel.chapters['1'].srtScenes, ['1'])
+        self.assertEqual(novel.chapters['2'].srtScenes, ['3', '2', '4'])
+        self.assertEqual(novel.scenes['3'].title, 'C')
+        self.assertEqual(novel.scenes['4'].title, 'E')
+
+    def test_random_texts(self):
+        """The text between the dividers is preserved, and the counts match the dividers."""
+        lines = ('Text', 'More text', '', '### Scene', '## Chapter', '# Part', '###', '##', '#')
+        randomGenerator = random.Random(1)
+        for __ in range(2000):
+            text = '\n'.join(randomGenerator.choice(lines) for __ in range(randomGenerator.randint(1, 12)))
+            with self.subTest(text=text):
+                novel = self.split(text)
+                contents = []
+                for chId in novel.srtChapters:
+                    for scId in novel.chapters[chId].srtScenes:
+                        contents.extend(novel.scenes[scId].sceneContent.split('\n'))
+                textLines = text.split('\n')
+                expected = [line for line in textLines if not line.startswith('#')]
+                self.assertEqual([line for line in contents if line], [line for line in expected if line])
+                parts = sum(1 for line in textLines if line.startswith('#') and not line.startswith('##'))
+                chapters = sum(1 for line in textLines if line.startswith('##') and not line.startswith('###'))
+                self.assertEqual((self.splitter.newChapters, self.splitter.newParts), (chapters, parts))
+                self.assertEqual(len(novel.scenes), 1 + self.splitter.newScenes)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
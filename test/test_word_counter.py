@@ -0,0 +1,136 @@
+"""Unit test for the word and letter counting.
+
+Compare the counts with the results of the regular expressions.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import random
+import unittest
+from pywriter.pywriter_globals import *
+from pywriter.model.scene import Scene
+from pywriter.model.word_counter import get_counts
+from pywriter.model.word_counter import update_scene_counts
+from pywriter.yw.yw7_file import Yw7File
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+
+# To be placed in TEST_DATA_PATH:
+NORMAL_YW7 = TEST_DATA_PATH + 'normal.yw7'
+
+EDGE_CASES = (
+    '',
+    ' \n\r\n\t',
+    'One two three.',
+    'well-known',
+    'one--two',
+    'one---two',
+    'one----two',
+    'one—two–three',
+    '-',
+    '--',
+    '> Quote\n>quote\n >no quote\nno > quote',
+    '>',
+    '[i]italic[/i] text',
+    'one[i] [/i]two',
+    '[]',
+    '[-]',
+    '[a\nb]',
+    'a-[x]-b',
+    '/**/',
+    '/* comment */text',
+    '/*a\n*/b',
+    '/-*x*/',
+    '[b]\x85]–]é',
+    '[lang=de-DE]Hallo Welt[/lang=de-DE]\r\n',
+    'Line break\xa0and\x1cseparators',
+    )
+
+
+def count_with_regex(text):
+    """Return word count and letter count, calculated the way Scene did before."""
+    wordText = ADDITIONAL_WORD_LIMITS.sub(' ', text)
+    wordText = NO_WORD_LIMITS.sub('', wordText)
+    letterText = NON_LETTERS.sub('', text)
+    return len(wordText.split()), len(letterText)
+
+
+class CountWordsAndLetters(unittest.TestCase):
+    """Test case: The counts are the same as with the regular expressions."""
+
+    def test_edge_cases(self):
+        for text in EDGE_CASES:
+            with self.subTest(text=text):
+                self.assertEqual(get_counts(text), count_with_regex(text))
+
+    def test_random_texts(self):
+        tokens = ('a', 'bc', 'é', 'ж', ' ', '\t', '\n', '\r\n', '\xa0', '-', '--', '—', '–',
+                  '[', ']', '[i]', '[/i]', '/', '*', '/*', '*/', '>', '\n>')
+        randomGenerator = random.Random(1)
+        for __ in range(20000):
+            text = ''.join(randomGenerator.choice(tokens) for __ in range(randomGenerator.randint(0, 30)))
+            with self.subTest(text=text):
+                self.assertEqual(get_counts(text), count_with_regex(text))
+
+    def test_sample_project(self):
+        ywFile = Yw7File(NORMAL_YW7)
+        self.assertEqual(ywFile.read(), 'yWriter project data read in.')
+        self.assertTrue(ywFile.scenes)
+        for scId in ywFile.scenes:
+            text = ywFile.scenes[scId].sceneContent
+            if text is None:
+                continue
+
+            with self.subTest(scId=scId):
+                scene = ywFile.scenes[scId]
+                self.assertEqual((scene.wordCount, scene.letterCount), count_with_regex(text))
+
+    def test_batch(self):
+        scenes = []
+        for text in EDGE_CASES:
+            scene = Scene()
+            scene.sceneContent = text
+            scene.wordCount = scene.letterCount = None
+            scenes.append(scene)
+        scenes.append(Scene())
+        wordsTotal, lettersTotal = update_scene_counts(scenes)
+        expected = [count_with_regex(text) for text in EDGE_CASES]
+        self.assertEqual([(scene.wordCount, scene.letterCount) for scene in scenes[:-1]], expected)
+        self.assertEqual((scenes[-1].wordCount, scenes[-1].letterCount), (0, 0))
+        self.assertEqual(wordsTotal, sum(words for words, __ in expected))
+        self.assertEqual(lettersTotal, sum(letters for __, letters in expected))
+
+    def test_batch_languages(self):
+        scene = Scene()
+        scene.sceneContent = 'One [lang=de-DE]zwei[/lang=de-DE] [lang=fr-FR]trois[/lang=fr-FR] [lang=de-DE]vier[/lang=de-DE]'
+        scene.languages = ()
+        update_scene_counts([scene])
+        self.assertEqual(scene.languages, ('de-DE', 'fr-FR'))
+
+    def test_scene_languages(self):
+        scene = Scene()
+        for text, expected in (
+            ('One [lang=de-DE]zwei[/lang=de-DE]', ('de-DE',)),
+            ('No language markup', ()),
+            ('[lang=fr-FR]Un[/lang=fr-FR]', ('fr-FR',)),
+            ('', ()),
+        ):
+            with self.subTest(text=text):
+                scene.sceneContent = text
+                self.assertEqual(scene.languages, expected)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
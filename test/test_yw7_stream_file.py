@@ -0,0 +1,161 @@
+"""Unit test for the streaming yWriter project reader.
+
+Compare the model and the reports with the results of the Yw7File reader.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import unittest
+from pywriter.pywriter_globals import *
+from pywriter.file.filter import Filter
+from pywriter.yw.yw7_file import Yw7File
+from ywreporterlib.yw7_stream_file import Yw7StreamFile
+from ywreporterlib.html_report import HtmlReport
+from ywreporterlib.csv_report import CsvReport
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# To be placed in TEST_DATA_PATH:
+NORMAL_YW7 = TEST_DATA_PATH + 'normal.yw7'
+
+# Test data
+TEST_YW7 = TEST_EXEC_PATH + 'yw7 Stream Project.yw7'
+TEST_HTML = TEST_EXEC_PATH + 'yw7 Stream Project_report.html'
+TEST_CSV = TEST_EXEC_PATH + 'yw7 Stream Project_report.csv'
+
+REPORT_OPTIONS = ('show_chapters', 'show_scenes', 'show_normal_type', 'show_unused_type', 'show_notes_type',
+                  'show_todo_type', 'show_unexported', 'show_uid', 'show_number', 'show_title', 'show_description',
+                  'show_viewpoint', 'show_tags', 'show_languages', 'show_notes', 'show_date', 'show_time',
+                  'show_duration', 'show_action_pattern', 'show_ratings', 'show_words_total', 'show_wordcount',
+                  'show_lettercount', 'show_status', 'show_characters', 'show_locations', 'show_items')
+
+NOVEL_ATTRIBUTES = ('title', 'desc', 'kwVar', 'authorName', 'authorBio',
+                    'fieldTitle1', 'fieldTitle2', 'fieldTitle3', 'fieldTitle4',
+                    'srtChapters', 'srtLocations', 'srtItems', 'srtCharacters', 'srtPrjNotes',
+                    'languageCode', 'countryCode')
+
+
+def read_file(inputFile):
+    with open(inputFile, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def remove_all_testfiles():
+    for filePath in (TEST_YW7, TEST_HTML, TEST_CSV):
+        for path in (filePath, f'{filePath}.bak'):
+            try:
+                os.remove(path)
+            except:
+                pass
+
+
+def get_element_state(element, exclude=()):
+    """Return a dictionary of the element's instance variables."""
+    names = set()
+    for cls in type(element).__mro__:
+        names.update(getattr(cls, '__slots__', ()))
+    names.update(getattr(element, '__dict__', {}))
+    return {name: getattr(element, name, None) for name in names if not name in exclude}
+
+
+def get_model(novel, exclude=()):
+    """Return a comparable representation of the novel's project data."""
+    model = {attribute: getattr(novel, attribute) for attribute in NOVEL_ATTRIBUTES}
+    for section in ('chapters', 'scenes', 'characters', 'locations', 'items', 'projectNotes'):
+        elements = getattr(novel, section)
+        model[section] = [(elemId, get_element_state(elements[elemId], exclude)) for elemId in elements]
+    return model
+
+
+def write_reports(novel):
+    """Write an HTML and a CSV report with all columns; return the report texts."""
+    kwargs = {option: True for option in REPORT_OPTIONS}
+    kwargs['scene_filter'] = Filter()
+    texts = []
+    for reportClass, reportPath in ((HtmlReport, TEST_HTML), (CsvReport, TEST_CSV)):
+        report = reportClass(reportPath, **kwargs)
+        message = report.merge(novel)
+        if not message.startswith(ERROR):
+            message = report.write()
+        assert not message.startswith(ERROR), message
+        texts.append(read_file(reportPath))
+    return texts
+
+
+class NormalOperation(unittest.TestCase):
+    """Compare Yw7StreamFile with Yw7File for the sample project."""
+
+    def setUp(self):
+        remove_all_testfiles()
+        with open(NORMAL_YW7, 'rb') as f:
+            data = f.read()
+        with open(TEST_YW7, 'wb') as f:
+            f.write(data)
+
+    def read(self, readerClass, **kwargs):
+        novel = readerClass(TEST_YW7, **kwargs)
+        message = novel.read()
+        self.assertFalse(message.startswith(ERROR), message)
+        return novel
+
+    def test_full_model(self):
+        self.assertEqual(get_model(self.read(Yw7StreamFile)), get_model(self.read(Yw7File)))
+
+    def test_metadata_only_model(self):
+        streamed = self.read(Yw7StreamFile, metadata_only=True)
+        for scene in streamed.scenes.values():
+            self.assertIsNone(scene.sceneContent)
+        self.assertEqual(get_model(streamed, exclude=('_sceneContent',)),
+                         get_model(self.read(Yw7File), exclude=('_sceneContent',)))
+
+    def test_full_reports(self):
+        self.assertEqual(write_reports(self.read(Yw7StreamFile)), write_reports(self.read(Yw7File)))
+
+    def test_metadata_only_reports(self):
+        self.assertEqual(write_reports(self.read(Yw7StreamFile, metadata_only=True)),
+                         write_reports(self.read(Yw7File)))
+
+    def test_retry_after_aborted_pass(self):
+        """Read the project again after a parsing pass failed halfway."""
+
+        class AbortingReader(Yw7StreamFile):
+
+            def _parse_file(self, encoding):
+                if encoding == 'utf-8':
+                    super()._parse_file(encoding)
+                    self.scenes['stale'] = self.SCENE_CLASS()
+                    self.srtChapters.append(self.srtChapters[0])
+                    raise UnicodeError
+
+                return super()._parse_file('utf-8')
+
+        streamed = self.read(AbortingReader)
+        self.assertNotIn('stale', streamed.scenes)
+        self.assertEqual(len(streamed.srtChapters), len(set(streamed.srtChapters)))
+        self.assertEqual(get_model(streamed), get_model(self.read(Yw7File)))
+
+    def test_utf16(self):
+        text = read_file(NORMAL_YW7)
+        with open(TEST_YW7, 'wb') as f:
+            f.write(text.encode('utf-16'))
+        self.assertEqual(get_model(self.read(Yw7StreamFile)), get_model(self.read(Yw7File)))
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""Regression test for writing yWriter 7 projects.
+
+Compare the output with that of the former writer, which serialized the
+element tree with ElementTree, and then inserted the CDATA tags line by line.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-reporter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import re
+import unittest
+from html import unescape
+from pywriter.pywriter_globals import *
+from pywriter.yw.yw7_file import Yw7File
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# To be placed in TEST_DATA_PATH:
+NORMAL_YW7 = TEST_DATA_PATH + 'normal.yw7'
+
+# Test data
+TEST_YW7 = TEST_EXEC_PATH + 'yw7 Writer Project.yw7'
+REFERENCE_YW7 = TEST_EXEC_PATH + 'yw7 Writer Reference.yw7'
+
+NESTED_ELEMENTS = '<Custom><Nested>Nested <Deep>text</Deep> &amp; tail</Nested><Empty /></Custom>'
+NESTED_NOTES = '<Notes>Notes with <b>nested</b> elements</Notes>'
+
+
+def read_bytes(inputFile):
+    with open(inputFile, 'rb') as f:
+        return f.read()
+
+
+def remove_all_testfiles():
+    for filePath in (TEST_YW7, REFERENCE_YW7):
+        for path in (filePath, f'{filePath}.bak'):
+            try:
+                os.remove(path)
+            except:
+                pass
+
+
+def write_reference(ywProject, filePath):
+    """Write the project's element tree to filePath, as the former writer did."""
+    ywProject.tree.write(filePath, xml_declaration=False, encoding='utf-8')
+    with open(filePath, 'r', encoding='utf-8') as f:
+        text = f.read()
+    lines = text.split('\n')
+    newlines = ['<?xml version="1.0" encoding="utf-8"?>']
+    for line in lines:
+        for tag in ywProject._CDATA_TAGS:
+            line = re.sub(fr'\<{tag}\>', f'<{tag}><![CDATA[', line)
+            line = re.sub(fr'\<\/{tag}\>', f']]></{tag}>', line)
+        newlines.append(line)
+    text = '\n'.join(newlines)
+    text = text.replace('[CDATA[ \n', '[CDATA[')
+    text = text.replace('\n]]', ']]')
+    text = unescape(text)
+    with open(filePath, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+class NormalOperation(unittest.TestCase):
+    """Write yWriter 7 projects, and compare the files with the output of the former writer."""
+
+    def setUp(self):
+        remove_all_testfiles()
+
+    def copy_project(self, text=None):
+        if text is None:
+            with open(NORMAL_YW7, 'rb') as f:
+                data = f.read()
+        else:
+            data = text.encode('utf-8')
+        with open(TEST_YW7, 'wb') as f:
+            f.write(data)
+
+    def read(self):
+        ywProject = Yw7File(TEST_YW7)
+        message = ywProject.read()
+        self.assertFalse(message.startswith(ERROR), message)
+        return ywProject
+
+    def assert_same_output(self, ywProject):
+        """Write the project, and compare the file with the former writer's output of the same tree."""
+        message = ywProject.write()
+        self.assertFalse(message.startswith(ERROR), message)
+        write_reference(ywProject, REFERENCE_YW7)
+        self.assertEqual(read_bytes(TEST_YW7), read_bytes(REFERENCE_YW7))
+
+    def test_round_trip(self):
+        self.copy_project()
+        self.assert_same_output(self.read())
+        firstOutput = read_bytes(TEST_YW7)
+
+        # Writing the project again changes nothing.
+        self.assert_same_output(self.read())
+        self.assertEqual(read_bytes(TEST_YW7), firstOutput)
+
+    def test_line_breaks(self):
+        self.copy_project()
+        ywProject = self.read()
+        scIds = list(ywProject.scenes)
+        ywProject.scenes[scIds[0]].sceneContent = 'First line\r\nSecond line\r\n\r\nThird line'
+        ywProject.scenes[scIds[1]].sceneContent = '\r\nLeading and trailing line breaks\r\n'
+        ywProject.scenes[scIds[2]].sceneContent = 'Old Mac line breaks\rSecond line\r'
+        ywProject.scenes[scIds[3]].sceneContent = ' \nLeading space and line break\n'
+        ywProject.scenes[scIds[4]].desc = 'Description\r\nwith Windows line breaks'
+        ywProject.scenes[scIds[5]].notes = '\n\nNotes\n\n'
+        ywProject.scenes[scIds[6]].sceneContent = 'Markup: [i]italic[/i] & "quotes" <b>not a tag</b>'
+        chId = ywProject.srtChapters[1]
+        ywProject.chapters[chId].desc = 'Chapter description\r\n'
+        crId = ywProject.srtCharacters[0]
+        ywProject.characters[crId].bio = 'Bio\r\nwith line breaks'
+        self.assert_same_output(ywProject)
+
+    def test_nested_elements(self):
+        with open(NORMAL_YW7, 'r', encoding='utf-8') as f:
+            text = f.read()
+        self.assertIn('</SCENE>', text)
+        text = text.replace('</SCENE>', f'{NESTED_ELEMENTS}</SCENE>', 2)
+        text = text.replace('</CHAPTER>', f'{NESTED_NOTES}</CHAPTER>', 1)
+        self.copy_project(text)
+        ywProject = self.read()
+        self.assert_same_output(ywProject)
+        output = read_bytes(TEST_YW7).decode('utf-8')
+        self.assertEqual(output.count('<Deep>text</Deep>'), 2)
+        self.assertIn('<b>nested</b>', output)
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()